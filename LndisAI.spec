@@ -0,0 +1,74 @@
+# -*- mode: python ; coding: utf-8 -*-
+"""
+PyInstaller spec for LndisAI.exe.
+
+Run through build.py, which passes the per-build inputs via environment:
+  LNDIS_CTK_DATA   customtkinter data snapshot (build/ctk-cache/<hash>)
+  LNDIS_EXCLUDES   comma-separated modules to leave out of the bundle
+  LNDIS_PATHS      pre-resolved package search paths (os.pathsep-separated)
+  LNDIS_UPX        "0" to skip UPX compression (build.py sets it when UPX
+                   is missing or --no-upx is given)
+"""
+
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(SPECPATH)
+CTK_DATA = os.environ["LNDIS_CTK_DATA"]
+EXCLUDES = [m for m in os.environ.get("LNDIS_EXCLUDES", "").split(",") if m]
+PATHS = [p for p in os.environ.get("LNDIS_PATHS", "").split(os.pathsep) if p]
+ICON = ROOT / "assets" / "icon.ico"
+UPX = os.environ.get("LNDIS_UPX") != "0"
+
+# DLLs known to break when packed with UPX
+UPX_EXCLUDE = [
+    "vcruntime140.dll",
+    "python3.dll",
+    f"python{sys.version_info.major}{sys.version_info.minor}.dll",
+]
+
+
+a = Analysis(
+    [str(ROOT / "ui" / "app.py")],
+    pathex=[str(ROOT), *PATHS],
+    binaries=[],
+    datas=[
+        # Project packages as data (preserves directory structure)
+        (str(ROOT / "core"), "core"),
+        (str(ROOT / "policy"), "policy"),
+        (str(ROOT / "tools"), "tools"),
+        # customtkinter data (themes, fonts, etc.)
+        (CTK_DATA, "customtkinter"),
+    ],
+    # Hidden imports for modules loaded dynamically (tools are imported
+    # lazily by core.agent._TOOL_FACTORIES)
+    hiddenimports=[
+        "yaml", "customtkinter", "tkinter",
+        "tools.file_read", "tools.file_write", "tools.command_run",
+        "tools.install_app", "tools.research_local", "tools.research_web",
+    ],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[str(ROOT / "runtime_hook.py")],
+    excludes=EXCLUDES,
+    noarchive=False,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    a.binaries,
+    a.datas,
+    [],
+    name="LndisAI",
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=UPX,
+    upx_exclude=UPX_EXCLUDE,
+    runtime_tmpdir=None,
+    console=False,
+    icon=[str(ICON)] if ICON.exists() else None,
+)
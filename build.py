@@ -2,17 +2,54 @@
 Build script — packages Lndis AI Assistant as a standalone .exe
 
 Usage:
-  python build.py
+  python build.py            # incremental build (reuses build/ cache)
+  python build.py --fresh    # clean release build
+  python build.py --optimize # strip asserts/docstrings (PYTHONOPTIMIZE=2)
+  python build.py --keep-module unittest   # bundle a normally excluded module
+  python build.py --no-upx   # skip UPX compression
+
+UPX is used when found via $UPX_DIR or on PATH.  UPX-packed executables
+can trip Windows Defender false positives; use --no-upx if that happens.
 
 Output:
   dist/LndisAI.exe
+
+The bundle layout (data files, hidden imports, hooks) is defined in
+LndisAI.spec; this script only supplies the per-build inputs.
+
+PyInstaller's analysis cache lives in build/.  Delete that directory
+(rm -rf build/) to force a full rebuild from scratch.
 """
 
+import argparse
+import hashlib
+import importlib.util
+import os
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent
+WORK_DIR = ROOT / "build"
+DIST_DIR = ROOT / "dist"
+SPEC_FILE = ROOT / "LndisAI.spec"
+CTK_CACHE_DIR = WORK_DIR / "ctk-cache"
+PROJECT_PACKAGES = ("core", "policy", "tools", "ui")
+# Modules the app never imports; excluding them shrinks the .exe and the
+# dependency graph PyInstaller has to walk.  Check build/LndisAI/warn-*.txt
+# if something breaks, then re-include it with --keep-module.
+EXCLUDES = [
+    "pytest", "setuptools", "pip", "wheel",
+    "unittest", "test", "tkinter.test", "pydoc_data", "xmlrpc",
+    "numpy", "pandas", "matplotlib", "IPython",
+]
+
+# Third-party/stdlib packages the bundle depends on; their locations are
+# resolved up front and handed to the Analysis as search paths.
+PROBE_MODULES = ["yaml", "customtkinter", "tkinter"]
+
 PYTHON = sys.executable
 PYINSTALLER = str(Path(PYTHON).parent / "Scripts" / "pyinstaller.exe")
 
@@ -20,13 +57,76 @@ if not Path(PYINSTALLER).exists():
     PYINSTALLER = None
 
 
-def build():
+def _probe_modules(mods: list[str]) -> dict[str, Path]:
+    """
+    Locate package directories concurrently without importing them.
+
+    find_spec only stats sys.path entries, so the lookups are I/O bound
+    and overlap well across threads.
+    """
+    with ThreadPoolExecutor(max_workers=len(mods)) as ex:
+        specs = dict(zip(mods, ex.map(importlib.util.find_spec, mods)))
+
+    found: dict[str, Path] = {}
+    for name, spec in specs.items():
+        if spec is None or not spec.submodule_search_locations:
+            raise SystemExit(f"  Required package not found: {name}")
+        found[name] = Path(spec.submodule_search_locations[0])
+    return found
+
+
+def _cached_ctk_data(ctk_path: Path) -> Path:
+    """
+    Snapshot the customtkinter package into build/ctk-cache/<hash>/.
+
+    The hash covers relative paths, sizes and mtimes only (no content
+    reads), so an unchanged install maps to the same immutable directory
+    and PyInstaller's own cache stays valid between builds.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for p in sorted(ctk_path.rglob("*")):
+        if "__pycache__" in p.parts or not p.is_file():
+            continue
+        st = p.stat()
+        h.update(f"{p.relative_to(ctk_path).as_posix()}|{st.st_size}|{st.st_mtime_ns}\n".encode("utf-8"))
+
+    cache_dir = CTK_CACHE_DIR / h.hexdigest()[:16]
+    if not cache_dir.exists():
+        tmp_dir = cache_dir.with_name(cache_dir.name + ".tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        shutil.copytree(ctk_path, tmp_dir, ignore=shutil.ignore_patterns("__pycache__"))
+        tmp_dir.rename(cache_dir)
+    return cache_dir
+
+
+def _clear_pycache(*roots: Path) -> None:
+    """Remove __pycache__ dirs so optimized and plain .pyc never mix."""
+    for root in roots:
+        for p in root.rglob("__pycache__"):
+            shutil.rmtree(p, ignore_errors=True)
+
+
+def _find_upx_dir() -> str | None:
+    """Locate the UPX directory from $UPX_DIR or the PATH."""
+    upx_dir = os.environ.get("UPX_DIR")
+    if upx_dir and Path(upx_dir).is_dir():
+        return upx_dir
+    upx = shutil.which("upx")
+    return str(Path(upx).parent) if upx else None
+
+
+def build(
+    fresh: bool = False,
+    optimize: bool = False,
+    keep_modules: list[str] | None = None,
+    upx: bool = True,
+):
     print("\n  Building Lndis AI Assistant .exe ...\n")
 
-    import customtkinter
-    ctk_path = Path(customtkinter.__file__).parent
-
-    sep = ";"  # Windows path separator for --add-data
+    packages = _probe_modules(PROBE_MODULES)
+    ctk_path = packages["customtkinter"]
+    search_paths = list(dict.fromkeys(str(p.parent) for p in packages.values()))
+    ctk_data = _cached_ctk_data(ctk_path)
 
     args = [
         PYINSTALLER or PYTHON,
@@ -34,54 +134,58 @@ def build():
     if PYINSTALLER is None:
         args.extend(["-m", "PyInstaller"])
 
+    # The Analysis itself lives in LndisAI.spec; only run-time options go here
     args.extend([
-        "--onefile",
-        "--windowed",
-        "--name", "LndisAI",
-
-        # Runtime hook to fix imports
-        "--runtime-hook", str(ROOT / "runtime_hook.py"),
-
-        # Add project packages as data (preserves directory structure)
-        "--add-data", f"{ROOT / 'core'}{sep}core",
-        "--add-data", f"{ROOT / 'policy'}{sep}policy",
-        "--add-data", f"{ROOT / 'tools'}{sep}tools",
+        str(SPEC_FILE),
 
-        # Add customtkinter data (themes, fonts, etc.)
-        "--add-data", f"{ctk_path}{sep}customtkinter",
-
-        # Hidden imports for modules loaded dynamically
-        "--hidden-import", "yaml",
-        "--hidden-import", "customtkinter",
-        "--hidden-import", "tkinter",
-
-        # Paths to search for imports
-        "--paths", str(ROOT),
-
-        # Clean build
-        "--clean",
+        # Persistent work/dist dirs so the analysis cache is reused
+        # (optimized builds get their own cache so bytecode never mixes)
+        "--workpath", str(WORK_DIR / "opt2" if optimize else WORK_DIR),
+        "--distpath", str(DIST_DIR),
         "--noconfirm",
-
-        # Entry point
-        str(ROOT / "ui" / "app.py"),
     ])
 
-    # Add icon if exists
-    icon = ROOT / "assets" / "icon.ico"
-    if icon.exists():
-        args.extend(["--icon", str(icon)])
+    # Release builds wipe the cache and re-analyse everything
+    if fresh:
+        args.append("--clean")
+
+    # UPX compression (exclusions for known-broken DLLs live in the spec).
+    # --noupx is a makespec option PyInstaller rejects alongside a .spec
+    # file, so the on/off choice reaches the spec via LNDIS_UPX instead.
+    upx_dir = _find_upx_dir() if upx else None
+    if upx_dir:
+        args.extend(["--upx-dir", upx_dir])
+        print(f"  UPX: {upx_dir}")
+
+    keep = set(keep_modules or [])
+    env = {
+        **os.environ,
+        "LNDIS_CTK_DATA": str(ctk_data),
+        "LNDIS_PATHS": os.pathsep.join(search_paths),
+        "LNDIS_EXCLUDES": ",".join(m for m in EXCLUDES if m not in keep),
+        "LNDIS_UPX": "1" if upx_dir else "0",
+    }
+    if optimize:
+        _clear_pycache(*(ROOT / pkg for pkg in PROJECT_PACKAGES), ctk_path)
+        env["PYTHONOPTIMIZE"] = "2"
+
+    exe_path = DIST_DIR / "LndisAI.exe"
+    prev_size = exe_path.stat().st_size if exe_path.exists() else None
 
     print(f"  Running PyInstaller...\n")
 
-    result = subprocess.run(args, cwd=str(ROOT))
+    result = subprocess.run(args, cwd=str(ROOT), env=env)
 
     if result.returncode == 0:
-        exe_path = ROOT / "dist" / "LndisAI.exe"
         if exe_path.exists():
             size_mb = exe_path.stat().st_size / (1024 * 1024)
             print(f"\n  Build successful!")
             print(f"  Output: {exe_path}")
-            print(f"  Size: {size_mb:.1f} MB\n")
+            print(f"  Size: {size_mb:.1f} MB (UPX {'on' if upx_dir else 'off'})")
+            if prev_size is not None:
+                prev_mb = prev_size / (1024 * 1024)
+                print(f"  Previous build: {prev_mb:.1f} MB ({size_mb - prev_mb:+.1f} MB)")
+            print()
         else:
             print(f"\n  Build completed but .exe not found at expected path.\n")
     else:
@@ -89,5 +193,32 @@ def build():
         sys.exit(1)
 
 
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build LndisAI.exe with PyInstaller")
+    parser.add_argument(
+        "--fresh", action="store_true",
+        help="pass --clean to PyInstaller (full rebuild, use for releases)",
+    )
+    parser.add_argument(
+        "--optimize", action="store_true",
+        help="bundle .pyc compiled with PYTHONOPTIMIZE=2 (no asserts/docstrings)",
+    )
+    parser.add_argument(
+        "--keep-module", action="append", default=[], metavar="NAME",
+        help="do not exclude NAME even though it is in EXCLUDES (repeatable)",
+    )
+    parser.add_argument(
+        "--no-upx", dest="upx", action="store_false",
+        help="do not compress the executable with UPX",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    build()
+    opts = _parse_args()
+    build(
+        fresh=opts.fresh,
+        optimize=opts.optimize,
+        keep_modules=opts.keep_module,
+        upx=opts.upx,
+    )
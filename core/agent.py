@@ -10,11 +10,14 @@ Planning modes:
 
 from __future__ import annotations
 
+import importlib
 import json
+import re
+import sys
 import time
-from datetime import datetime, timezone
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from core.models import Plan, Action, ActionStatus, PolicyDecision, ToolCall
 from core.registry import ToolRegistry
@@ -23,12 +26,18 @@ from core.llm import LLMAdapter, LLMResponse
 from core.settings import Settings
 from policy.policy_engine import PolicyEngine
 
-from tools.file_read import FileReadTool
-from tools.file_write import FileWriteTool
-from tools.command_run import CommandRunTool
-from tools.install_app import InstallAppTool
-from tools.research_local import LocalResearchTool
-from tools.research_web import WebResearchTool
+from tools.base import Tool
+
+# Tool classes are imported on demand in Agent.__init__ so that importing
+# this module stays cheap.  Keep LndisAI.spec's hiddenimports in sync.
+_TOOL_FACTORIES: list[tuple[str, str]] = [
+    ("tools.file_read", "FileReadTool"),
+    ("tools.file_write", "FileWriteTool"),
+    ("tools.command_run", "CommandRunTool"),
+    ("tools.install_app", "InstallAppTool"),
+    ("tools.research_local", "LocalResearchTool"),
+    ("tools.research_web", "WebResearchTool"),
+]
 
 
 # -- System prompt for LLM planning ----------------------------------------
@@ -54,6 +63,121 @@ If no tool is absolutely necessary for a simple greeting, respond with:
 """
 
 
+# -- Keyword planner dispatch ------------------------------------------------
+
+# First word of the request -> Agent handler method
+_KEYWORD_HANDLERS: dict[str, str] = {
+    "read": "_kw_read",       "oku": "_kw_read",
+    "write": "_kw_write",     "yaz": "_kw_write",
+    "run": "_kw_run",         "calistir": "_kw_run",
+    "install": "_kw_install", "kur": "_kw_install",
+    "search": "_kw_search",   "ara": "_kw_search",
+    "web": "_kw_web",
+    "list": "_kw_list",       "listele": "_kw_list",  "ls": "_kw_list",
+}
+_DESKTOP_RE = re.compile(r"masaüstünde|on desktop")
+_CONTENT_RE = re.compile(r"(içeriği|with content)\s*(.*)", re.IGNORECASE | re.DOTALL)
+
+
+# -- Audit constants ---------------------------------------------------------
+
+# Shared string objects for the policy_decision field of every audit entry
+_POLICY_VALUE = {d: sys.intern(d.value) for d in PolicyDecision}
+_POLICY_ALLOW = _POLICY_VALUE[PolicyDecision.ALLOW]
+_POLICY_DENY = _POLICY_VALUE[PolicyDecision.DENY]
+
+
+# -- Concurrent execution ----------------------------------------------------
+
+# Tools that only observe the world may run side by side; anything else
+# (writes, commands, installs, unknown tools) runs alone as a barrier.
+_READ_ONLY_TOOLS = frozenset({"file_read", "research_local", "research_web", "none"})
+_MAX_PARALLEL_ACTIONS = 8
+
+
+def _execution_waves(actions: list[Action]) -> list[list[Action]]:
+    """
+    Group consecutive actions into waves that are safe to run concurrently.
+
+    A wave holds read-only actions with distinct tools (tools keep their own
+    state, e.g. the local research index) that don't depend on each other.
+    Malformed ``depends_on`` indices make the whole plan run serially.
+    """
+    for i, action in enumerate(actions):
+        if any(not isinstance(d, int) or not 0 <= d < i for d in action.depends_on):
+            return [[a] for a in actions]
+
+    waves: list[list[Action]] = []
+    wave_idx: set[int] = set()
+    wave_tools: set[str] = set()
+    for i, action in enumerate(actions):
+        tool = action.tool_call.tool_name
+        joinable = (
+            waves
+            and tool in _READ_ONLY_TOOLS
+            and tool not in wave_tools
+            and wave_tools <= _READ_ONLY_TOOLS
+            and not wave_idx.intersection(action.depends_on)
+        )
+        if joinable:
+            waves[-1].append(action)
+        else:
+            waves.append([action])
+            wave_idx, wave_tools = set(), set()
+        wave_idx.add(i)
+        wave_tools.add(tool)
+    return waves
+
+
+# -- JSON extraction --------------------------------------------------------
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*")
+# Only brackets, quotes and backslashes change scanner state
+_JSON_TOKEN_RE = re.compile(r'[\[\]"\\]')
+
+
+def _find_json_array(text: str, pos: int = 0) -> str | None:
+    """
+    Return the first balanced top-level ``[...]`` in *text* at or after *pos*.
+
+    Single pass over the bracket/quote tokens, ignoring brackets inside
+    string literals.  Arrays that don't open with an object (``[{``) or
+    close immediately (``[]``) are skipped so prose like "[note]" isn't
+    mistaken for a plan.
+    """
+    while True:
+        start = text.find("[", pos)
+        if start < 0:
+            return None
+        head = text[start + 1:start + 64].lstrip()
+        if not head.startswith(("{", "]")):
+            pos = start + 1
+            continue
+
+        depth = 0
+        in_string = False
+        skip_to = -1
+        for m in _JSON_TOKEN_RE.finditer(text, start):
+            i = m.start()
+            if i < skip_to:
+                continue
+            ch = m.group()
+            if in_string:
+                if ch == "\\":
+                    skip_to = i + 2  # skip the escaped character
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == "[":
+                depth += 1
+            elif ch == "]":
+                depth -= 1
+                if depth == 0:
+                    return text[start:i + 1]
+        return None  # unbalanced -- nothing further can close it
+
+
 class Agent:
     """Orchestrates planning, approval, and execution of tool chains."""
 
@@ -70,21 +194,28 @@ class Agent:
         self.llm = LLMAdapter.from_settings(self.settings)
 
         # Register all tools
-        self.registry.register(FileReadTool(self.policy))
-        self.registry.register(FileWriteTool(self.policy))
-        self.registry.register(CommandRunTool(self.policy))
-        self.registry.register(InstallAppTool(self.policy))
-        self.registry.register(LocalResearchTool(self.policy))
-        self.registry.register(WebResearchTool(self.policy))
+        for module_name, class_name in _TOOL_FACTORIES:
+            tool_cls = getattr(importlib.import_module(module_name), class_name)
+            self.registry.register(tool_cls(self.policy))
 
         # Ensure workspace exists
         self.policy.workspace.mkdir(parents=True, exist_ok=True)
 
         # State
         self._current_plan: Plan | None = None
+        self._tools_text: str | None = None  # planner prompt cache
+
+        # Workers for plan_future(); threads are only spawned on first submit
+        self._planner_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="lndis-plan")
+
+    def register_tool(self, tool: Tool) -> None:
+        """Register an extra tool after construction (invalidates prompt cache)."""
+        self.registry.register(tool)
+        self._tools_text = None
 
     def reload_llm(self) -> None:
         """Reload the LLM adapter from current settings (after /set changes)."""
+        self.llm.close()
         self.llm = LLMAdapter.from_settings(self.settings)
 
     # -- info ---------------------------------------------------------------
@@ -102,13 +233,14 @@ class Agent:
 
     # -- planning -----------------------------------------------------------
 
-    def plan(self, user_request: str) -> Plan:
+    def plan(self, user_request: str, on_token: Callable[[str], None] | None = None) -> Plan:
         """
         Parse the user request and produce a Plan.
         Uses LLM if available, falls back to keyword parsing.
+        If on_token is given, the LLM reply is streamed to it as it arrives.
         """
         if self._llm_available:
-            actions = self._plan_with_llm(user_request)
+            actions = self._plan_with_llm(user_request, on_token)
         else:
             actions = self._plan_with_keywords(user_request)
 
@@ -120,10 +252,22 @@ class Agent:
         self._current_plan = p
         return p
 
-    def _plan_with_llm(self, user_request: str) -> list[Action]:
+    def plan_future(self, user_request: str) -> Future[Plan]:
+        """
+        Run plan() on a background worker and return its Future.
+        Lets a UI keep its event loop responsive during the LLM round-trip.
+        """
+        return self._planner_pool.submit(self.plan, user_request)
+
+    def _plan_with_llm(
+        self, user_request: str, on_token: Callable[[str], None] | None = None,
+    ) -> list[Action]:
         """Use the LLM to generate an intelligent plan."""
-        tools_info = self.registry.list_for_planner()
-        tools_text = json.dumps(tools_info, indent=2, ensure_ascii=False)
+        # The tool set is fixed after __init__, so the JSON is built once
+        if self._tools_text is None:
+            tools_info = self.registry.list_for_planner()
+            self._tools_text = json.dumps(tools_info, indent=2, ensure_ascii=False)
+        tools_text = self._tools_text
 
         messages = [
             {"role": "system", "content": SYSTEM_PROMPT},
@@ -134,7 +278,18 @@ class Agent:
             )},
         ]
 
-        response = self.llm.chat(messages, temperature=0.2, max_tokens=1500)
+        if on_token is None:
+            # Cached: re-running a /plan or retrying after a denied approval
+            # sends the identical request
+            response = self.llm.chat(messages, temperature=0.2, max_tokens=1500, cache=True)
+        else:
+            chunks = []
+            for chunk in self.llm.chat_stream(messages, temperature=0.2, max_tokens=1500, cache=True):
+                chunks.append(chunk)
+                on_token(chunk)
+            response = LLMResponse(
+                content="".join(chunks), model=self.llm.model, provider=self.llm.provider_name,
+            )
 
         # Try to parse LLM response as JSON
         actions = self._parse_llm_response(response, user_request)
@@ -169,9 +324,11 @@ class Agent:
                             continue
                         args = step.get("args", {})
                         desc = step.get("description", f"{tool_name}")
+                        deps = step.get("depends_on")
                         actions.append(Action(
                             tool_call=ToolCall(tool_name=tool_name, args=args),
                             description=desc,
+                            depends_on=deps if isinstance(deps, list) else [],
                         ))
                     if actions:
                         return actions
@@ -183,113 +340,105 @@ class Agent:
 
     def _extract_json(self, text: str) -> str | None:
         """Try to extract a JSON array from text (handles markdown code blocks)."""
-        # Try: entire text is JSON
-        stripped = text.strip()
-        if stripped.startswith("["):
-            return stripped
-
-        # Try: markdown code block
-        if "```" in text:
-            parts = text.split("```")
-            for part in parts:
-                p = part.strip()
-                # Remove language hint (json, etc.)
-                if p.startswith("json"):
-                    p = p[4:].strip()
-                if p.startswith("["):
-                    return p
-
-        return None
+        # Prefer the contents of a ```json fence, then fall back to the whole text
+        fence = _FENCE_RE.search(text)
+        if fence:
+            found = _find_json_array(text, fence.end())
+            if found:
+                return found
+        return _find_json_array(text)
 
     def _plan_with_keywords(self, request: str) -> list[Action]:
         """Simple keyword parser fallback.  Deterministic, always works."""
-        req = request.strip().lower()
-        actions: list[Action] = []
+        stripped = request.strip()
+        req = stripped.lower()
+        parts = stripped.split()
 
-        # read file
-        if req.startswith("read ") or req.startswith("oku "):
-            path = request.split(maxsplit=1)[1].strip()
-            actions.append(Action(
-                tool_call=ToolCall(tool_name="file_read", args={"path": path}),
-                description=f"Read {path}",
-            ))
+        head, sep, _ = req.partition(" ")
+        handler = _KEYWORD_HANDLERS.get(head) if sep else None
 
-        # write file (with desktop shortcuts)
-        elif req.startswith("write ") or req.startswith("yaz ") or "masaüstünde" in req or "on desktop" in req:
-            parts = request.split()
-            path = "Desktop/note.txt" # default
-            if "masaüstünde" in req:
-                # "masaüstünde test.txt oluştur" -> find the filename
-                for p in parts:
-                    if "." in p: path = f"Desktop/{p}"; break
-            elif "on desktop" in req:
-                for p in parts:
-                    if "." in p: path = f"Desktop/{p}"; break
-            else:
-                path = parts[1] if len(parts) > 1 else "untitled.txt"
-            
-            content = "Hello from Lndis AI"
-            if "içeriği" in req or "with content" in req:
-                 # simple extraction
-                 content = request.split("content")[-1].strip() if "content" in req else request.split("içeriği")[-1].strip()
-
-            actions.append(Action(
-                tool_call=ToolCall(tool_name="file_write", args={"path": path, "content": content, "mode": "create"}),
-                description=f"Write to {path}",
-            ))
-
-        # run command
-        elif req.startswith("run ") or req.startswith("calistir "):
-            cmd_str = request.split(maxsplit=1)[1].strip()
-            cmd_parts = cmd_str.split()
-            actions.append(Action(
-                tool_call=ToolCall(tool_name="command_run", args={"command": cmd_parts}),
-                description=f"Run: {cmd_str}",
-            ))
-
-        # install
-        elif req.startswith("install ") or req.startswith("kur "):
-            parts = request.split(maxsplit=2)
-            package = parts[1] if len(parts) > 1 else ""
-            import platform as _plat
-            mgr = "winget" if _plat.system() == "Windows" else "apt"
-            actions.append(Action(
-                tool_call=ToolCall(tool_name="install_app", args={"manager": mgr, "package": package}),
-                description=f"Install {package} via {mgr}",
-            ))
-
-        # search local
-        elif req.startswith("search ") or req.startswith("ara "):
-            query = request.split(maxsplit=1)[1].strip()
-            actions.append(Action(
-                tool_call=ToolCall(tool_name="research_local", args={"query": query}),
-                description=f"Search workspace for '{query}'",
-            ))
-
-        # search web
-        elif req.startswith("web "):
-            query = request.split(maxsplit=1)[1].strip()
-            actions.append(Action(
-                tool_call=ToolCall(tool_name="research_web", args={"query": query}),
-                description=f"Web search: {query}",
-            ))
-
-        # list directory
-        elif req.startswith("list ") or req.startswith("listele ") or req.startswith("ls "):
-            path = request.split(maxsplit=1)[1].strip()
-            actions.append(Action(
-                tool_call=ToolCall(tool_name="file_read", args={"path": path}),
-                description=f"List {path}",
-            ))
+        # Desktop phrases mean "write" anywhere in the sentence, but an
+        # explicit read prefix still wins.
+        if handler != "_kw_read" and _DESKTOP_RE.search(req):
+            handler = "_kw_write"
 
-        else:
+        if handler is None:
             # If no keywords match, it's NOT a tool call.
-            actions.append(Action(
+            return [Action(
                 tool_call=ToolCall(tool_name="none", args={}),
                 description="Just chatting",
-            ))
-
-        return actions
+            )]
+        # Text after the keyword, with its original spacing
+        rest = stripped[len(parts[0]):].strip()
+        return getattr(self, handler)(request, req, parts, rest)
+
+    # -- keyword handlers ---------------------------------------------------
+    #   request = original text, req = stripped lowercase,
+    #   parts = whitespace-split words, rest = text after the first word
+
+    def _kw_read(self, request: str, req: str, parts: list[str], rest: str) -> list[Action]:
+        path = rest
+        return [Action(
+            tool_call=ToolCall(tool_name="file_read", args={"path": path}),
+            description=f"Read {path}",
+        )]
+
+    def _kw_write(self, request: str, req: str, parts: list[str], rest: str) -> list[Action]:
+        # write file (with desktop shortcuts)
+        path = "Desktop/note.txt" # default
+        if _DESKTOP_RE.search(req):
+            # "masaüstünde test.txt oluştur" -> find the filename
+            path = next((f"Desktop/{p}" for p in parts if "." in p), path)
+        else:
+            path = parts[1] if len(parts) > 1 else "untitled.txt"
+
+        content = "Hello from Lndis AI"
+        m = _CONTENT_RE.search(request)
+        if m:
+            content = m.group(2).strip()
+
+        return [Action(
+            tool_call=ToolCall(tool_name="file_write", args={"path": path, "content": content, "mode": "create"}),
+            description=f"Write to {path}",
+        )]
+
+    def _kw_run(self, request: str, req: str, parts: list[str], rest: str) -> list[Action]:
+        cmd_str = rest
+        cmd_parts = parts[1:]
+        return [Action(
+            tool_call=ToolCall(tool_name="command_run", args={"command": cmd_parts}),
+            description=f"Run: {cmd_str}",
+        )]
+
+    def _kw_install(self, request: str, req: str, parts: list[str], rest: str) -> list[Action]:
+        package = parts[1] if len(parts) > 1 else ""
+        import platform as _plat
+        mgr = "winget" if _plat.system() == "Windows" else "apt"
+        return [Action(
+            tool_call=ToolCall(tool_name="install_app", args={"manager": mgr, "package": package}),
+            description=f"Install {package} via {mgr}",
+        )]
+
+    def _kw_search(self, request: str, req: str, parts: list[str], rest: str) -> list[Action]:
+        query = rest
+        return [Action(
+            tool_call=ToolCall(tool_name="research_local", args={"query": query}),
+            description=f"Search workspace for '{query}'",
+        )]
+
+    def _kw_web(self, request: str, req: str, parts: list[str], rest: str) -> list[Action]:
+        query = rest
+        return [Action(
+            tool_call=ToolCall(tool_name="research_web", args={"query": query}),
+            description=f"Web search: {query}",
+        )]
+
+    def _kw_list(self, request: str, req: str, parts: list[str], rest: str) -> list[Action]:
+        path = rest
+        return [Action(
+            tool_call=ToolCall(tool_name="file_read", args={"path": path}),
+            description=f"List {path}",
+        )]
 
     def _summarize(self, actions: list[Action]) -> str:
         if not actions:
@@ -316,8 +465,22 @@ class Agent:
         if not plan.approved:
             raise RuntimeError("plan not approved -- call agent.approve() first")
 
-        for action in plan.actions:
-            self._run_action(action)
+        waves = _execution_waves(plan.actions)
+        pool: ThreadPoolExecutor | None = None
+        try:
+            for wave in waves:
+                if len(wave) == 1:
+                    self._run_action(wave[0])
+                    continue
+                if pool is None:
+                    width = max(len(w) for w in waves)
+                    pool = ThreadPoolExecutor(max_workers=min(_MAX_PARALLEL_ACTIONS, width))
+                # _run_action records failures on the Action itself
+                list(pool.map(self._run_action, wave))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            self.audit.flush()
 
         self._current_plan = None
         return plan
@@ -330,13 +493,13 @@ class Agent:
         action.policy_decision = decision
         action.policy_reason = reason
 
-        if decision == PolicyDecision.DENY:
+        if decision is PolicyDecision.DENY:
             action.status = ActionStatus.DENIED
             action.error = reason
             self.audit.log(
                 tool_name=tc.tool_name,
                 args=tc.args,
-                policy_decision="deny",
+                policy_decision=_POLICY_DENY,
                 policy_reason=reason,
                 error=reason,
             )
@@ -344,13 +507,13 @@ class Agent:
 
         # Execute
         action.status = ActionStatus.RUNNING
-        action.started_at = datetime.now(timezone.utc)
+        action.started_at_ns = time.time_ns()
         t0 = time.perf_counter()
 
         try:
             decision_out, _, result = self.registry.call(tc.tool_name, tc.args)
             elapsed_ms = int((time.perf_counter() - t0) * 1000)
-            action.finished_at = datetime.now(timezone.utc)
+            action.finished_at_ns = time.time_ns()
 
             action.result = result
             if isinstance(result, dict) and not result.get("ok", True):
@@ -362,7 +525,7 @@ class Agent:
             self.audit.log(
                 tool_name=tc.tool_name,
                 args=tc.args,
-                policy_decision="allow",
+                policy_decision=_POLICY_ALLOW,
                 policy_reason=reason,
                 result=str(result)[:500],
                 error=action.error,
@@ -376,7 +539,7 @@ class Agent:
             self.audit.log(
                 tool_name=tc.tool_name,
                 args=tc.args,
-                policy_decision="allow",
+                policy_decision=_POLICY_ALLOW,
                 policy_reason=reason,
                 error=str(exc),
                 duration_ms=elapsed_ms,
@@ -387,7 +550,7 @@ class Agent:
     def call_tool(self, tool_name: str, **kwargs: Any) -> Any:
         """Directly call a tool -- useful for CLI one-offs."""
         decision, reason = self.policy.evaluate(tool_name, kwargs)
-        if decision == PolicyDecision.DENY:
+        if decision is PolicyDecision.DENY:
             return {"ok": False, "error": reason}
 
         t0 = time.perf_counter()
@@ -397,14 +560,15 @@ class Agent:
         self.audit.log(
             tool_name=tool_name,
             args=kwargs,
-            policy_decision=decision.value,
+            policy_decision=_POLICY_VALUE[decision],
             policy_reason=reason,
             result=str(result)[:500],
             duration_ms=elapsed,
         )
+        self.audit.flush()
         return result
 
     # -- info ---------------------------------------------------------------
 
-    def list_tools(self) -> list[dict]:
+    def list_tools(self) -> tuple[dict, ...]:
         return self.registry.list_for_planner()
@@ -4,27 +4,56 @@ Structured Audit Logger — records every tool invocation to a JSON-lines file.
 
 from __future__ import annotations
 
+import atexit
+import itertools
 import json
 import os
 import sys
+import threading
+import weakref
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from core.models import AuditEntry
 from core.settings import _get_default_settings_dir
 
-_DEFAULT_LOG_DIR = _get_default_settings_dir()
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # stdlib fallback (e.g. slim frozen builds)
+    _loads = json.loads
+
+_TAIL_CHUNK = 64 * 1024
+# How many recent entries are kept in memory; older ones live only on disk.
+_RING_SIZE = int(os.environ.get("LNDIS_AUDIT_RING", "2000"))
+
+# Loggers still open at interpreter exit get closed by one shared hook; a
+# weak set, so registering never keeps a logger (and its file) alive
+_open_loggers: weakref.WeakSet[AuditLogger] = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_loggers() -> None:
+    for logger in list(_open_loggers):
+        logger.close()
 
 
 class AuditLogger:
     """Append-only audit trail stored as newline-delimited JSON."""
 
     def __init__(self, log_dir: str | Path | None = None):
-        self._dir = Path(log_dir) if log_dir else _DEFAULT_LOG_DIR
+        self._dir = Path(log_dir) if log_dir else _get_default_settings_dir()
         self._dir.mkdir(parents=True, exist_ok=True)
         self._file = self._dir / "audit.jsonl"
-        self._entries: list[AuditEntry] = []
+        self._entries: deque[AuditEntry] = deque(maxlen=_RING_SIZE)
+        self._lock = threading.Lock()
+        # One buffered append handle for the logger's lifetime; flushed by
+        # flush()/close() and at interpreter exit.
+        self._fh = open(self._file, "ab", buffering=64 * 1024)
+        _open_loggers.add(self)
 
     # ── write ──────────────────────────────────────────────────────
 
@@ -38,40 +67,92 @@ class AuditLogger:
         error: str | None = None,
         duration_ms: int | None = None,
     ) -> AuditEntry:
+        # Interned so the ring buffer shares one copy per tool/decision even
+        # when names come from freshly parsed LLM output.
         entry = AuditEntry(
-            tool_name=tool_name,
+            tool_name=sys.intern(tool_name),
             args=args,
-            policy_decision=policy_decision,
+            policy_decision=sys.intern(policy_decision),
             policy_reason=policy_reason,
             result=result,
             error=error,
             duration_ms=duration_ms,
         )
-        self._entries.append(entry)
-        self._persist(entry)
+        with self._lock:
+            self._entries.append(entry)
+            self._persist(entry)
         return entry
 
     def _persist(self, entry: AuditEntry) -> None:
-        with open(self._file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry.to_dict(), ensure_ascii=False) + "\n")
+        self._fh.write(entry.to_json_bytes())
+        self._fh.write(b"\n")
+
+    def flush(self) -> None:
+        """Push buffered entries to disk."""
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+        _open_loggers.discard(self)
 
     # ── read ───────────────────────────────────────────────────────
 
     def recent(self, n: int = 20) -> list[AuditEntry]:
-        """Return the last *n* entries (from memory)."""
-        return list(reversed(self._entries[-n:]))
+        """Return the last *n* entries (from memory), newest first."""
+        return list(itertools.islice(reversed(self._entries), n))
 
-    def load_from_disk(self) -> list[dict]:
-        """Read all entries from the JSONL file."""
+    def iter_entries(self) -> Iterator[dict]:
+        """Yield entries from the JSONL file one at a time (oldest first)."""
+        self.flush()
         if not self._file.exists():
-            return []
-        entries = []
-        with open(self._file, "r", encoding="utf-8") as f:
+            return
+        with open(self._file, "rb") as f:
             for line in f:
                 line = line.strip()
                 if line:
-                    entries.append(json.loads(line))
-        return entries
+                    yield _loads(line)
+
+    def load_from_disk(self) -> list[dict]:
+        """Read all entries from the JSONL file."""
+        return list(self.iter_entries())
+
+    def tail(self, n: int = 20) -> list[dict]:
+        """Return the last *n* entries on disk (oldest first), reading backwards."""
+        self.flush()
+        if n <= 0 or not self._file.exists():
+            return []
+        with open(self._file, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            chunks: list[bytes] = []
+            newlines = 0
+            # n entries need n newlines plus the one terminating the previous
+            # entry; chunks are joined once, not prepended per step
+            while pos > 0 and newlines <= n:
+                step = min(_TAIL_CHUNK, pos)
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step)
+                chunks.append(chunk)
+                newlines += chunk.count(b"\n")
+        buf = b"".join(reversed(chunks))
+        pieces = buf.split(b"\n")
+        if pos > 0:
+            pieces = pieces[1:]  # first piece may be a partial line
+        lines = [ln for ln in pieces if ln.strip()]
+        return [_loads(ln) for ln in lines[-n:]]
 
     def count(self) -> int:
+        """Number of entries held in memory (capped at the ring size)."""
         return len(self._entries)
+
+    def count_on_disk(self) -> int:
+        """Total number of entries ever written to the audit file."""
+        self.flush()
+        if not self._file.exists():
+            return 0
+        with open(self._file, "rb") as f:
+            return sum(1 for line in f if line.strip())
@@ -5,6 +5,7 @@ Run with:  python -m core.cli
 
 Commands:
   /plan <request>   - generate a plan from natural language
+  /push <request>   - cancel the request in flight and plan this one
   /approve          - approve the current plan
   /run              - execute the approved plan
   /logs [n]         - show last n audit entries
@@ -18,27 +19,43 @@ Commands:
   /quit             - exit
 
 You can also type a request directly (same as /plan <request>).
+Ctrl-C cancels a request in flight; at the prompt it exits.
 """
 
 from __future__ import annotations
 
-import io
+import asyncio
+import atexit
+import functools
 import json
-import os
+import queue
+import signal
 import sys
 import textwrap
+import threading
+from pathlib import Path
+from typing import Callable, TYPE_CHECKING
 
 # Force UTF-8 on Windows console
 if sys.platform == "win32":
-    os.system("chcp 65001 >nul 2>&1")
+    import ctypes
+
+    # Same effect as `chcp 65001`, without spawning cmd.exe
+    _kernel32 = ctypes.windll.kernel32
+    _kernel32.SetConsoleOutputCP(65001)
+    _kernel32.SetConsoleCP(65001)
     if hasattr(sys.stdout, "reconfigure"):
         sys.stdout.reconfigure(encoding="utf-8", errors="replace")
     if hasattr(sys.stdin, "reconfigure"):
         sys.stdin.reconfigure(encoding="utf-8", errors="replace")
 
-from core.agent import Agent
 from core.models import ActionStatus, Plan
-from core.settings import Settings, PROVIDER_PRESETS
+
+# Agent pulls in the LLM, policy and audit stacks; main() imports it only
+# once the stdin reader is running, so startup overhead overlaps typing
+if TYPE_CHECKING:
+    from core.agent import Agent
+    from core.settings import Settings
 
 
 # -- ANSI helpers -----------------------------------------------------------
@@ -53,11 +70,33 @@ _CYAN  = "\033[96m"
 _ORANGE= "\033[38;5;214m"
 _BLUE  = "\033[94m"
 
+# Fixed colored fragments, assembled once instead of on every render
+_RULE = f"{_ORANGE}================================================{_RESET}"
+_ICON_OK = f"{_GREEN}[OK]{_RESET}"
+_ICON_DENIED = f"{_RED}[DENIED]{_RESET}"
+_ICON_FAIL = f"{_RED}[FAIL]{_RESET}"
+_ICON_UNKNOWN = f"{_YELLOW}[?]{_RESET}"
+_STATUS_ICONS = {
+    ActionStatus.COMPLETED: _ICON_OK,
+    ActionStatus.DENIED: _ICON_DENIED,
+    ActionStatus.FAILED: _ICON_FAIL,
+}
+_ERROR_LABEL = f"{_RED}Error:{_RESET}"
+_TS_FMT = "%H:%M:%S"
+_LOG_LINE = f"  {_DIM}{{ts}}{_RESET}  {{dec}}  {_CYAN}{{tool}}{_RESET}{{ms}}{{err}}"
+_APPROVE_HINT = f"  {_GREEN}-> /approve{_RESET} to approve, then {_GREEN}/run{_RESET} to execute."
+
 
 def _c(text: str, color: str) -> str:
     return f"{color}{text}{_RESET}"
 
 
+@functools.lru_cache(maxsize=None)
+def _decision_label(decision: str) -> str:
+    """Colored policy decision; there are only a handful of distinct values."""
+    return _c(decision, _GREEN if "allow" in decision else _RED)
+
+
 def _print(text: str = "") -> None:
     """Safe print that handles encoding errors gracefully."""
     try:
@@ -66,80 +105,93 @@ def _print(text: str = "") -> None:
         print(text.encode("ascii", errors="replace").decode("ascii"))
 
 
+def _write_chunk(chunk: str) -> None:
+    """Echo a streamed LLM chunk without a newline."""
+    try:
+        sys.stdout.write(f"{_DIM}{chunk}{_RESET}")
+    except UnicodeEncodeError:
+        sys.stdout.write(chunk.encode("ascii", errors="replace").decode("ascii"))
+    sys.stdout.flush()
+
+
+def _emit(lines: list[str]) -> None:
+    """Write a whole block at once: one codec pass and one flush, not one per line."""
+    text = "\n".join(lines) + "\n"
+    try:
+        sys.stdout.write(text)
+    except UnicodeEncodeError:
+        sys.stdout.write(text.encode("ascii", errors="replace").decode("ascii"))
+    sys.stdout.flush()
+
+
 # -- display helpers --------------------------------------------------------
 
 def show_plan(plan: Plan) -> None:
-    _print()
-    _print(_c("=== PLAN =======================================", _ORANGE))
-    _print(f"  {_c('ID:', _DIM)} {plan.id}")
-    _print(f"  {_c('Request:', _DIM)} {plan.user_request}")
-    _print(f"  {_c('Summary:', _DIM)} {plan.summary}")
-    _print()
+    out: list[str] = [""]
+    out.append(f"{_ORANGE}=== PLAN ======================================={_RESET}")
+    out.append(f"  {_DIM}ID:{_RESET} {plan.id}")
+    out.append(f"  {_DIM}Request:{_RESET} {plan.user_request}")
+    out.append(f"  {_DIM}Summary:{_RESET} {plan.summary}")
+    out.append("")
     for i, action in enumerate(plan.actions, 1):
         tc = action.tool_call
-        _print(f"  {_c(f'Step {i}:', _CYAN)} {action.description}")
-        _print(f"          tool={_c(tc.tool_name, _YELLOW)}  args={tc.args}")
-    _print()
-    _print(f"  {_c('-> /approve', _GREEN)} to approve, then {_c('/run', _GREEN)} to execute.")
-    _print(_c("================================================", _ORANGE))
-    _print()
+        out.append(f"  {_CYAN}Step {i}:{_RESET} {action.description}")
+        out.append(f"          tool={_YELLOW}{tc.tool_name}{_RESET}  args={tc.args}")
+    out.append("")
+    out.append(_APPROVE_HINT)
+    out.append(_RULE)
+    out.append("")
+    _emit(out)
 
 
 def show_results(plan: Plan) -> None:
-    _print()
-    _print(_c("=== RESULTS ====================================", _ORANGE))
+    out: list[str] = [""]
+    out.append(f"{_ORANGE}=== RESULTS ===================================={_RESET}")
     for i, action in enumerate(plan.actions, 1):
-        if action.status == ActionStatus.COMPLETED:
-            icon = _c("[OK]", _GREEN)
-        elif action.status == ActionStatus.DENIED:
-            icon = _c("[DENIED]", _RED)
-        elif action.status == ActionStatus.FAILED:
-            icon = _c("[FAIL]", _RED)
-        else:
-            icon = _c("[?]", _YELLOW)
-
-        _print(f"  {icon}  Step {i}: {action.description}")
+        icon = _STATUS_ICONS.get(action.status, _ICON_UNKNOWN)
+        out.append(f"  {icon}  Step {i}: {action.description}")
         if action.error:
-            _print(f"        {_c('Error:', _RED)} {action.error}")
+            out.append(f"        {_ERROR_LABEL} {action.error}")
         elif action.result:
             result = action.result
             if isinstance(result, dict):
                 if result.get("type") == "directory":
                     entries = result.get("entries", [])
-                    _print(f"        Directory: {result.get('path')} ({len(entries)} items)")
+                    out.append(f"        Directory: {result.get('path')} ({len(entries)} items)")
                     for e in entries[:15]:
                         kind = "[D]" if e["type"] == "dir" else "[F]"
-                        _print(f"          {kind} {e['name']}")
+                        out.append(f"          {kind} {e['name']}")
                     if len(entries) > 15:
-                        _print(f"          ... and {len(entries)-15} more")
+                        out.append(f"          ... and {len(entries)-15} more")
                 elif result.get("type") == "file":
                     content = result.get("content", "")
                     lines = content.split("\n")
-                    _print(f"        File: {result.get('path')} ({result.get('lines')} lines)")
+                    out.append(f"        File: {result.get('path')} ({result.get('lines')} lines)")
                     for ln in lines[:20]:
-                        _print(f"        | {ln}")
+                        out.append(f"        | {ln}")
                     if len(lines) > 20:
-                        _print(f"        | ... ({len(lines)-20} more lines)")
+                        out.append(f"        | ... ({len(lines)-20} more lines)")
                 elif "stdout" in result:
                     stdout = result["stdout"].strip()
                     if stdout:
                         for ln in stdout.split("\n")[:20]:
-                            _print(f"        | {ln}")
+                            out.append(f"        | {ln}")
                 elif "results" in result:
                     for r in result["results"][:10]:
                         if "snippet" in r and "file" in r:
-                            _print(f"        >> {r['file']}:{r.get('line','')}  {r['snippet'][:80]}")
+                            out.append(f"        >> {r['file']}:{r.get('line','')}  {r['snippet'][:80]}")
                         elif "title" in r:
-                            _print(f"        [web] {r['title']}")
-                            _print(f"              {r.get('url','')}")
+                            out.append(f"        [web] {r['title']}")
+                            out.append(f"              {r.get('url','')}")
                 else:
                     display = json.dumps(result, ensure_ascii=True, indent=2)
                     for ln in display.split("\n")[:15]:
-                        _print(f"        {ln}")
+                        out.append(f"        {ln}")
             else:
-                _print(f"        {str(result)[:200]}")
-    _print(_c("================================================", _ORANGE))
-    _print()
+                out.append(f"        {str(result)[:200]}")
+    out.append(_RULE)
+    out.append("")
+    _emit(out)
 
 
 def show_logs(agent: Agent, n: int) -> None:
@@ -147,28 +199,34 @@ def show_logs(agent: Agent, n: int) -> None:
     if not entries:
         _print(_c("  (no audit entries yet)", _DIM))
         return
-    _print()
-    _print(_c("=== AUDIT LOG ==================================", _ORANGE))
-    for e in entries:
-        ts = e.timestamp.strftime("%H:%M:%S")
-        dec = _c(e.policy_decision, _GREEN if "allow" in e.policy_decision else _RED)
-        err = f"  err={e.error}" if e.error else ""
-        ms = f"  {e.duration_ms}ms" if e.duration_ms else ""
-        _print(f"  {_c(ts, _DIM)}  {dec}  {_c(e.tool_name, _CYAN)}{ms}{err}")
-    _print(_c("================================================", _ORANGE))
-    _print()
+    out: list[str] = ["", f"{_ORANGE}=== AUDIT LOG =================================={_RESET}"]
+    fmt = _LOG_LINE.format
+    out.extend(
+        fmt(
+            ts=e.timestamp.strftime(_TS_FMT),
+            dec=_decision_label(e.policy_decision),
+            tool=e.tool_name,
+            ms=f"  {e.duration_ms}ms" if e.duration_ms else "",
+            err=f"  err={e.error}" if e.error else "",
+        )
+        for e in entries
+    )
+    out.append(_RULE)
+    out.append("")
+    _emit(out)
 
 
 def show_settings(settings: Settings) -> None:
     """Display all persistent settings."""
-    _print()
-    _print(_c("=== SETTINGS ===================================", _ORANGE))
+    out: list[str] = [""]
+    out.append(f"{_ORANGE}=== SETTINGS ==================================={_RESET}")
     for k, v in settings.all().items():
-        _print(f"  {_c(k, _CYAN):30s} {v}")
-    _print()
-    _print(f"  {_c('Supported providers:', _DIM)} {', '.join(Settings.list_providers())}")
-    _print(_c("================================================", _ORANGE))
-    _print()
+        out.append(f"  {_c(k, _CYAN):30s} {v}")
+    out.append("")
+    out.append(f"  {_c('Supported providers:', _DIM)} {', '.join(settings.list_providers())}")
+    out.append(_RULE)
+    out.append("")
+    _emit(out)
 
 
 def show_setup_guide() -> None:
@@ -200,13 +258,176 @@ def show_setup_guide() -> None:
     _print()
 
 
+# -- input queue ------------------------------------------------------------
+
+class _PlanCancelled(Exception):
+    """Raised from the token callback to abort a streaming LLM call."""
+
+
+class MessageQueue:
+    """
+    Lines typed at the prompt, read by a background thread.
+
+    The REPL is IDLE while it waits for a line and BUSY while a request
+    is in flight.  Lines typed while BUSY are queued and run afterwards;
+    Ctrl-C or "/push <request>" cancels the in-flight request instead.
+
+    With eager=False the thread only reads when the REPL asks for a line
+    and passes the prompt to input() itself -- readline needs that to
+    redraw the line while editing.  Type-ahead then waits in the terminal
+    buffer, and /push works only from the prompt.
+    """
+
+    IDLE = "idle"
+    BUSY = "busy"
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, eager: bool = True):
+        self._loop = loop
+        self._eager = eager
+        self._lines: asyncio.Queue[str | None] = asyncio.Queue()
+        self._prompts: queue.SimpleQueue[str] = queue.SimpleQueue()
+        self._asked = False
+        self._task: asyncio.Task | None = None
+        self.state = self.IDLE
+        threading.Thread(target=self._read_stdin, name="lndis-stdin", daemon=True).start()
+
+    async def get(self, prompt: str) -> str | None:
+        """Next input line, or None on EOF / Ctrl-C at the prompt."""
+        if self._lines.empty():
+            if self._eager:
+                sys.stdout.write(prompt)
+                sys.stdout.flush()
+            elif not self._asked:
+                self._asked = True
+                self._prompts.put(prompt)
+        return await self._lines.get()
+
+    async def run(self, coro):
+        """Await coro as the cancellable in-flight task; None if cancelled."""
+        self._task = asyncio.ensure_future(coro)
+        self.state = self.BUSY
+        try:
+            return await self._task
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise  # the REPL itself is shutting down
+            return None
+        finally:
+            self._task = None
+            self.state = self.IDLE
+
+    def interrupt(self) -> None:
+        """Ctrl-C: cancel the in-flight request, or quit when idle."""
+        if self._task is not None:
+            self._task.cancel()
+        elif self.state == self.IDLE:
+            self._lines.put_nowait(None)
+
+    def _feed(self, line: str | None) -> None:
+        self._asked = False
+        if line is not None and self._task is not None and line.lower().startswith("/push"):
+            request = line[5:].strip()
+            if request:
+                self._lines.put_nowait(request)
+            self._task.cancel()
+            return
+        self._lines.put_nowait(line)
+
+    def _read_stdin(self) -> None:
+        while True:
+            prompt = "" if self._eager else self._prompts.get()
+            try:
+                line = input(prompt)
+            except (EOFError, OSError, ValueError):
+                line = None
+            try:
+                self._loop.call_soon_threadsafe(self._feed, line)
+            except RuntimeError:
+                return  # event loop already closed
+            if line is None:
+                return
+
+
+_HISTORY_FILE = Path.home() / ".lndis_history"
+_HISTORY_LENGTH = 1000
+
+
+def _setup_history() -> bool:
+    """
+    Load the prompt history and save it again on exit.
+
+    Returns True when readline drives input() (an interactive terminal
+    with readline, or pyreadline3 on Windows).
+    """
+    if not sys.stdin.isatty():
+        return False
+    try:
+        import readline
+    except ImportError:
+        return False
+    try:
+        readline.read_history_file(_HISTORY_FILE)
+    except OSError:
+        pass  # first run, or unreadable -- start empty
+    readline.set_history_length(_HISTORY_LENGTH)
+    atexit.register(_save_history, readline)
+    try:
+        import termios
+    except ImportError:  # Windows
+        pass
+    else:
+        # Quitting (Ctrl-C) while the reader thread sits inside readline
+        # would otherwise leave the terminal in raw, no-echo mode
+        fd = sys.stdin.fileno()
+        atexit.register(termios.tcsetattr, fd, termios.TCSADRAIN, termios.tcgetattr(fd))
+    return True
+
+
+def _save_history(readline) -> None:
+    try:
+        readline.write_history_file(_HISTORY_FILE)
+    except OSError:
+        pass
+
+
+def _install_interrupt(loop: asyncio.AbstractEventLoop, queue: MessageQueue) -> None:
+    try:
+        loop.add_signal_handler(signal.SIGINT, queue.interrupt)
+    except NotImplementedError:
+        # Windows: the proactor loop still wakes up for signal.signal handlers
+        signal.signal(signal.SIGINT, lambda *_: loop.call_soon_threadsafe(queue.interrupt))
+
+
+async def _plan(agent: Agent, request: str) -> Plan:
+    """Plan on a worker thread; in LLM mode the reply is streamed to stdout."""
+    if agent.planning_mode != "llm":
+        return agent.plan(request)
+
+    stop = threading.Event()
+
+    def on_token(chunk: str) -> None:
+        if stop.is_set():
+            raise _PlanCancelled()
+        _write_chunk(chunk)
+
+    _print()
+    try:
+        plan = await asyncio.to_thread(agent.plan, request, on_token)
+    except asyncio.CancelledError:
+        stop.set()  # the worker gives up at its next chunk
+        _print(_c("\n  [cancelled]", _YELLOW))
+        raise
+    _print()
+    return plan
+
+
 # -- REPL -------------------------------------------------------------------
 
 def _banner(agent: Agent) -> str:
     mode = _c(agent.planning_mode.upper(), _GREEN if agent.planning_mode == "llm" else _YELLOW)
     model_info = ""
-    if hasattr(agent.llm, "model") and agent.llm.model != "none":
-        provider_label = getattr(agent.llm, "provider_name", "")
+    if agent.llm.model and agent.llm.model != "none":
+        provider_label = agent.llm.provider_name
         model_info = f" ({provider_label}/{agent.llm.model})" if provider_label else f" ({agent.llm.model})"
     return (
         f"\n{_c('+----------------------------------------------+', _ORANGE)}\n"
@@ -221,6 +442,8 @@ def _banner(agent: Agent) -> str:
 
 def handle_set(agent: Agent, parts: list[str]) -> None:
     """Handle /set key value commands."""
+    from core.settings import Settings
+
     if len(parts) < 2:
         _print(_c("  Usage: /set <key> <value>", _YELLOW))
         _print(_c("  Keys:  provider, api_key, model, base_url, temperature, max_tokens", _DIM))
@@ -290,7 +513,143 @@ def handle_set(agent: Agent, parts: list[str]) -> None:
         _print(_c("  Keys: provider, api_key, model, base_url, temperature, max_tokens", _DIM))
 
 
+# -- commands ---------------------------------------------------------------
+
+_HELP = textwrap.dedent("""
+  /plan <request>   Plan an action
+  /push <request>   Cancel the running request, plan this one
+  /approve          Approve current plan
+  /run              Execute approved plan
+  /logs [n]         Show audit log (default 10)
+  /tools            List available tools
+  /set <key> <val>  Configure settings
+  /config           Show all settings
+  /model            Show LLM adapter info
+  /network on|off   Toggle network
+  /status           Policy summary
+  /quit             Exit
+
+  Setting keys:
+    provider   - ollama, deepseek, openai, groq, openrouter
+    api_key    - your API key
+    model      - model name (deepseek-chat, gpt-4o-mini, etc.)
+    base_url   - custom API endpoint
+""")
+
+
+def _cmd_help(agent: Agent, rest: str) -> None:
+    _print(_HELP)
+
+
+def _cmd_tools(agent: Agent, rest: str) -> None:
+    _print()
+    for t in agent.list_tools():
+        _print(f"  {_c(t['name'], _CYAN):30s} {t['description']}")
+    _print()
+
+
+def _cmd_set(agent: Agent, rest: str) -> None:
+    handle_set(agent, ["/set", *rest.split()])
+
+
+def _cmd_config(agent: Agent, rest: str) -> None:
+    show_settings(agent.settings)
+
+
+def _cmd_model(agent: Agent, rest: str) -> None:
+    _print()
+    _print(f"  {_c('planning_mode', _CYAN):30s} {agent.planning_mode}")
+    _print(f"  {_c('adapter', _CYAN):30s} {type(agent.llm).__name__}")
+    for k, v in agent.llm.info().items():
+        if k == "base_url":
+            if not v:
+                continue
+            k = "endpoint"
+        _print(f"  {_c(k, _CYAN):30s} {v}")
+    _print()
+
+
+def _cmd_status(agent: Agent, rest: str) -> None:
+    s = agent.policy.summary()
+    _print()
+    _print(f"  {_c('planning_mode', _CYAN):30s} {agent.planning_mode}")
+    _print(f"  {_c('provider', _CYAN):30s} {agent.llm.provider_name}")
+    for k, v in s.items():
+        _print(f"  {_c(k, _CYAN):30s} {v}")
+    _print(f"  {_c('audit_entries', _CYAN):30s} {agent.audit.count()}")
+    _print()
+
+
+def _cmd_network(agent: Agent, rest: str) -> None:
+    if rest.split()[:1] and rest.split()[0].lower() in ("on", "true", "1"):
+        agent.policy.set_network(True)
+        _print(_c("  [+] Network ENABLED for this session.", _GREEN))
+    else:
+        agent.policy.set_network(False)
+        _print(_c("  [-] Network DISABLED.", _YELLOW))
+
+
+def _cmd_logs(agent: Agent, rest: str) -> None:
+    arg = rest.split()[:1]
+    n = int(arg[0]) if arg and arg[0].isdigit() else 10
+    show_logs(agent, n)
+
+
+def _cmd_approve(agent: Agent, rest: str) -> None:
+    if agent.current_plan is None:
+        _print(_c("  No active plan.  Use /plan <request> first.", _YELLOW))
+    elif agent.current_plan.approved:
+        _print(_c("  Plan already approved.  Use /run to execute.", _DIM))
+    else:
+        agent.approve()
+        _print(_c("  [+] Plan approved.  Use /run to execute.", _GREEN))
+
+
+async def _run(agent: Agent, lines: MessageQueue) -> None:
+    if agent.current_plan is None:
+        _print(_c("  No active plan.", _YELLOW))
+    elif not agent.current_plan.approved:
+        _print(_c("  Plan not approved.  Use /approve first.", _YELLOW))
+    else:
+        # Not cancellable: tools must not be abandoned half-way
+        lines.state = lines.BUSY
+        try:
+            plan = await asyncio.to_thread(agent.execute)
+        finally:
+            lines.state = lines.IDLE
+        show_results(plan)
+
+
+# Synchronous commands, keyed by the first word of the input line.
+# /run, /plan and /push are awaited by the REPL itself.
+COMMANDS: dict[str, Callable[[Agent, str], None]] = {
+    "/help": _cmd_help, "/h": _cmd_help, "/?": _cmd_help,
+    "/tools": _cmd_tools, "/araclar": _cmd_tools,
+    "/set": _cmd_set,
+    "/config": _cmd_config, "/settings": _cmd_config, "/ayarlar": _cmd_config,
+    "/model": _cmd_model, "/llm": _cmd_model,
+    "/status": _cmd_status,
+    "/network": _cmd_network,
+    "/logs": _cmd_logs,
+    "/approve": _cmd_approve,
+}
+_QUIT_COMMANDS = frozenset({"/quit", "/exit", "/q"})
+
+
 def main() -> None:
+    asyncio.run(_main())
+
+
+async def _main() -> None:
+    # Start reading stdin before the (slow) Agent setup, so a request typed
+    # during startup is queued and runs as soon as the prompt is ready.
+    # Under readline the terminal buffers type-ahead instead.
+    lines = MessageQueue(asyncio.get_running_loop(), eager=not _setup_history())
+    _install_interrupt(asyncio.get_running_loop(), lines)
+
+    from core.agent import Agent
+    from core.settings import Settings
+
     settings = Settings()
     agent = Agent(settings=settings)
 
@@ -301,139 +660,40 @@ def main() -> None:
         show_setup_guide()
 
     while True:
-        try:
-            raw = input(_c("lndis> ", _ORANGE)).strip().lstrip("\ufeff")
-        except (EOFError, KeyboardInterrupt):
+        raw = await lines.get(_c("lndis> ", _ORANGE))
+        if raw is None:
             _print("\nBye!")
             break
+        raw = raw.strip().lstrip("\ufeff")
 
         if not raw:
             continue
 
-        # -- /quit --
-        if raw.lower() in ("/quit", "/exit", "/q"):
+        cmd, _, rest = raw.partition(" ")
+        cmd = cmd.lower()
+        rest = rest.strip()
+
+        if cmd in _QUIT_COMMANDS:
             _print("Bye!")
             break
 
-        # -- /help --
-        if raw.lower() in ("/help", "/h", "/?"):
-            _print(textwrap.dedent("""
-              /plan <request>   Plan an action
-              /approve          Approve current plan
-              /run              Execute approved plan
-              /logs [n]         Show audit log (default 10)
-              /tools            List available tools
-              /set <key> <val>  Configure settings
-              /config           Show all settings
-              /model            Show LLM adapter info
-              /network on|off   Toggle network
-              /status           Policy summary
-              /quit             Exit
-
-              Setting keys:
-                provider   - ollama, deepseek, openai, groq, openrouter
-                api_key    - your API key
-                model      - model name (deepseek-chat, gpt-4o-mini, etc.)
-                base_url   - custom API endpoint
-            """))
+        handler = COMMANDS.get(cmd)
+        if handler is not None:
+            handler(agent, rest)
             continue
 
-        # -- /tools --
-        if raw.lower() in ("/tools", "/araclar"):
-            tools = agent.list_tools()
-            _print()
-            for t in tools:
-                _print(f"  {_c(t['name'], _CYAN):30s} {t['description']}")
-            _print()
+        if cmd == "/run":
+            await _run(agent, lines)
             continue
 
-        # -- /set --
-        if raw.lower().startswith("/set"):
-            parts = raw.split()
-            handle_set(agent, parts)
-            continue
-
-        # -- /config --
-        if raw.lower() in ("/config", "/settings", "/ayarlar"):
-            show_settings(agent.settings)
-            continue
-
-        # -- /model --
-        if raw.lower() in ("/model", "/llm"):
-            _print()
-            _print(f"  {_c('planning_mode', _CYAN):30s} {agent.planning_mode}")
-            _print(f"  {_c('adapter', _CYAN):30s} {type(agent.llm).__name__}")
-            _print(f"  {_c('provider', _CYAN):30s} {getattr(agent.llm, 'provider_name', 'unknown')}")
-            if hasattr(agent.llm, 'model'):
-                _print(f"  {_c('model', _CYAN):30s} {agent.llm.model}")
-            if hasattr(agent.llm, 'base_url'):
-                _print(f"  {_c('endpoint', _CYAN):30s} {agent.llm.base_url}")
-            _print(f"  {_c('available', _CYAN):30s} {agent.llm.is_available()}")
-            _print()
-            continue
-
-        # -- /status --
-        if raw.lower() == "/status":
-            s = agent.policy.summary()
-            _print()
-            _print(f"  {_c('planning_mode', _CYAN):30s} {agent.planning_mode}")
-            _print(f"  {_c('provider', _CYAN):30s} {getattr(agent.llm, 'provider_name', 'unknown')}")
-            for k, v in s.items():
-                _print(f"  {_c(k, _CYAN):30s} {v}")
-            _print(f"  {_c('audit_entries', _CYAN):30s} {agent.audit.count()}")
-            _print()
-            continue
-
-        # -- /network --
-        if raw.lower().startswith("/network"):
-            parts = raw.split()
-            if len(parts) >= 2 and parts[1].lower() in ("on", "true", "1"):
-                agent.policy.set_network(True)
-                _print(_c("  [+] Network ENABLED for this session.", _GREEN))
-            else:
-                agent.policy.set_network(False)
-                _print(_c("  [-] Network DISABLED.", _YELLOW))
-            continue
-
-        # -- /logs --
-        if raw.lower().startswith("/logs"):
-            parts = raw.split()
-            n = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 10
-            show_logs(agent, n)
-            continue
-
-        # -- /approve --
-        if raw.lower() == "/approve":
-            if agent.current_plan is None:
-                _print(_c("  No active plan.  Use /plan <request> first.", _YELLOW))
-            elif agent.current_plan.approved:
-                _print(_c("  Plan already approved.  Use /run to execute.", _DIM))
-            else:
-                agent.approve()
-                _print(_c("  [+] Plan approved.  Use /run to execute.", _GREEN))
-            continue
-
-        # -- /run --
-        if raw.lower() == "/run":
-            if agent.current_plan is None:
-                _print(_c("  No active plan.", _YELLOW))
-            elif not agent.current_plan.approved:
-                _print(_c("  Plan not approved.  Use /approve first.", _YELLOW))
-            else:
-                plan = agent.execute()
-                show_results(plan)
-            continue
-
-        # -- /plan <request> or bare request --
-        request = raw
-        if raw.lower().startswith("/plan "):
-            request = raw[6:].strip()
-
+        # -- /plan <request>, /push <request> or bare request --
+        request = rest if cmd in ("/plan", "/push") else raw
         if not request:
             continue
 
-        plan = agent.plan(request)
-        show_plan(plan)
+        plan = await lines.run(_plan(agent, request))
+        if plan is not None:
+            show_plan(plan)
 
 
 if __name__ == "__main__":
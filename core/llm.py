@@ -19,16 +19,52 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import functools
+import hashlib
+import http.client
 import json
 import os
-import urllib.error
+import ssl
+import sys
+import threading
+import time
+import urllib.parse
 import urllib.request
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, TYPE_CHECKING
+from typing import Any, Iterator, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from core.settings import Settings
 
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+
+    def _dumps_sorted(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+except ImportError:  # stdlib fallback (e.g. slim frozen builds)
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def _dumps_sorted(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+    _loads = json.loads
+
+
+# Provider label for a configured base_url, by host name
+HOST_TO_PROVIDER: dict[str, str] = {
+    "api.deepseek.com": "deepseek",
+    "api.openai.com": "openai",
+    "api.groq.com": "groq",
+    "openrouter.ai": "openrouter",
+}
+
 
 # -- Response dataclass -----------------------------------------------------
 
@@ -42,12 +78,213 @@ class LLMResponse:
     raw: dict = field(default_factory=dict)
 
 
+# -- Keep-alive HTTP pool ----------------------------------------------------
+
+# Same User-Agent urllib.request used to send, so providers see no change
+_USER_AGENT = f"Python-urllib/{sys.version_info.major}.{sys.version_info.minor}"
+_DEFAULT_HEADERS = {"User-Agent": _USER_AGENT}
+_JSON_HEADERS = {"User-Agent": _USER_AGENT, "Content-Type": "application/json"}
+
+
+@functools.lru_cache(maxsize=None)
+def _ssl_context() -> ssl.SSLContext:
+    """
+    One verified TLS context for every HTTPS connection.
+
+    http.client otherwise builds a fresh context (and re-reads the CA
+    bundle) per connection.  Created on first use, so keyword-only
+    sessions never pay for it.
+    """
+    ctx = ssl.create_default_context()
+    ctx.set_alpn_protocols(["http/1.1"])  # what http.client advertises itself
+    return ctx
+
+
+class _ConnectionPool:
+    """
+    Small keep-alive pool of http.client connections, keyed by origin.
+
+    Reusing the socket skips the TCP (and TLS) handshake on every chat
+    call.  Honors HTTP(S)_PROXY / NO_PROXY like urllib does.
+    """
+
+    def __init__(self, maxsize: int = 4):
+        self._maxsize = maxsize
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float = 60,
+    ) -> tuple[int, bytes]:
+        """Send a request and return (status, body).  Raises OSError/HTTPException."""
+        with self.stream(method, url, body, headers, timeout) as resp:
+            return resp.status, resp.read()
+
+    @contextlib.contextmanager
+    def stream(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float = 60,
+    ) -> Iterator[http.client.HTTPResponse]:
+        """
+        Send a request and yield the open response for incremental reads.
+
+        The connection goes back to the pool only if the body was read to
+        the end; abandoning a stream half-way closes the socket instead.
+        """
+        parts = urllib.parse.urlsplit(url)
+        https = parts.scheme == "https"
+        host = parts.hostname or ""
+        port = parts.port or (443 if https else 80)
+        key = (parts.scheme, host, port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        proxy = self._proxy_for(parts.scheme, host)
+        if proxy and not https:
+            target = url  # plain-HTTP proxies take the absolute URL
+
+        resp = None
+        conn = self._take_idle(key, timeout)
+        if conn is not None:
+            try:
+                resp = self._send(conn, method, target, body, headers)
+            except (ConnectionResetError, BrokenPipeError, http.client.RemoteDisconnected):
+                pass  # server dropped the idle socket -- retry on a fresh one
+        if resp is None:
+            conn = self._connect(key, proxy, timeout)
+            resp = self._send(conn, method, target, body, headers)
+
+        try:
+            yield resp
+        except BaseException:
+            conn.close()
+            raise
+        if resp.isclosed() and not resp.will_close:
+            self._release(key, conn)
+        else:
+            conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    # -- internals ----------------------------------------------------------
+
+    @staticmethod
+    def _proxy_for(scheme: str, host: str) -> urllib.parse.SplitResult | None:
+        proxy = urllib.request.getproxies().get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        return urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+    def _take_idle(self, key, timeout: float) -> http.client.HTTPConnection | None:
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        return conn
+
+    @staticmethod
+    def _connect(key, proxy, timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            if proxy is None:
+                return http.client.HTTPSConnection(host, port, timeout=timeout, context=_ssl_context())
+            conn = http.client.HTTPSConnection(
+                proxy.hostname, proxy.port or 80, timeout=timeout, context=_ssl_context(),
+            )
+            conn.set_tunnel(host, port)
+            return conn
+        if proxy is None:
+            return http.client.HTTPConnection(host, port, timeout=timeout)
+        return http.client.HTTPConnection(proxy.hostname, proxy.port or 80, timeout=timeout)
+
+    @staticmethod
+    def _send(conn, method, target, body, headers) -> http.client.HTTPResponse:
+        try:
+            if headers is None:
+                headers = _DEFAULT_HEADERS
+            elif "User-Agent" not in headers:
+                headers = {"User-Agent": _USER_AGENT, **headers}
+            conn.request(method, target, body=body, headers=headers)
+            return conn.getresponse()
+        except BaseException:
+            conn.close()
+            raise
+
+    def _release(self, key, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self._maxsize:
+                idle.append(conn)
+                return
+        conn.close()
+
+
+def _iter_lines(resp: http.client.HTTPResponse, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Split a streamed body into lines as it arrives.
+
+    read1() hands back whatever one socket read produced, and the split
+    happens in C -- unlike line iteration, which peeks and copies per line.
+    """
+    pending = b""
+    while chunk := resp.read1(chunk_size):
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
 # -- Base class -------------------------------------------------------------
 
+# Replies are cached at near-deterministic temperatures, or when the
+# caller asks (the planner, whose re-runs and retries repeat a request)
+_RESPONSE_CACHE_SIZE = 128
+_CACHE_MAX_TEMPERATURE = 0.1
+
+
 class LLMAdapter:
     """Abstract LLM adapter."""
 
     provider_name: str = "unknown"
+    model: str = ""
+    base_url: str = ""
+    _http: _ConnectionPool | None = None
+
+    def __init__(self):
+        self._responses: OrderedDict[tuple, LLMResponse] = OrderedDict()
+        self._responses_lock = threading.Lock()
+        self._tools_cache: tuple[list[dict], list[dict]] | None = None
+
+    def info(self) -> dict[str, Any]:
+        """Provider, model, endpoint and reachability in one call (for status views)."""
+        return {
+            "provider": self.provider_name,
+            "model": self.model,
+            "base_url": self.base_url,
+            "available": self.is_available(),
+        }
+
+    def close(self) -> None:
+        """Release pooled HTTP connections."""
+        if self._http is not None:
+            self._http.close()
 
     def chat(
         self,
@@ -55,9 +292,178 @@ class LLMAdapter:
         tools: list[dict] | None = None,
         temperature: float = 0.3,
         max_tokens: int = 2048,
+        cache: bool = False,
+    ) -> LLMResponse:
+        """
+        Send a conversation and return the reply.
+
+        Identical low-temperature requests, or any with cache=True (re-running
+        the same /plan), are answered from a small LRU instead of another
+        round-trip.
+        """
+        if not cache and temperature > _CACHE_MAX_TEMPERATURE:
+            return self._chat(messages, tools, temperature, max_tokens)
+
+        key = self._cache_key(messages, tools, temperature, max_tokens)
+        hit = self._cached(key)
+        if hit is not None:
+            return hit
+
+        response = self._chat(messages, tools, temperature, max_tokens)
+        if response.raw:  # error replies carry no body -- never pin them
+            self._remember(key, response)
+        return response
+
+    def _cache_key(self, messages: list[dict[str, str]], tools: list[dict] | None,
+                   temperature: float, max_tokens: int) -> tuple:
+        digest = hashlib.blake2b(_dumps_sorted([messages, tools]), digest_size=16).digest()
+        return (self.model, temperature, max_tokens, digest)
+
+    def _cached(self, key: tuple) -> LLMResponse | None:
+        with self._responses_lock:
+            hit = self._responses.get(key)
+            if hit is not None:
+                self._responses.move_to_end(key)
+            return hit
+
+    def _remember(self, key: tuple, response: LLMResponse) -> None:
+        with self._responses_lock:
+            self._responses[key] = response
+            if len(self._responses) > _RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+
+    def _chat(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[dict] | None,
+        temperature: float,
+        max_tokens: int,
     ) -> LLMResponse:
         raise NotImplementedError
 
+    def _formatted_tools(self, tools: list[dict]) -> list[dict]:
+        """
+        _format_tools() memoized on the tools list object.
+
+        Callers pass the same list every turn; holding a reference (rather
+        than keying on id()) means the identity check can never be fooled
+        by a recycled address.
+        """
+        cached = self._tools_cache
+        if cached is not None and cached[0] is tools:
+            return cached[1]
+        formatted = self._format_tools(tools)
+        self._tools_cache = (tools, formatted)
+        return formatted
+
+    def _format_tools(self, tools: list[dict]) -> list[dict]:
+        """Convert registry tool specs to OpenAI-style function schemas (Ollama uses the same)."""
+        formatted = []
+        for t in tools:
+            props, req_list = {}, []
+            for pname, pinfo in t.get("input_schema", {}).items():
+                props[pname] = {"type": pinfo.get("type", "string"), "description": pinfo.get("description", "")}
+                if "default" not in pinfo:
+                    req_list.append(pname)
+            formatted.append({
+                "type": "function",
+                "function": {"name": t["name"], "description": t["description"],
+                             "parameters": {"type": "object", "properties": props, "required": req_list}},
+            })
+        return formatted
+
+    def _parse_tool_calls(self, msg: dict) -> list[dict]:
+        """
+        Normalise a reply's tool calls to {"name", "args"} dicts.
+
+        OpenAI-compatible APIs send arguments as a JSON string, Ollama as
+        an object; both shapes are accepted.
+        """
+        parsed = []
+        for call in msg.get("tool_calls") or []:
+            fn = call.get("function", {})
+            args = fn.get("arguments", {})
+            if isinstance(args, str):
+                try:
+                    args = _loads(args)
+                except json.JSONDecodeError:
+                    args = {}
+            parsed.append({"name": fn.get("name", ""), "args": args})
+        return parsed
+
+    def chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: int = 2048,
+        cache: bool = False,
+    ) -> Iterator[str]:
+        """
+        Yield the reply text in chunks as it arrives.
+
+        Cached like chat(): a hit is yielded as one chunk, and a stream that
+        completes without error is remembered once fully consumed.
+        """
+        if not cache and temperature > _CACHE_MAX_TEMPERATURE:
+            yield from self._chat_stream(messages, temperature, max_tokens)
+            return
+
+        key = self._cache_key(messages, None, temperature, max_tokens)
+        hit = self._cached(key)
+        if hit is not None:
+            yield hit.content
+            return
+
+        chunks = []
+        stream = self._chat_stream(messages, temperature, max_tokens)
+        while True:
+            try:
+                chunk = next(stream)
+            except StopIteration as stop:
+                failed = stop.value is False  # _chat_stream returns False after an error chunk
+                break
+            chunks.append(chunk)
+            yield chunk
+        if not failed:
+            self._remember(key, LLMResponse(
+                content="".join(chunks), model=self.model, provider=self.provider_name,
+            ))
+
+    def _chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+    ) -> Iterator[str]:
+        """Default: the whole reply as one chunk; returns False if it was an error."""
+        response = self._chat(messages, None, temperature, max_tokens)
+        yield response.content
+        return bool(response.raw)
+
+    async def achat(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[dict] | None = None,
+        temperature: float = 0.3,
+        max_tokens: int = 2048,
+    ) -> LLMResponse:
+        """chat() on a worker thread, for callers running an event loop."""
+        return await asyncio.to_thread(
+            self.chat, messages, tools=tools, temperature=temperature, max_tokens=max_tokens,
+        )
+
+    async def achat_many(
+        self,
+        batches: list[list[dict[str, str]]],
+        temperature: float = 0.3,
+        max_tokens: int = 2048,
+    ) -> list[LLMResponse]:
+        """Send independent conversations concurrently; results keep input order."""
+        return list(await asyncio.gather(*(
+            self.achat(messages, temperature=temperature, max_tokens=max_tokens)
+            for messages in batches
+        )))
+
     def is_available(self) -> bool:
         raise NotImplementedError
 
@@ -81,7 +487,7 @@ class LLMAdapter:
                 mdl = model or "deepseek-chat"
                 return OpenAICompatAdapter(
                     model=mdl, api_key=api_key, base_url=url,
-                    provider_label="deepseek" if "deepseek" in url else "openai",
+                    provider_label=HOST_TO_PROVIDER.get(urllib.parse.urlsplit(url).hostname or "", "openai"),
                 )
             # 3. Try env var
             env_key = os.environ.get("OPENAI_API_KEY", "") or os.environ.get("DEEPSEEK_API_KEY", "")
@@ -134,29 +540,43 @@ class LLMAdapter:
 
 # -- Ollama (local) ---------------------------------------------------------
 
+# How long an Ollama reachability probe result is trusted
+_PROBE_TTL = 5.0
+
+
 class OllamaAdapter(LLMAdapter):
     """Connects to a local Ollama server."""
 
     provider_name = "ollama"
+    # base_url -> (monotonic time, reachable); shared because reload_llm()
+    # builds a fresh adapter after every /set
+    _probe_cache: dict[str, tuple[float, bool]] = {}
 
     def __init__(self, model: str = "llama3.2", base_url: str = "http://localhost:11434", **_: Any):
+        super().__init__()
         self.model = model
         self.base_url = base_url.rstrip("/")
+        self._http = _ConnectionPool()
 
     def is_available(self) -> bool:
+        cached = self._probe_cache.get(self.base_url)
+        if cached is not None and time.monotonic() - cached[0] < _PROBE_TTL:
+            return cached[1]
+        # Probing through the pool leaves a warm socket for the first chat()
         try:
-            req = urllib.request.Request(f"{self.base_url}/api/tags", method="GET")
-            with urllib.request.urlopen(req, timeout=2) as resp:
-                return resp.status == 200
+            status, _ = self._http.request("GET", f"{self.base_url}/api/tags", timeout=2)
+            available = status == 200
         except Exception:
-            return False
+            available = False
+        self._probe_cache[self.base_url] = (time.monotonic(), available)
+        return available
 
-    def chat(
+    def _chat(
         self,
         messages: list[dict[str, str]],
-        tools: list[dict] | None = None,
-        temperature: float = 0.3,
-        max_tokens: int = 2048,
+        tools: list[dict] | None,
+        temperature: float,
+        max_tokens: int,
     ) -> LLMResponse:
         payload: dict[str, Any] = {
             "model": self.model,
@@ -165,20 +585,23 @@ class OllamaAdapter(LLMAdapter):
             "options": {"temperature": temperature, "num_predict": max_tokens},
         }
         if tools:
-            payload["tools"] = self._format_tools(tools)
-
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
-            f"{self.base_url}/api/chat",
-            data=data,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
+            payload["tools"] = self._formatted_tools(tools)
+
+        data = _dumps(payload)
         try:
-            with urllib.request.urlopen(req, timeout=120) as resp:
-                body = json.loads(resp.read().decode("utf-8"))
-        except urllib.error.URLError as exc:
+            status, raw = self._http.request(
+                "POST",
+                f"{self.base_url}/api/chat",
+                body=data,
+                headers=_JSON_HEADERS,
+                timeout=120,
+            )
+        except (OSError, http.client.HTTPException) as exc:
             return LLMResponse(content=f"[Ollama error: {exc}]", model=self.model, provider="ollama")
+        if status >= 400:
+            detail = raw.decode("utf-8", errors="replace")[:500]
+            return LLMResponse(content=f"[Ollama error: HTTP {status}: {detail}]", model=self.model, provider="ollama")
+        body = _loads(raw)
 
         msg = body.get("message", {})
         return LLMResponse(
@@ -190,25 +613,41 @@ class OllamaAdapter(LLMAdapter):
             raw=body,
         )
 
-    def _format_tools(self, tools: list[dict]) -> list[dict]:
-        formatted = []
-        for t in tools:
-            props, req_list = {}, []
-            for pname, pinfo in t.get("input_schema", {}).items():
-                props[pname] = {"type": pinfo.get("type", "string"), "description": pinfo.get("description", "")}
-                if "default" not in pinfo:
-                    req_list.append(pname)
-            formatted.append({
-                "type": "function",
-                "function": {"name": t["name"], "description": t["description"],
-                             "parameters": {"type": "object", "properties": props, "required": req_list}},
-            })
-        return formatted
-
-    def _parse_tool_calls(self, msg: dict) -> list[dict]:
-        return [{"name": c.get("function", {}).get("name", ""),
-                 "args": c.get("function", {}).get("arguments", {})}
-                for c in msg.get("tool_calls", [])]
+    def _chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+    ) -> Iterator[str]:
+        """Yield message.content from Ollama's NDJSON stream."""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "stream": True,
+            "options": {"temperature": temperature, "num_predict": max_tokens},
+        }
+        data = _dumps(payload)
+        try:
+            with self._http.stream(
+                "POST",
+                f"{self.base_url}/api/chat",
+                body=data,
+                headers=_JSON_HEADERS,
+                timeout=120,
+            ) as resp:
+                if resp.status >= 400:
+                    detail = resp.read().decode("utf-8", errors="replace")[:500]
+                    yield f"[Ollama error: HTTP {resp.status}: {detail}]"
+                    return False
+                for line in _iter_lines(resp):
+                    if not line.strip():
+                        continue
+                    text = _loads(line).get("message", {}).get("content", "")
+                    if text:
+                        yield text
+        except (OSError, http.client.HTTPException) as exc:
+            yield f"[Ollama error: {exc}]"
+            return False
 
 
 # -- OpenAI-compatible (DeepSeek, OpenAI, Groq, OpenRouter) -----------------
@@ -224,27 +663,30 @@ class OpenAICompatAdapter(LLMAdapter):
         provider_label: str = "deepseek",
         **_: Any,
     ):
+        super().__init__()
         self.model = model
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
         self.base_url = base_url.rstrip("/")
         self.provider_name = provider_label
+        self._http = _ConnectionPool()
+        # Some providers already have /v1 in the base_url
+        if self.base_url.endswith("/v1") or "/v1/" in self.base_url:
+            self._chat_url = f"{self.base_url}/chat/completions"
+        else:
+            self._chat_url = f"{self.base_url}/v1/chat/completions"
+        # Constant per adapter (reload_llm() builds a new one on key change)
+        self._headers = {**_JSON_HEADERS, "Authorization": f"Bearer {self.api_key}"}
 
     def is_available(self) -> bool:
         return bool(self.api_key)
 
-    def chat(
+    def _chat(
         self,
         messages: list[dict[str, str]],
-        tools: list[dict] | None = None,
-        temperature: float = 0.3,
-        max_tokens: int = 2048,
+        tools: list[dict] | None,
+        temperature: float,
+        max_tokens: int,
     ) -> LLMResponse:
-        # Build the endpoint URL
-        url = f"{self.base_url}/chat/completions"
-        # Some providers already have /v1 in the base_url
-        if not self.base_url.endswith("/v1") and "/v1/" not in self.base_url:
-            url = f"{self.base_url}/v1/chat/completions"
-
         payload: dict[str, Any] = {
             "model": self.model,
             "messages": messages,
@@ -252,39 +694,27 @@ class OpenAICompatAdapter(LLMAdapter):
             "max_tokens": max_tokens,
         }
         if tools:
-            payload["tools"] = self._format_tools(tools)
-
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
-            url,
-            data=data,
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}",
-            },
-            method="POST",
-        )
+            payload["tools"] = self._formatted_tools(tools)
 
+        data = _dumps(payload)
         try:
-            with urllib.request.urlopen(req, timeout=90) as resp:
-                body = json.loads(resp.read().decode("utf-8"))
-        except urllib.error.HTTPError as exc:
-            error_body = ""
-            try:
-                error_body = exc.read().decode("utf-8", errors="replace")[:500]
-            except Exception:
-                pass
+            status, raw = self._http.request(
+                "POST", self._chat_url, body=data, headers=self._headers, timeout=90,
+            )
+        except (OSError, http.client.HTTPException) as exc:
             return LLMResponse(
-                content=f"[{self.provider_name} API error {exc.code}: {error_body}]",
+                content=f"[{self.provider_name} connection error: {exc}]",
                 model=self.model,
                 provider=self.provider_name,
             )
-        except urllib.error.URLError as exc:
+        if status >= 400:
+            error_body = raw.decode("utf-8", errors="replace")[:500]
             return LLMResponse(
-                content=f"[{self.provider_name} connection error: {exc}]",
+                content=f"[{self.provider_name} API error {status}: {error_body}]",
                 model=self.model,
                 provider=self.provider_name,
             )
+        body = _loads(raw)
 
         choice = body.get("choices", [{}])[0]
         msg = choice.get("message", {})
@@ -298,34 +728,42 @@ class OpenAICompatAdapter(LLMAdapter):
             raw=body,
         )
 
-    def _format_tools(self, tools: list[dict]) -> list[dict]:
-        formatted = []
-        for t in tools:
-            props, req_list = {}, []
-            for pname, pinfo in t.get("input_schema", {}).items():
-                props[pname] = {"type": pinfo.get("type", "string"), "description": pinfo.get("description", "")}
-                if "default" not in pinfo:
-                    req_list.append(pname)
-            formatted.append({
-                "type": "function",
-                "function": {"name": t["name"], "description": t["description"],
-                             "parameters": {"type": "object", "properties": props, "required": req_list}},
-            })
-        return formatted
-
-    def _parse_tool_calls(self, msg: dict) -> list[dict]:
-        calls = msg.get("tool_calls", [])
-        parsed = []
-        for call in calls:
-            fn = call.get("function", {})
-            args = fn.get("arguments", "{}")
-            if isinstance(args, str):
-                try:
-                    args = json.loads(args)
-                except json.JSONDecodeError:
-                    args = {}
-            parsed.append({"name": fn.get("name", ""), "args": args})
-        return parsed
+    def _chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+    ) -> Iterator[str]:
+        """Yield choices[0].delta.content from the server-sent event stream."""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+        }
+        data = _dumps(payload)
+        try:
+            with self._http.stream(
+                "POST", self._chat_url, body=data, headers=self._headers, timeout=90,
+            ) as resp:
+                if resp.status >= 400:
+                    error_body = resp.read().decode("utf-8", errors="replace")[:500]
+                    yield f"[{self.provider_name} API error {resp.status}: {error_body}]"
+                    return False
+                for line in _iter_lines(resp):
+                    if not line.startswith(b"data:"):
+                        continue  # blank separators, comments, event: lines
+                    event = line[5:].strip()
+                    if event == b"[DONE]":
+                        continue
+                    choices = _loads(event).get("choices") or [{}]
+                    text = choices[0].get("delta", {}).get("content")
+                    if text:
+                        yield text
+        except (OSError, http.client.HTTPException) as exc:
+            yield f"[{self.provider_name} connection error: {exc}]"
+            return False
 
 
 # -- Fallback (no LLM) -----------------------------------------------------
@@ -336,12 +774,13 @@ class FallbackAdapter(LLMAdapter):
     provider_name = "none"
 
     def __init__(self):
+        super().__init__()
         self.model = "none"
 
     def is_available(self) -> bool:
         return True  # always "available" as fallback
 
-    def chat(self, messages: list[dict[str, str]], **_: Any) -> LLMResponse:
+    def _chat(self, messages: list[dict[str, str]], *_: Any) -> LLMResponse:
         return LLMResponse(
             content=(
                 "No LLM configured. Use /set provider deepseek and "
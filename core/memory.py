@@ -4,72 +4,308 @@ Simple SQLite-backed memory for conversation / context storage (optional).
 
 from __future__ import annotations
 
+import contextlib
 import json
+import queue
 import sqlite3
-import uuid
+import threading
+import time
+import zlib
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterable, Iterator
+
+from core.models import _new_id
+
+try:
+    import zstandard
+
+    _zstd_c = zstandard.ZstdCompressor(level=3)
+    _zstd_d = zstandard.ZstdDecompressor()
+except ImportError:  # optional; zlib (stdlib) is used instead
+    zstandard = None
 
 
 _DEFAULT_DB = Path(__file__).resolve().parent.parent / "data" / "memory.db"
 
+# Applied to every connection.  WAL + synchronous=NORMAL fsyncs only at
+# checkpoints; a power cut can lose the last commits but never corrupts.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",      # 64 MB page cache
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA mmap_size=268435456",    # 256 MB
+)
+
+
+_CONVERSATIONS_DDL = """
+            CREATE TABLE IF NOT EXISTS {table} (
+                id   TEXT PRIMARY KEY,
+                role TEXT NOT NULL,
+                content BLOB NOT NULL,  -- tag byte + utf-8 (see _pack)
+                ts   INTEGER NOT NULL  -- unix epoch, microseconds (UTC)
+            );"""
+
+
+# Message bodies above this size are stored compressed
+_COMPRESS_MIN = 512
+_RAW, _ZSTD, _ZLIB = b"\x00", b"\x01", b"\x02"
+
+
+def _pack(content: str) -> bytes:
+    """Encode a message body: one tag byte, then raw or compressed utf-8."""
+    data = content.encode("utf-8")
+    if len(data) <= _COMPRESS_MIN:
+        return _RAW + data
+    if zstandard is not None:
+        return _ZSTD + _zstd_c.compress(data)
+    return _ZLIB + zlib.compress(data, 6)
+
+
+def _unpack(value: bytes | str) -> str:
+    if isinstance(value, str):  # rows written before compression existed
+        return value
+    tag, data = value[:1], value[1:]
+    if tag == _ZSTD:
+        if zstandard is None:
+            raise RuntimeError("message was stored zstd-compressed; install 'zstandard' to read it")
+        data = _zstd_d.decompress(data)
+    elif tag == _ZLIB:
+        data = zlib.decompress(data)
+    return data.decode("utf-8")
+
+
+def _now_us() -> int:
+    return time.time_ns() // 1000
+
+
+def _iso_to_us(ts: str) -> int:
+    dt = datetime.fromisoformat(ts)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp()) * 1_000_000 + dt.microsecond
+
+
+def _us_to_iso(us: int) -> str:
+    return datetime.fromtimestamp(us / 1_000_000, timezone.utc).isoformat()
+
+
+class _ReaderPool:
+    """
+    Bounded pool of read-only connections.
+
+    Under WAL, readers never block the writer or each other, so history
+    and kv lookups run alongside writes instead of queueing behind them.
+    Connections are opened on demand up to *size*; after that, acquire()
+    waits for one to be released.
+    """
+
+    def __init__(self, connect, size: int):
+        self._connect = connect
+        self._size = size
+        self._idle: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+        self._all: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self._size:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+        return self._idle.get()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        self._idle.put(conn)
+
+    @contextlib.contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        conn = self.acquire_reader()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+
 
 class Memory:
     """Lightweight key-value + conversation store."""
 
-    def __init__(self, db_path: str | Path | None = None):
+    # Fixed SQL text so sqlite3's per-connection statement cache reuses
+    # the compiled statements instead of re-parsing on every call
+    _INS_CONV = "INSERT INTO conversations (id, role, content, ts) VALUES (?,?,?,?)"
+    # Newest N via the ts index, handed back oldest-first by SQLite itself
+    _SEL_HIST = (
+        "SELECT role, content, ts FROM ("
+        "SELECT rowid AS rid, role, content, ts FROM conversations"
+        " ORDER BY ts DESC, rowid DESC LIMIT ?"
+        ") ORDER BY ts, rid"
+    )
+    # Native UPSERT (SQLite 3.24+) updates in place: one b-tree write, one
+    # WAL frame.  Older libraries only have the delete+insert REPLACE.
+    _UPSERT_KV = (
+        "INSERT INTO kv (key, value) VALUES (?,?) ON CONFLICT(key) DO UPDATE SET value=excluded.value"
+        if sqlite3.sqlite_version_info >= (3, 24, 0)
+        else "INSERT OR REPLACE INTO kv (key, value) VALUES (?,?)"
+    )
+    _SEL_KV = "SELECT value FROM kv WHERE key=?"
+
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        synchronous: str = "NORMAL",
+        readers: int = 2,
+    ):
+        """
+        synchronous: SQLite sync level; pass "FULL" for fsync on every commit.
+        readers:     read connections kept beside the single writer.
+        """
+        if synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"invalid synchronous level: {synchronous!r}")
         self._path = Path(db_path) if db_path else _DEFAULT_DB
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self._path))
-        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._synchronous = synchronous.upper()
+        # Autocommit mode: transactions are opened explicitly (BEGIN) and
+        # one connection is shared by every thread, writes under _lock
+        self._conn = self._open()
+        self._lock = threading.RLock()
+        self._txn_owner: int | None = None
         self._init_tables()
+        self._readers = _ReaderPool(self._open, max(1, readers))
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            str(self._path), check_same_thread=False, isolation_level=None,
+        )
+        self._configure(conn)
+        return conn
+
+    def _configure(self, conn: sqlite3.Connection) -> None:
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        conn.execute(f"PRAGMA synchronous={self._synchronous}")
 
     def _init_tables(self) -> None:
-        self._conn.executescript("""
-            CREATE TABLE IF NOT EXISTS conversations (
-                id   TEXT PRIMARY KEY,
-                role TEXT NOT NULL,
-                content TEXT NOT NULL,
-                ts   TEXT NOT NULL
-            );
+        self._conn.executescript(f"""
+            {_CONVERSATIONS_DDL.format(table="conversations")}
             CREATE TABLE IF NOT EXISTS kv (
                 key   TEXT PRIMARY KEY,
                 value TEXT NOT NULL
             );
         """)
-        self._conn.commit()
+        ts_type = next(
+            (ctype for _, name, ctype, *_ in self._conn.execute("PRAGMA table_info(conversations)")
+             if name == "ts"),
+            "INTEGER",
+        )
+        if ts_type.upper() == "TEXT":
+            self._migrate_text_timestamps()
+        # Ascending index; get_history walks it backwards (newest first)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_conv_ts ON conversations(ts)")
+
+    def _migrate_text_timestamps(self) -> None:
+        """Rewrite a pre-epoch database (ISO text ts) to integer microseconds."""
+        rows = self._conn.execute(
+            "SELECT id, role, content, ts FROM conversations ORDER BY rowid"
+        ).fetchall()
+        with self.transaction() as conn:
+            conn.execute("DROP TABLE conversations")
+            conn.execute(_CONVERSATIONS_DDL.format(table="conversations"))
+            conn.executemany(
+                self._INS_CONV, [(i, r, c, _iso_to_us(t)) for i, r, c, t in rows],
+            )
+
+    # ── transactions ───────────────────────────────────────────────
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Group several writes into one commit (one fsync instead of N).
+
+        The write lock is held for the whole block, so other threads'
+        writes wait instead of landing inside it.  The block commits on
+        success and rolls back on error; nested blocks join the outer
+        transaction.
+        """
+        with self._lock:
+            if self._txn_owner is not None:
+                yield self._conn
+                return
+            self._conn.execute("BEGIN")
+            self._txn_owner = threading.get_ident()
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+            finally:
+                self._txn_owner = None
+
+    @contextlib.contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        # Inside its own transaction a thread must read through the
+        # writer, or it would not see its uncommitted writes
+        if self._txn_owner == threading.get_ident():
+            yield self._conn
+        else:
+            with self._readers.reader() as conn:
+                yield conn
 
     # ── conversation ───────────────────────────────────────────────
 
     def add_message(self, role: str, content: str) -> str:
-        msg_id = uuid.uuid4().hex[:12]
-        self._conn.execute(
-            "INSERT INTO conversations (id, role, content, ts) VALUES (?,?,?,?)",
-            (msg_id, role, content, datetime.now(timezone.utc).isoformat()),
-        )
-        self._conn.commit()
+        msg_id = _new_id()
+        with self._lock:
+            self._conn.execute(self._INS_CONV, (msg_id, role, _pack(content), _now_us()))
         return msg_id
 
+    def add_messages(self, messages: Iterable[tuple[str, str]]) -> list[str]:
+        """Insert (role, content) pairs in a single transaction; returns their ids."""
+        ts = _now_us()
+        rows = [(_new_id(), role, _pack(content), ts) for role, content in messages]
+        with self.transaction() as conn:
+            conn.executemany(self._INS_CONV, rows)
+        return [r[0] for r in rows]
+
+    def history_iter(self, limit: int = 50) -> Iterator[dict]:
+        """
+        Yield the last *limit* messages, oldest first, straight off the cursor.
+
+        A read connection is held until the generator is exhausted or
+        closed.
+        """
+        with self._reader() as conn:
+            # ts stays an ISO-8601 string for callers; only the storage changed
+            for r, c, t in conn.execute(self._SEL_HIST, (limit,)):
+                yield {"role": r, "content": _unpack(c), "ts": _us_to_iso(t)}
+
     def get_history(self, limit: int = 50) -> list[dict]:
-        rows = self._conn.execute(
-            "SELECT role, content, ts FROM conversations ORDER BY ts DESC LIMIT ?",
-            (limit,),
-        ).fetchall()
-        return [{"role": r, "content": c, "ts": t} for r, c, t in reversed(rows)]
+        return list(self.history_iter(limit))
 
     # ── key-value ──────────────────────────────────────────────────
 
     def set(self, key: str, value: str) -> None:
-        self._conn.execute(
-            "INSERT OR REPLACE INTO kv (key, value) VALUES (?,?)", (key, value)
-        )
-        self._conn.commit()
+        with self._lock:
+            self._conn.execute(self._UPSERT_KV, (key, value))
 
     def get(self, key: str, default: str = "") -> str:
-        row = self._conn.execute(
-            "SELECT value FROM kv WHERE key=?", (key,)
-        ).fetchone()
+        with self._reader() as conn:
+            row = conn.execute(self._SEL_KV, (key,)).fetchone()
         return row[0] if row else default
 
     def close(self) -> None:
-        self._conn.close()
+        self._readers.close()
+        with self._lock:
+            self._conn.close()
@@ -8,12 +8,33 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any
-import uuid
+import json
+import os
+import threading
+import time
+import typing
+
+try:
+    import orjson
+
+    # Input is to_dict() output (already JSON types); non-str keys in tool
+    # args are stringified, as the stdlib fallback does
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=_ORJSON_OPTS)
+except ImportError:  # stdlib fallback (e.g. slim frozen builds)
+    orjson = None
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
 
 
 # ── Enums ──────────────────────────────────────────────────────────
 
 class ActionStatus(str, Enum):
+    __str__ = str.__str__  # str()/format() give the value, as with StrEnum
+
     PENDING = "pending"
     APPROVED = "approved"
     RUNNING = "running"
@@ -24,11 +45,102 @@ class ActionStatus(str, Enum):
 
 
 class PolicyDecision(str, Enum):
+    __str__ = str.__str__
+
     ALLOW = "allow"
     DENY = "deny"
     REQUIRE_APPROVAL = "require_approval"
 
 
+# Member -> value tables; a dict hit is cheaper than the .value descriptor
+_STATUS_STR: dict[ActionStatus, str] = {m: m.value for m in ActionStatus}
+_POLICY_STR: dict[PolicyDecision, str] = {m: m.value for m in PolicyDecision}
+
+
+# Random ids: 6 bytes -> 12 hex chars, carved out of one urandom() read
+# per ~680 ids instead of building (and truncating) a uuid4 each time
+_ID_BYTES = 6
+_ID_REFILL = 4096 - 4096 % _ID_BYTES
+_id_buf = b""
+_id_pos = 0
+_id_lock = threading.Lock()
+
+
+def _new_id() -> str:
+    global _id_buf, _id_pos
+    with _id_lock:
+        if _id_pos >= len(_id_buf):
+            _id_buf, _id_pos = os.urandom(_ID_REFILL), 0
+        pos = _id_pos
+        _id_pos += _ID_BYTES
+        buf = _id_buf
+    return buf[pos:pos + _ID_BYTES].hex()
+
+
+def _reset_ids() -> None:
+    # A forked child must not hand out the ids left in its parent's buffer
+    global _id_buf, _id_pos
+    _id_buf, _id_pos = b"", 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_ids)
+
+
+def _from_ns(ns: int | None) -> datetime | None:
+    """Convert a time.time_ns() stamp to an aware UTC datetime."""
+    if ns is None:
+        return None
+    # Integer split keeps the microseconds exact (ns / 1e9 can round them)
+    sec, ns = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(sec, timezone.utc).replace(microsecond=ns // 1000)
+
+
+def _field_expr(name: str, hint: Any) -> str:
+    """Source expression converting field *name* to its JSON-friendly form."""
+    attr = f"self.{name}"
+    args = typing.get_args(hint)
+    if type(None) in args:
+        (inner,) = [a for a in args if a is not type(None)]
+        expr = _field_expr(name, inner)
+        return attr if expr == attr else f"({expr} if {attr} is not None else None)"
+    if isinstance(hint, type) and issubclass(hint, Enum):
+        return f"{attr}.value"
+    if hint is datetime:
+        return f"{attr}.isoformat()"
+    if typing.get_origin(hint) is list and args and hasattr(args[0], "to_dict"):
+        return f"[v.to_dict() for v in {attr}]"
+    return attr
+
+
+def fast_dict(cls=None, *, fields: dict[str, str] | None = None):
+    """
+    Class decorator that compiles a specialised to_dict() for a dataclass.
+
+    The body is generated once, at import time, as a single dict literal
+    (straight attribute loads, conversions inlined), so a call does no
+    field introspection or per-field type checks.  By default every field
+    is emitted under its own name, converted by its annotation; *fields*
+    gives the full ordered key -> expression mapping instead (expressions
+    are written against ``self`` and may use this module's helpers).
+    """
+    def wrap(cls):
+        spec = fields
+        if spec is None:
+            hints = typing.get_type_hints(cls)
+            spec = {n: _field_expr(n, hints[n]) for n in cls.__dataclass_fields__}
+        body = ", ".join(f"{k!r}: {v}" for k, v in spec.items())
+        ns: dict[str, Any] = {}
+        exec(f"def to_dict(self) -> dict:\n    return {{{body}}}\n", globals(), ns)
+        to_dict = ns["to_dict"]
+        to_dict.__qualname__ = f"{cls.__qualname__}.to_dict"
+        to_dict.__module__ = cls.__module__
+        cls.to_dict = to_dict
+        return cls
+
+    return wrap if cls is None else wrap(cls)
+
+
 # ── ToolCall ───────────────────────────────────────────────────────
 
 @dataclass
@@ -40,10 +152,21 @@ class ToolCall:
 
 # ── Action ─────────────────────────────────────────────────────────
 
+@fast_dict(fields={
+    "id": "self.id",
+    "tool": "self.tool_call.tool_name",
+    "args": "self.tool_call.args",
+    "description": "self.description",
+    "status": "_STATUS_STR[self.status]",
+    "result": "str(self.result) if self.result is not None else None",
+    "error": "self.error",
+    "policy_decision": "_POLICY_STR.get(self.policy_decision)",
+    "policy_reason": "self.policy_reason",
+})
 @dataclass
 class Action:
     """One step inside a Plan.  Wraps a ToolCall + execution metadata."""
-    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    id: str = field(default_factory=_new_id)
     tool_call: ToolCall = field(default_factory=lambda: ToolCall(tool_name=""))
     description: str = ""
     status: ActionStatus = ActionStatus.PENDING
@@ -51,53 +174,55 @@ class Action:
     error: str | None = None
     policy_decision: PolicyDecision | None = None
     policy_reason: str = ""
-    started_at: datetime | None = None
-    finished_at: datetime | None = None
-
-    def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "tool": self.tool_call.tool_name,
-            "args": self.tool_call.args,
-            "description": self.description,
-            "status": self.status.value,
-            "result": str(self.result) if self.result is not None else None,
-            "error": self.error,
-            "policy_decision": self.policy_decision.value if self.policy_decision else None,
-            "policy_reason": self.policy_reason,
-        }
+    started_at_ns: int | None = None   # time.time_ns() epoch stamps
+    finished_at_ns: int | None = None
+    depends_on: list[int] = field(default_factory=list)  # indices of earlier actions
+
+    @property
+    def started_at(self) -> datetime | None:
+        return _from_ns(self.started_at_ns)
+
+    @property
+    def finished_at(self) -> datetime | None:
+        return _from_ns(self.finished_at_ns)
 
 
 # ── Plan ───────────────────────────────────────────────────────────
 
+@fast_dict
 @dataclass
 class Plan:
     """A sequence of Actions the agent proposes for a user request."""
-    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    id: str = field(default_factory=_new_id)
     user_request: str = ""
     summary: str = ""
     actions: list[Action] = field(default_factory=list)
     approved: bool = False
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "user_request": self.user_request,
-            "summary": self.summary,
-            "actions": [a.to_dict() for a in self.actions],
-            "approved": self.approved,
-            "created_at": self.created_at.isoformat(),
-        }
+    def to_json_bytes(self) -> bytes:
+        """UTF-8 JSON of to_dict() (actions keep their flattened shape)."""
+        return _dumps(self.to_dict())
 
 
 # ── AuditEntry ─────────────────────────────────────────────────────
 
+@fast_dict(fields={
+    "id": "self.id",
+    "timestamp": "_from_ns(self.timestamp_ns).isoformat()",
+    "tool_name": "self.tool_name",
+    "args": "self.args",
+    "policy_decision": "self.policy_decision",
+    "policy_reason": "self.policy_reason",
+    "result": "self.result",
+    "error": "self.error",
+    "duration_ms": "self.duration_ms",
+})
 @dataclass
 class AuditEntry:
     """Immutable record of one tool execution for the audit trail."""
-    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    id: str = field(default_factory=_new_id)
+    timestamp_ns: int = field(default_factory=time.time_ns)  # epoch; datetime built on demand
     tool_name: str = ""
     args: dict[str, Any] = field(default_factory=dict)
     policy_decision: str = ""
@@ -106,15 +231,10 @@ class AuditEntry:
     error: str | None = None
     duration_ms: int | None = None
 
-    def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "timestamp": self.timestamp.isoformat(),
-            "tool_name": self.tool_name,
-            "args": self.args,
-            "policy_decision": self.policy_decision,
-            "policy_reason": self.policy_reason,
-            "result": self.result,
-            "error": self.error,
-            "duration_ms": self.duration_ms,
-        }
+    @property
+    def timestamp(self) -> datetime:
+        return _from_ns(self.timestamp_ns)
+
+    def to_json_bytes(self) -> bytes:
+        """UTF-8 JSON of to_dict() (ISO timestamp, as in existing logs)."""
+        return _dumps(self.to_dict())
@@ -3,24 +3,30 @@ Tool Registry — register tools, list them for the planner, route calls.
 """
 
 from __future__ import annotations
+import sys
 from typing import Any
 
 from tools.base import Tool
 from policy.policy_engine import PolicyEngine
 from core.models import PolicyDecision
 
+_ALLOW = PolicyDecision.ALLOW
+_DENY = PolicyDecision.DENY
+
 
 class ToolRegistry:
     """Central catalogue of available tools."""
 
     def __init__(self, policy: PolicyEngine):
         self._tools: dict[str, Tool] = {}
+        self._planner_cache: tuple[dict[str, Any], ...] | None = None
         self.policy = policy
 
     # ── registration ───────────────────────────────────────────────
 
     def register(self, tool: Tool) -> None:
-        self._tools[tool.name] = tool
+        self._tools[sys.intern(tool.name)] = tool
+        self._planner_cache = None
 
     def get(self, name: str) -> Tool | None:
         return self._tools.get(name)
@@ -28,16 +34,23 @@ class ToolRegistry:
     def list_names(self) -> list[str]:
         return list(self._tools.keys())
 
-    def list_for_planner(self) -> list[dict[str, Any]]:
-        """Return tool metadata suitable for an LLM prompt."""
-        return [
-            {
-                "name": t.name,
-                "description": t.description,
-                "input_schema": t.input_schema,
-            }
-            for t in self._tools.values()
-        ]
+    def list_for_planner(self) -> tuple[dict[str, Any], ...]:
+        """
+        Return tool metadata suitable for an LLM prompt.
+
+        Built once and shared until the next register(); the same tuple is
+        returned every call, so treat it as read-only.
+        """
+        if self._planner_cache is None:
+            self._planner_cache = tuple(
+                {
+                    "name": t.name,
+                    "description": t.description,
+                    "input_schema": t.input_schema,
+                }
+                for t in self._tools.values()
+            )
+        return self._planner_cache
 
     # ── call routing ───────────────────────────────────────────────
 
@@ -48,16 +61,14 @@ class ToolRegistry:
         """
         tool = self._tools.get(tool_name)
         if tool is None:
-            return PolicyDecision.DENY, f"tool '{tool_name}' not found", None
+            return _DENY, f"tool '{tool_name}' not found", None
 
         decision, reason = self.policy.evaluate(tool_name, args)
-
-        if decision == PolicyDecision.DENY:
-            return decision, reason, None
+        # Enum members are singletons, so identity is enough
+        if decision is _DENY:
+            return _DENY, reason, None
 
         # REQUIRE_APPROVAL is handled by the agent layer (caller must
         # have obtained approval before reaching here).
         # If we get here for a require_approval tool, caller already approved.
-
-        result = tool.run(**args)
-        return PolicyDecision.ALLOW, reason, result
+        return _ALLOW, reason, tool.run(**args)
@@ -7,35 +7,56 @@ Settings include: LLM provider, API key, model name, etc.
 
 from __future__ import annotations
 
+import atexit
+import contextlib
+import functools
 import json
 import os
 import sys
+import threading
+import weakref
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
+try:
+    import orjson
 
+    def _dumps_pretty(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:  # stdlib fallback (e.g. slim frozen builds)
+    def _dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=None)
 def _get_default_settings_dir() -> Path:
     """
     Get persistent data dir — priority order:
+    0. $LNDIS_DATA_DIR override
     1. Installed app:  C:\\Program Files\\Lndis AI\\data
     2. Packaged .exe:  %LOCALAPPDATA%\\LndisAI
     3. Dev mode:       project/data
+
+    Resolved once per process and never creates anything; callers mkdir
+    the directory they actually use.  cache_clear() re-resolves.
     """
-    # Check if installed to Program Files
-    pf_dir = Path(os.environ.get("PROGRAMFILES", "C:\\Program Files")) / "Lndis AI" / "data"
-    if pf_dir.parent.exists():
-        pf_dir.mkdir(parents=True, exist_ok=True)
-        return pf_dir
+    override = os.environ.get("LNDIS_DATA_DIR")
+    if override:
+        return Path(override)
+
+    # Installed to Program Files (only possible on Windows, so the
+    # probe is skipped elsewhere)
+    if sys.platform == "win32":
+        pf_dir = Path(os.environ.get("PROGRAMFILES", "C:\\Program Files")) / "Lndis AI" / "data"
+        if pf_dir.parent.exists():
+            return pf_dir
 
     if getattr(sys, 'frozen', False):
         # Running as portable .exe — use AppData
-        base = Path(os.environ.get("LOCALAPPDATA", Path.home())) / "LndisAI"
-    else:
-        # Running as script — use project/data
-        base = Path(__file__).resolve().parent.parent / "data"
-    return base
+        return Path(os.environ.get("LOCALAPPDATA", Path.home())) / "LndisAI"
+    # Running as script — use project/data
+    return Path(__file__).resolve().parent.parent / "data"
 
-_DEFAULT_SETTINGS_DIR = _get_default_settings_dir()
 
 # Provider presets: {provider: {base_url, default_model}}
 PROVIDER_PRESETS: dict[str, dict[str, str]] = {
@@ -46,6 +67,9 @@ PROVIDER_PRESETS: dict[str, dict[str, str]] = {
     "openrouter": {"base_url": "https://openrouter.ai/api/v1", "model": "deepseek/deepseek-chat"},
 }
 
+# Writes made within this window are coalesced into a single save
+_SAVE_DELAY = 0.2
+
 DEFAULT_SETTINGS: dict[str, Any] = {
     "provider": "auto",
     "api_key": "",
@@ -56,16 +80,35 @@ DEFAULT_SETTINGS: dict[str, Any] = {
     "network_enabled": False,
 }
 
+# Pending changes of every live Settings are written by one shared exit
+# hook; a weak set, so registering never keeps an instance alive (a
+# pending debounce timer does, until it has saved)
+_live_settings: weakref.WeakSet[Settings] = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_settings() -> None:
+    for settings in list(_live_settings):
+        settings.flush()
+
 
 class Settings:
     """Read/write persistent settings."""
 
     def __init__(self, settings_dir: str | Path | None = None):
-        self._dir = Path(settings_dir) if settings_dir else _DEFAULT_SETTINGS_DIR
+        self._dir = Path(settings_dir) if settings_dir else _get_default_settings_dir()
         self._dir.mkdir(parents=True, exist_ok=True)
         self._file = self._dir / "settings.json"
         self._data: dict[str, Any] = {}
+        self._dirty = False
+        self._batch_depth = 0
+        self._timer: threading.Timer | None = None
+        # _save_lock guards _data, _dirty and _timer; _write_lock keeps
+        # snapshots reaching disk in the order they were taken
+        self._save_lock = threading.Lock()
+        self._write_lock = threading.Lock()
         self._load()
+        _live_settings.add(self)
 
     def _load(self) -> None:
         if self._file.exists():
@@ -78,9 +121,53 @@ class Settings:
         for k, v in DEFAULT_SETTINGS.items():
             self._data.setdefault(k, v)
 
-    def _save(self) -> None:
-        with open(self._file, "w", encoding="utf-8") as f:
-            json.dump(self._data, f, indent=2, ensure_ascii=False)
+    def _save(self, data: dict[str, Any]) -> None:
+        # Write a sibling temp file and rename it over the old one, so a
+        # crash mid-write leaves the previous settings intact
+        tmp = self._file.with_suffix(".json.tmp")
+        with open(tmp, "wb") as f:
+            f.write(_dumps_pretty(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._file)
+
+    def _schedule_save(self) -> None:
+        with self._save_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(_SAVE_DELAY, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Write pending changes to disk now."""
+        with self._write_lock:
+            with self._save_lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                # A set() after this point marks the settings dirty again
+                snapshot = dict(self._data)
+                self._dirty = False
+            try:
+                self._save(snapshot)
+            except BaseException:
+                with self._save_lock:
+                    self._dirty = True  # keep the change for the next flush
+                raise
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group several set() calls into one save, written when the block exits."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
 
     # -- access -------------------------------------------------------------
 
@@ -88,8 +175,11 @@ class Settings:
         return self._data.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
-        self._data[key] = value
-        self._save()
+        with self._save_lock:
+            self._data[key] = value
+            self._dirty = True
+        if not self._batch_depth:
+            self._schedule_save()
 
     def all(self) -> dict[str, Any]:
         """Return all settings (masks API key for display)."""
@@ -110,14 +200,17 @@ class Settings:
         provider = provider.lower().strip()
         preset = PROVIDER_PRESETS.get(provider)
 
-        self.set("provider", provider)
+        with self.batch():
+            self.set("provider", provider)
+
+            if preset:
+                # Apply preset base_url and model if not already custom-set
+                if not self._data.get("base_url") or self._data.get("provider") != provider:
+                    self.set("base_url", preset["base_url"])
+                if not self._data.get("model") or self._data.get("provider") != provider:
+                    self.set("model", preset["model"])
 
         if preset:
-            # Apply preset base_url and model if not already custom-set
-            if not self._data.get("base_url") or self._data.get("provider") != provider:
-                self.set("base_url", preset["base_url"])
-            if not self._data.get("model") or self._data.get("provider") != provider:
-                self.set("model", preset["model"])
             return f"Provider set to '{provider}' (url={preset['base_url']}, model={preset['model']})"
         else:
             return f"Provider set to '{provider}' (custom — set base_url and model manually)"
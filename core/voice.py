@@ -4,6 +4,9 @@ Voice Engine — Speech-to-Text (STT) and Text-to-Speech (TTS)
 Uses:
   TTS: pyttsx3 (offline, Windows SAPI5 — no API key needed)
   STT: SpeechRecognition + PyAudio (Google Speech API or offline)
+
+Both backends are imported on first use (speak / listen), so sessions
+that never use voice pay nothing for them.
 """
 
 from __future__ import annotations
@@ -12,6 +15,15 @@ import threading
 import queue
 from typing import Callable
 
+# Markdown symbols that sound weird when read aloud, deleted in one pass
+_STRIP_TABLE = str.maketrans("", "", "*#`_")
+
+# Pending utterances; when full the oldest is dropped, since stale speech
+# is worse than skipped speech
+_TTS_QUEUE_SIZE = 8
+# Queued fragments shorter than this are merged into a single say() call
+_COALESCE_CHARS = 40
+
 
 class VoiceEngine:
     """Handles voice input (mic → text) and voice output (text → speech)."""
@@ -22,8 +34,13 @@ class VoiceEngine:
         self._tts_ready = False
         self._recognizer = None
         self._mic_available = False
+        self._stt_initialized = False
+        self._tts_thread: threading.Thread | None = None
+        # Separate locks: a slow STT probe must never hold up speak()
+        self._tts_init_lock = threading.Lock()
+        self._stt_init_lock = threading.Lock()
         self._speaking = False
-        self._tts_queue: queue.Queue[str] = queue.Queue()
+        self._tts_queue: queue.Queue[str | None] = queue.Queue(maxsize=_TTS_QUEUE_SIZE)
 
         # TTS settings
         self.tts_enabled = True
@@ -36,14 +53,20 @@ class VoiceEngine:
         self.stt_timeout = 5         # seconds to wait for speech
         self.stt_phrase_limit = 15   # max seconds per phrase
 
-        self._init_stt()
-
-        # Start TTS worker thread (initializes engine inside)
-        self._tts_thread = threading.Thread(target=self._tts_worker, daemon=True)
-        self._tts_thread.start()
+    def activate_voice(self):
+        """Load both backends now instead of on first use (warm-up)."""
+        self._ensure_tts()
+        self._ensure_stt()
 
     # ── TTS (Text-to-Speech) ──────────────────────────────────
 
+    def _ensure_tts(self):
+        """Start the TTS worker thread (initializes engine inside) once."""
+        with self._tts_init_lock:
+            if self._tts_thread is None:
+                self._tts_thread = threading.Thread(target=self._tts_worker, daemon=True)
+                self._tts_thread.start()
+
     def _tts_worker(self):
         """Background thread that processes TTS queue."""
         # Initialize engine inside the thread for COM stability on Windows
@@ -72,7 +95,20 @@ class VoiceEngine:
             text = self._tts_queue.get()
             if text is None:
                 break
-            
+
+            # Short fragments queued back to back become one utterance
+            taken, stop = 1, False
+            while len(text) < _COALESCE_CHARS:
+                try:
+                    more = self._tts_queue.get_nowait()
+                except queue.Empty:
+                    break
+                taken += 1
+                if more is None:
+                    stop = True
+                    break
+                text = f"{text} {more}"
+
             if self._tts_ready and self.tts_enabled:
                 with self._tts_lock:
                     try:
@@ -83,15 +119,35 @@ class VoiceEngine:
                         print(f"[Voice] TTS runtime error: {e}")
                     finally:
                         self._speaking = False
-            
-            self._tts_queue.task_done()
+
+            for _ in range(taken):
+                self._tts_queue.task_done()
+            if stop:
+                break
 
     def speak(self, text: str):
         """Queue text to be spoken (strictly sequential)."""
         if self.tts_enabled:
-            # Clean text (remove markdown symbols that sound weird)
-            clean_text = text.replace("*", "").replace("#", "").replace("`", "").replace("_", "")
-            self._tts_queue.put(clean_text)
+            self._ensure_tts()
+            clean_text = text.translate(_STRIP_TABLE)
+            while True:
+                try:
+                    self._tts_queue.put_nowait(clean_text)
+                    return
+                except queue.Full:
+                    self._drop_one()
+
+    def _drop_one(self) -> None:
+        try:
+            self._tts_queue.get_nowait()
+        except queue.Empty:
+            return
+        self._tts_queue.task_done()
+
+    def clear_queue(self):
+        """Drop everything not yet spoken (barge-in); the current utterance continues."""
+        while not self._tts_queue.empty():
+            self._drop_one()
 
     def stop_speaking(self):
         """Stop current speech."""
@@ -129,6 +185,12 @@ class VoiceEngine:
 
     # ── STT (Speech-to-Text) ──────────────────────────────────
 
+    def _ensure_stt(self):
+        with self._stt_init_lock:
+            if not self._stt_initialized:
+                self._init_stt()
+                self._stt_initialized = True
+
     def _init_stt(self):
         try:
             import speech_recognition as sr
@@ -147,7 +209,15 @@ class VoiceEngine:
             self._mic_available = False
 
     @property
-    def mic_available(self) -> bool:
+    def mic_available(self) -> bool | None:
+        """Whether a microphone was found; None until probe_mic() or listen() ran."""
+        if not self._stt_initialized:
+            return None
+        return self._mic_available
+
+    def probe_mic(self) -> bool:
+        """Load STT and probe the microphone (imports PyAudio; call off the UI thread)."""
+        self._ensure_stt()
         return self._mic_available
 
     def listen(
@@ -164,6 +234,7 @@ class VoiceEngine:
           on_result(text) — called with transcription
           on_error(msg) — called on error
         """
+        self._ensure_stt()
         if not self._recognizer or not self._mic_available:
             msg = "Microphone not available"
             if on_error:
@@ -234,7 +305,7 @@ class VoiceEngine:
         return {
             "tts_ready": self._tts_ready,
             "tts_enabled": self.tts_enabled,
-            "mic_available": self._mic_available,
+            "mic_available": self.mic_available,
             "stt_language": self.stt_language,
             "voice_count": len(self._voices) if self._tts_ready else 0,
             "speaking": self._speaking,
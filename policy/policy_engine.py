@@ -11,91 +11,233 @@ Loads rules from a YAML file and exposes helpers:
 
 from __future__ import annotations
 
+import functools
+import json
 import os
 import platform
 import getpass
+import re
+import stat
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+try:  # libyaml bindings parse several times faster than the pure-Python loader
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 from core.models import PolicyDecision
 
 
+# Decisions for these tools depend on filesystem state (existing file sizes),
+# not only on the arguments, so they are always evaluated fresh.
+_UNCACHED_TOOLS = frozenset({"file_read", "file_write"})
+_EVALUATE_CACHE_SIZE = 1024
+_COMMAND_CACHE_SIZE = 512
+
+
+def _needs_config(method):
+    """Load a lazily constructed engine's policy file on first use."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._cfg is None:
+            self._load()
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _file_size(path: Path) -> int:
+    """Size of *path* if it is a regular file, else 0 (one stat call)."""
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return 0
+    return st.st_size if stat.S_ISREG(st.st_mode) else 0
+
+
+@functools.lru_cache(maxsize=None)
+def _username() -> str:
+    return getpass.getuser()
+
+
+def refresh_env() -> None:
+    """
+    Forget the cached OS user name (e.g. after USER/USERNAME changed).
+    New engines see the change at once, existing ones on their next reload().
+    """
+    _username.cache_clear()
+
+
 def _resolve_template(raw: str) -> str:
     """Replace {username} with the current OS user."""
-    return raw.replace("{username}", getpass.getuser())
+    return raw.replace("{username}", _username())
 
 
 class PolicyEngine:
     """Deny-first policy evaluator."""
 
-    def __init__(self, policy_path: str | Path | None = None):
+    __slots__ = (
+        "_path", "_cfg", "_os", "_network_override", "_file_sig", "_generation",
+        "_last_parent", "_evaluate_cached", "_command_cached",
+        # compiled from the config by _compile()
+        "_workspace", "_workspace_key", "_workspace_prefix", "_protected_paths", "_protected_keys",
+        "_protected_re",
+        "_blocked_read_ext", "_blocked_write_ext", "_cmd_allowlist",
+        "_blocked_chars", "_blocked_bytes", "_blocked_char_table", "_blocked_multi_re",
+        "_allowed_managers", "_blocked_apps",
+    )
+
+    def __init__(self, policy_path: str | Path | None = None, lazy: bool = False):
+        """lazy: defer reading/parsing the policy file until it is first needed."""
         if policy_path is None:
             policy_path = Path(__file__).parent / "default_policy.yaml"
         self._path = Path(policy_path)
-        self._cfg: dict[str, Any] = {}
+        self._cfg: dict[str, Any] | None = None
         self._os = "windows" if platform.system() == "Windows" else "linux"
         self._network_override: bool | None = None  # runtime toggle
-        self._load()
+        self._file_sig: tuple[int, int] | None = None  # (mtime_ns, size) of the parsed file
+        self._generation = 0  # bumped whenever decisions may change
+        # (parent dir, parent protected, parent inside workspace) of the
+        # last write check; sibling writes skip the prefix match
+        self._last_parent: tuple[Path, bool, bool] | None = None
+        # Memoized evaluate(); the generation is part of the key and the
+        # cache is also cleared whenever it moves
+        self._evaluate_cached = functools.lru_cache(maxsize=_EVALUATE_CACHE_SIZE)(self._evaluate_json)
+        self._command_cached = functools.lru_cache(maxsize=_COMMAND_CACHE_SIZE)(self._check_command)
+        if not lazy:
+            self._load()
 
     # ── loading ────────────────────────────────────────────────────
 
     def _load(self) -> None:
-        with open(self._path, "r", encoding="utf-8") as f:
-            self._cfg = yaml.safe_load(f)
+        # Skip the parse when the file is unchanged since the last load.
+        # _compile() still runs: {username} and ~ depend on the environment,
+        # not the file, so reload() must re-derive the paths every time
+        st = os.stat(self._path)
+        sig = (st.st_mtime_ns, st.st_size)
+        if sig != self._file_sig:
+            with open(self._path, "r", encoding="utf-8") as f:
+                self._cfg = yaml.load(f, Loader=_YamlLoader)
+            self._file_sig = sig
+        self._compile()
+        self._invalidate()
+
+    def _compile(self) -> None:
+        """Derive everything the checks need from the raw config, once per load."""
+        cfg = self._cfg
+        self._workspace = Path(_resolve_template(cfg["workspace"][self._os])).expanduser().resolve()
+        self._protected_paths = tuple(
+            Path(_resolve_template(p)).expanduser().resolve()
+            for p in cfg.get("protected_paths", {}).get(self._os, [])
+        )
+        # One anchored alternation over all protected paths, each followed
+        # by a separator or the end so /usr does not match /usrlocal
+        self._protected_keys = frozenset(self._path_key(p) for p in self._protected_paths)
+        alternatives = "|".join(re.escape(k.rstrip(os.sep)) for k in sorted(self._protected_keys))
+        self._protected_re = (
+            re.compile(f"(?:{alternatives})(?:{re.escape(os.sep)}|$)") if self._protected_keys else None
+        )
+        self._workspace_key = self._path_key(self._workspace)
+        self._workspace_prefix = self._workspace_key.rstrip(os.sep) + os.sep
+        self._blocked_read_ext = frozenset(cfg.get("file_read", {}).get("blocked_extensions", []))
+        self._blocked_write_ext = frozenset(cfg.get("file_write", {}).get("blocked_extensions", []))
+        cmd = cfg.get("command_run", {})
+        self._cmd_allowlist = frozenset(c.lower() for c in cmd.get("allowlist", []))
+        self._blocked_chars = tuple(cmd.get("blocked_chars", []))
+        # Single characters are caught by one translate() pass (a command is
+        # clean iff nothing gets deleted); longer entries by one regex scan.
+        # ASCII sets use bytes.translate over the NUL-joined argv (argv can
+        # never contain NUL, and UTF-8 continuation bytes are never ASCII);
+        # anything else falls back to str.translate part by part.
+        singles = "".join(c for c in self._blocked_chars if len(c) == 1 and c != "\0")
+        self._blocked_bytes = singles.encode("ascii") if singles.isascii() else None
+        self._blocked_char_table = str.maketrans("", "", singles) if singles else None
+        multi = sorted((c for c in self._blocked_chars if len(c) > 1), key=len, reverse=True)
+        self._blocked_multi_re = re.compile("|".join(map(re.escape, multi))) if multi else None
+        install = cfg.get("install_app", {})
+        self._allowed_managers = frozenset(m.lower() for m in install.get("allowed_managers", []))
+        self._blocked_apps = frozenset(a.lower() for a in install.get("blocked_apps", []))
+
+    def _invalidate(self) -> None:
+        self._generation += 1
+        self._last_parent = None
+        self._evaluate_cached.cache_clear()
+        self._command_cached.cache_clear()
 
     def reload(self) -> None:
         self._load()
 
+    @property
+    def generation(self) -> int:
+        """Counter that changes on reload or network toggle (for caches)."""
+        return self._generation
+
     # ── workspace ──────────────────────────────────────────────────
 
     @property
+    @_needs_config
     def workspace(self) -> Path:
-        raw = self._cfg["workspace"][self._os]
-        resolved = _resolve_template(raw)
-        return Path(resolved).expanduser().resolve()
+        return self._workspace
 
     # ── protected paths ────────────────────────────────────────────
 
     @property
-    def protected_paths(self) -> list[Path]:
-        raw_list = self._cfg.get("protected_paths", {}).get(self._os, [])
-        return [Path(_resolve_template(p)).expanduser().resolve() for p in raw_list]
+    @_needs_config
+    def protected_paths(self) -> tuple[Path, ...]:
+        return self._protected_paths
+
+    def _path_key(self, path: Path) -> str:
+        # Windows paths compare case-insensitively
+        return str(path).lower() if self._os == "windows" else str(path)
 
     def _is_under_protected(self, target: Path) -> bool:
-        resolved = target.resolve()
-        for pp in self.protected_paths:
-            try:
-                resolved.relative_to(pp)
-                return True
-            except ValueError:
-                continue
-        return False
+        """*target* must already be resolved."""
+        rx = self._protected_re
+        return rx is not None and rx.match(self._path_key(target)) is not None
+
+    def _write_prefix(self, target: Path) -> tuple[bool, bool]:
+        """Whether target's parent is protected / inside the workspace (cached)."""
+        parent = target.parent
+        last = self._last_parent
+        if last is not None and last[0] == parent:
+            return last[1], last[2]
+        protected = self._is_under_protected(parent)
+        key = self._path_key(parent)
+        in_ws = key == self._workspace_key or key.startswith(self._workspace_prefix)
+        self._last_parent = (parent, protected, in_ws)
+        return protected, in_ws
 
     def _is_path_traversal(self, raw: str) -> bool:
-        return ".." in raw
+        # Substring search first (most paths have no ".." at all), then a
+        # component check so names like "v1..2.txt" are not flagged
+        if ".." not in raw:
+            return False
+        return ".." in raw.replace("\\", "/").split("/")
 
     # ── read ───────────────────────────────────────────────────────
 
     def is_path_allowed_read(self, path: str) -> tuple[bool, str]:
+        return self._check_read(Path(path).expanduser().resolve(), path)
+
+    @_needs_config
+    def _check_read(self, target: Path, raw: str) -> tuple[bool, str]:
+        """Read check for an already-resolved *target*; *raw* is the path as given."""
         cfg = self._cfg.get("file_read", {})
         if not cfg.get("enabled", True):
             return False, "file_read disabled in policy"
 
-        if self._is_path_traversal(path):
+        if self._is_path_traversal(raw):
             return False, "path traversal detected (..)"
 
-        target = Path(path).expanduser().resolve()
-
         # Block certain extensions
-        blocked_ext = cfg.get("blocked_extensions", [])
-        if target.suffix.lower() in blocked_ext:
+        if target.suffix.lower() in self._blocked_read_ext:
             return False, f"extension {target.suffix} is blocked"
 
         # Check file size
         max_mb = cfg.get("max_size_mb", 50)
-        if target.is_file() and target.stat().st_size > max_mb * 1024 * 1024:
+        if _file_size(target) > max_mb * 1024 * 1024:
             return False, f"file exceeds {max_mb} MB limit"
 
         return True, "allowed"
@@ -103,41 +245,42 @@ class PolicyEngine:
     # ── write ──────────────────────────────────────────────────────
 
     def is_path_allowed_write(self, path: str) -> tuple[bool, str]:
+        return self._check_write(Path(path).expanduser().resolve(), path)
+
+    @_needs_config
+    def _check_write(self, target: Path, raw: str) -> tuple[bool, str]:
+        """Write check for an already-resolved *target*; *raw* is the path as given."""
         cfg = self._cfg.get("file_write", {})
         if not cfg.get("enabled", True):
             return False, "file_write disabled in policy"
 
-        if self._is_path_traversal(path):
+        if self._is_path_traversal(raw):
             return False, "path traversal detected (..)"
 
-        target = Path(path).expanduser().resolve()
-
-        # Protected dirs
-        if self._is_under_protected(target):
+        # Protected dirs: under one via the parent, or a protected path itself
+        protected, in_ws = self._write_prefix(target)
+        if protected or self._path_key(target) in self._protected_keys:
             return False, f"target is under a protected system directory"
 
         # Extension block
-        blocked_ext = cfg.get("blocked_extensions", [])
-        if target.suffix.lower() in blocked_ext:
+        if target.suffix.lower() in self._blocked_write_ext:
             return False, f"writing {target.suffix} files is blocked"
 
         # Workspace-only
         if cfg.get("workspace_only", True):
-            ws = self.workspace
-            try:
-                target.relative_to(ws)
-            except ValueError:
-                return False, f"writes restricted to workspace ({ws})"
+            if not (in_ws or target == self._workspace):
+                return False, f"writes restricted to workspace ({self._workspace})"
 
         # Size check (only for existing files being overwritten)
         max_mb = cfg.get("max_size_mb", 10)
-        if target.is_file() and target.stat().st_size > max_mb * 1024 * 1024:
+        if _file_size(target) > max_mb * 1024 * 1024:
             return False, f"file exceeds {max_mb} MB limit"
 
         return True, "allowed"
 
     # ── delete ─────────────────────────────────────────────────────
 
+    @_needs_config
     def is_delete_allowed(self) -> tuple[bool, str]:
         if not self._cfg.get("delete", {}).get("enabled", False):
             return False, "DELETE operations are disabled by policy"
@@ -145,6 +288,7 @@ class PolicyEngine:
 
     # ── command ────────────────────────────────────────────────────
 
+    @_needs_config
     def is_command_allowed(self, cmd_parts: list[str]) -> tuple[bool, str]:
         cfg = self._cfg.get("command_run", {})
         if not cfg.get("enabled", False):
@@ -153,40 +297,58 @@ class PolicyEngine:
         if not cmd_parts:
             return False, "empty command"
 
-        base_cmd = Path(cmd_parts[0]).stem.lower()
-        full_str = " ".join(cmd_parts)
-
-        # Blocked characters
-        for ch in cfg.get("blocked_chars", []):
-            if ch in full_str:
-                return False, f"blocked character '{ch}' in command"
+        # Planner retries repeat commands verbatim, so results are memoized
+        try:
+            return self._command_cached(tuple(cmd_parts))
+        except TypeError:  # unhashable part
+            return self._check_command(tuple(cmd_parts))
 
-        # Allowlist
-        allowlist = [c.lower() for c in cfg.get("allowlist", [])]
-        if base_cmd not in allowlist:
+    def _check_command(self, cmd_parts: tuple[str, ...]) -> tuple[bool, str]:
+        # Allowlist first: it is a set lookup and rejects most bad commands
+        base_cmd = Path(cmd_parts[0]).stem.lower()
+        if base_cmd not in self._cmd_allowlist:
             return False, f"'{base_cmd}' not in command allowlist"
 
-        return True, "allowed (requires approval)" if cfg.get("requires_approval") else "allowed"
+        # Blocked characters
+        if self._blocked_bytes:
+            raw = "\0".join(cmd_parts).encode("utf-8", "surrogatepass")
+            if len(raw.translate(None, self._blocked_bytes)) != len(raw):
+                return False, self._blocked_reason(" ".join(cmd_parts))
+        elif (table := self._blocked_char_table) is not None:
+            for part in cmd_parts:
+                if len(part.translate(table)) != len(part):
+                    return False, self._blocked_reason(part)
+        if self._blocked_multi_re is not None:
+            full_str = " ".join(cmd_parts)
+            if self._blocked_multi_re.search(full_str):
+                return False, self._blocked_reason(full_str)
+
+        requires = self._cfg.get("command_run", {}).get("requires_approval")
+        return True, "allowed (requires approval)" if requires else "allowed"
+
+    def _blocked_reason(self, text: str) -> str:
+        ch = next(c for c in self._blocked_chars if c in text)
+        return f"blocked character '{ch}' in command"
 
     # ── install ────────────────────────────────────────────────────
 
+    @_needs_config
     def is_install_allowed(self, manager: str, package: str) -> tuple[bool, str]:
         cfg = self._cfg.get("install_app", {})
         if not cfg.get("enabled", False):
             return False, "install_app disabled in policy"
 
-        allowed = [m.lower() for m in cfg.get("allowed_managers", [])]
-        if manager.lower() not in allowed:
+        if manager.lower() not in self._allowed_managers:
             return False, f"package manager '{manager}' not allowed"
 
-        blocked = [a.lower() for a in cfg.get("blocked_apps", [])]
-        if package.lower() in blocked:
+        if package.lower() in self._blocked_apps:
             return False, f"app '{package}' is blocked"
 
         return True, "allowed (requires approval)"
 
     # ── network ────────────────────────────────────────────────────
 
+    @_needs_config
     def is_network_allowed(self) -> tuple[bool, str]:
         # Runtime toggle has priority
         if self._network_override is not None:
@@ -200,14 +362,31 @@ class PolicyEngine:
 
     def set_network(self, enabled: bool) -> None:
         self._network_override = enabled
+        self._invalidate()
 
     # ── generic evaluate ───────────────────────────────────────────
 
+    @_needs_config
     def evaluate(self, tool_name: str, args: dict[str, Any]) -> tuple[PolicyDecision, str]:
         """
         High-level evaluator.  Returns (decision, reason).
         Tools should call the specific helpers; this is an extra guard.
+
+        Decisions are memoized on (tool, canonical args) until the next
+        reload() / set_network(); file tools are always evaluated fresh.
         """
+        if tool_name in _UNCACHED_TOOLS:
+            return self._evaluate(tool_name, args)
+        try:
+            args_json = json.dumps(args, sort_keys=True, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return self._evaluate(tool_name, args)
+        return self._evaluate_cached(self._generation, tool_name, args_json)
+
+    def _evaluate_json(self, generation: int, tool_name: str, args_json: str) -> tuple[PolicyDecision, str]:
+        return self._evaluate(tool_name, json.loads(args_json))
+
+    def _evaluate(self, tool_name: str, args: dict[str, Any]) -> tuple[PolicyDecision, str]:
         if tool_name == "file_read":
             ok, reason = self.is_path_allowed_read(args.get("path", ""))
             return (PolicyDecision.ALLOW if ok else PolicyDecision.DENY), reason
@@ -216,8 +395,11 @@ class PolicyEngine:
             # Resolve relative paths against workspace
             raw_path = args.get("path", "")
             if raw_path and not Path(raw_path).is_absolute():
-                raw_path = str((self.workspace / raw_path).resolve())
-            ok, reason = self.is_path_allowed_write(raw_path)
+                target = (self._workspace / raw_path).resolve()
+                raw_path = str(target)
+            else:
+                target = Path(raw_path).expanduser().resolve()
+            ok, reason = self._check_write(target, raw_path)
             if not ok:
                 return PolicyDecision.DENY, reason
             return PolicyDecision.ALLOW, reason
@@ -250,6 +432,7 @@ class PolicyEngine:
 
     # ── info ───────────────────────────────────────────────────────
 
+    @_needs_config
     def summary(self) -> dict:
         return {
             "os": self._os,
@@ -0,0 +1,118 @@
+"""
+Agent tests — LLM response parsing and keyword planning.
+Run with:  python -m pytest tests/test_agent.py -v
+"""
+
+import json
+
+import pytest
+
+from core.agent import Agent, _execution_waves, _find_json_array
+from core.models import Action, ToolCall
+
+
+@pytest.fixture
+def planner():
+    """Bare Agent -- keyword planning needs no subsystems."""
+    return Agent.__new__(Agent)
+
+
+# ── JSON extraction ────────────────────────────────────────────────
+
+class TestFindJsonArray:
+    def test_bare_array(self):
+        text = '[{"tool": "file_read", "args": {"path": "a.txt"}}]'
+        assert _find_json_array(text) == text
+
+    def test_fenced_block_with_prose(self):
+        text = 'Sure!\n```json\n[{"tool": "none", "args": {}}]\n```\nDone.'
+        assert json.loads(_find_json_array(text)) == [{"tool": "none", "args": {}}]
+
+    def test_brackets_inside_strings_ignored(self):
+        text = '[{"tool": "x", "description": "a ] tricky \\" [ string"}] trailing ]'
+        assert json.loads(_find_json_array(text))[0]["description"] == 'a ] tricky " [ string'
+
+    def test_prose_brackets_skipped(self):
+        text = 'See [note 1]. Plan: [{"tool": "research_local"}]'
+        assert _find_json_array(text) == '[{"tool": "research_local"}]'
+
+    @pytest.mark.parametrize("text", ["no json here", '[{"tool": "x"', ""])
+    def test_nothing_found(self, text):
+        assert _find_json_array(text) is None
+
+
+# ── Keyword planning ───────────────────────────────────────────────
+
+class TestKeywordPlanning:
+    @pytest.mark.parametrize("request_text, tool", [
+        ("read notes.txt", "file_read"),
+        ("oku notes.txt", "file_read"),
+        ("write out.txt", "file_write"),
+        ("run whoami", "command_run"),
+        ("calistir whoami", "command_run"),
+        ("install git", "install_app"),
+        ("search budget", "research_local"),
+        ("web python", "research_web"),
+        ("ls .", "file_read"),
+        ("hello there", "none"),
+        ("read", "none"),
+    ])
+    def test_prefix_dispatch(self, planner, request_text, tool):
+        actions = planner._plan_with_keywords(request_text)
+        assert [a.tool_call.tool_name for a in actions] == [tool]
+
+    def test_run_args_split(self, planner):
+        (action,) = planner._plan_with_keywords("run echo hi")
+        assert action.tool_call.args == {"command": ["echo", "hi"]}
+
+    def test_desktop_phrase_means_write(self, planner):
+        (action,) = planner._plan_with_keywords("run notes.txt on desktop")
+        assert action.tool_call.tool_name == "file_write"
+        assert action.tool_call.args["path"] == "Desktop/notes.txt"
+
+    def test_read_prefix_beats_desktop_phrase(self, planner):
+        (action,) = planner._plan_with_keywords("read notes.txt on desktop")
+        assert action.tool_call.tool_name == "file_read"
+
+    def test_content_extraction(self, planner):
+        (action,) = planner._plan_with_keywords("write notes.txt with content my content plan")
+        assert action.tool_call.args["content"] == "my content plan"
+
+    def test_content_extraction_turkish(self, planner):
+        (action,) = planner._plan_with_keywords("masaüstünde a.txt oluştur içeriği merhaba dünya")
+        assert action.tool_call.args == {"path": "Desktop/a.txt", "content": "merhaba dünya", "mode": "create"}
+
+
+# ── Concurrent execution grouping ──────────────────────────────────
+
+def _act(tool, depends_on=None):
+    return Action(tool_call=ToolCall(tool_name=tool), depends_on=depends_on or [])
+
+
+def _shape(waves):
+    return [[a.tool_call.tool_name for a in w] for w in waves]
+
+
+class TestExecutionWaves:
+    def test_independent_reads_share_a_wave(self):
+        actions = [_act("file_read"), _act("research_web"), _act("research_local")]
+        assert _shape(_execution_waves(actions)) == [["file_read", "research_web", "research_local"]]
+
+    def test_writes_are_barriers(self):
+        actions = [_act("file_read"), _act("file_write"), _act("file_read"), _act("research_web")]
+        assert _shape(_execution_waves(actions)) == [
+            ["file_read"], ["file_write"], ["file_read", "research_web"],
+        ]
+
+    def test_same_tool_never_concurrent(self):
+        actions = [_act("file_read"), _act("file_read")]
+        assert _shape(_execution_waves(actions)) == [["file_read"], ["file_read"]]
+
+    def test_dependency_splits_wave(self):
+        actions = [_act("research_web"), _act("file_read", depends_on=[0])]
+        assert _shape(_execution_waves(actions)) == [["research_web"], ["file_read"]]
+
+    def test_bad_dependency_runs_serially(self):
+        actions = [_act("research_web"), _act("file_read", depends_on=[5])]
+        assert _shape(_execution_waves(actions)) == [["research_web"], ["file_read"]]
+
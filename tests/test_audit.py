@@ -0,0 +1,104 @@
+"""
+Audit logger tests — entries must reach disk and survive a reload.
+Run with:  python -m pytest tests/test_audit.py -v
+"""
+
+import gc
+import weakref
+
+import pytest
+
+from core import audit as audit_module
+from core.audit import AuditLogger
+
+
+@pytest.fixture
+def audit(tmp_path):
+    logger = AuditLogger(log_dir=tmp_path)
+    yield logger
+    logger.close()
+
+
+class TestPersistence:
+    def test_flush_writes_entries(self, audit):
+        audit.log("file_read", {"path": "a.txt"}, "allow", "allowed")
+        audit.log("command_run", {"command": ["rm"]}, "deny", "blocked", error="blocked")
+        audit.flush()
+
+        lines = (audit._dir / "audit.jsonl").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+
+    def test_load_from_disk_sees_unflushed_entries(self, audit):
+        audit.log("file_read", {"path": "ü.txt"}, "allow", "allowed")
+        entries = audit.load_from_disk()
+        assert entries[-1]["tool_name"] == "file_read"
+        assert entries[-1]["args"] == {"path": "ü.txt"}
+
+    def test_close_is_idempotent(self, audit):
+        audit.close()
+        audit.close()
+
+    def test_unclosed_logger_is_freed(self, tmp_path):
+        ref = weakref.ref(AuditLogger(log_dir=tmp_path))
+        gc.collect()
+        assert ref() is None
+
+    def test_exit_hook_closes_open_loggers(self, tmp_path):
+        logger = AuditLogger(log_dir=tmp_path)
+        logger.log("file_read", {}, "allow", "ok")
+        audit_module._close_open_loggers()
+        assert logger._fh.closed
+        assert logger not in audit_module._open_loggers
+        assert len(logger.load_from_disk()) == 1
+
+
+class TestRecent:
+    def test_recent_newest_first(self, audit):
+        for i in range(5):
+            audit.log(f"tool_{i}", {}, "allow", "ok")
+        names = [e.tool_name for e in audit.recent(3)]
+        assert names == ["tool_4", "tool_3", "tool_2"]
+        assert audit.count() == 5
+
+
+class TestDiskReads:
+    def test_iter_entries_streams_in_order(self, audit):
+        for i in range(3):
+            audit.log(f"tool_{i}", {}, "allow", "ok")
+        assert [e["tool_name"] for e in audit.iter_entries()] == ["tool_0", "tool_1", "tool_2"]
+
+    def test_tail_returns_last_n(self, audit):
+        for i in range(50):
+            audit.log(f"tool_{i}", {"pad": "x" * 200}, "allow", "ok")
+        tail = audit.tail(5)
+        assert [e["tool_name"] for e in tail] == [f"tool_{i}" for i in range(45, 50)]
+
+    def test_tail_spans_chunks(self, audit, monkeypatch):
+        monkeypatch.setattr("core.audit._TAIL_CHUNK", 64)
+        for i in range(20):
+            audit.log(f"tool_{i}", {"pad": "x" * 100}, "allow", "ok")
+        assert [e["tool_name"] for e in audit.tail(3)] == ["tool_17", "tool_18", "tool_19"]
+        assert len(audit.tail(100)) == 20
+
+    @pytest.mark.parametrize("chunk", range(1, 40))
+    def test_tail_chunk_boundaries(self, audit, monkeypatch, chunk):
+        monkeypatch.setattr("core.audit._TAIL_CHUNK", chunk)
+        for i in range(4):
+            audit.log(f"tool_{i}", {}, "allow", "ok")
+        assert [e["tool_name"] for e in audit.tail(2)] == ["tool_2", "tool_3"]
+        assert [e["tool_name"] for e in audit.tail(4)] == [f"tool_{i}" for i in range(4)]
+
+    def test_tail_empty(self, audit):
+        assert audit.tail(5) == []
+
+
+class TestRingBuffer:
+    def test_memory_is_bounded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("core.audit._RING_SIZE", 3)
+        audit = AuditLogger(log_dir=tmp_path)
+        for i in range(10):
+            audit.log(f"tool_{i}", {}, "allow", "ok")
+        assert audit.count() == 3
+        assert audit.count_on_disk() == 10
+        assert [e.tool_name for e in audit.recent(5)] == ["tool_9", "tool_8", "tool_7"]
+        audit.close()
@@ -0,0 +1,331 @@
+"""
+LLM adapter tests — HTTP plumbing against a local stub server (no network).
+Run with:  python -m pytest tests/test_llm.py -v
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.llm import FallbackAdapter, LLMAdapter, OllamaAdapter, OpenAICompatAdapter, _ConnectionPool
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    status = 200
+    drop_after = False
+    reply: dict = {}
+    stream: list[bytes] | None = None  # chunked body lines instead of reply
+    peers: list = []
+    hits = 0
+
+    def do_GET(self):
+        self.do_POST()
+
+    def do_POST(self):
+        type(self).peers.append(self.client_address)
+        type(self).hits += 1
+        length = int(self.headers.get("Content-Length", 0))
+        type(self).last_body = json.loads(self.rfile.read(length) or b"{}")
+        type(self).last_headers = dict(self.headers)
+        if type(self).stream is not None:
+            self._send_chunked(type(self).stream)
+            return
+        body = json.dumps(type(self).reply).encode("utf-8")
+        self.send_response(type(self).status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # Drop the socket without announcing it, like an idle-timeout would
+        self.close_connection = type(self).drop_after
+
+    def _send_chunked(self, lines):
+        self.send_response(type(self).status)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for line in lines:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    for var in ("http_proxy", "HTTP_PROXY", "https_proxy", "HTTPS_PROXY"):
+        monkeypatch.delenv(var, raising=False)
+    handler = type("Handler", (_StubHandler,), {"peers": [], "hits": 0, "status": 200, "reply": {}, "stream": None})
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    yield srv, handler, f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+class TestConnectionPool:
+    def test_connection_reused(self, server):
+        _, handler, url = server
+        pool = _ConnectionPool()
+        for _ in range(3):
+            status, _ = pool.request("POST", f"{url}/x", body=b"{}")
+            assert status == 200
+        assert len(set(handler.peers)) == 1
+        pool.close()
+
+    def test_stale_connection_retried(self, server):
+        _, handler, url = server
+        pool = _ConnectionPool()
+        handler.drop_after = True
+        pool.request("POST", f"{url}/x", body=b"{}")
+        status, _ = pool.request("POST", f"{url}/x", body=b"{}")
+        assert status == 200
+        assert len(set(handler.peers)) == 2
+        pool.close()
+
+
+class TestAdapters:
+    def test_openai_compat_chat(self, server):
+        _, handler, url = server
+        handler.reply = {
+            "model": "stub",
+            "choices": [{"message": {"content": "hi", "tool_calls": [
+                {"function": {"name": "file_read", "arguments": '{"path": "a"}'}},
+            ]}}],
+        }
+        adapter = OpenAICompatAdapter(model="stub", api_key="sk-test", base_url=f"{url}/v1")
+        resp = adapter.chat([{"role": "user", "content": "hello"}])
+        assert resp.content == "hi"
+        assert resp.tool_calls == [{"name": "file_read", "args": {"path": "a"}}]
+        assert handler.last_headers["Authorization"] == "Bearer sk-test"
+        assert handler.last_headers["User-Agent"].startswith("Python-urllib/")
+        adapter.close()
+
+    def test_openai_compat_http_error(self, server):
+        _, handler, url = server
+        handler.status = 401
+        handler.reply = {"error": "bad key"}
+        adapter = OpenAICompatAdapter(api_key="sk-bad", base_url=url, provider_label="deepseek")
+        resp = adapter.chat([{"role": "user", "content": "hello"}])
+        assert resp.content.startswith("[deepseek API error 401:")
+        adapter.close()
+
+    @pytest.mark.parametrize("base_url, expected", [
+        ("https://api.deepseek.com", "https://api.deepseek.com/v1/chat/completions"),
+        ("https://api.openai.com/v1/", "https://api.openai.com/v1/chat/completions"),
+        ("https://api.groq.com/openai/v1", "https://api.groq.com/openai/v1/chat/completions"),
+    ])
+    def test_chat_url(self, base_url, expected):
+        assert OpenAICompatAdapter(api_key="sk", base_url=base_url)._chat_url == expected
+
+    def test_tool_schemas_formatted_once(self, server, monkeypatch):
+        _, handler, url = server
+        handler.reply = {"message": {"content": ""}}
+        adapter = OllamaAdapter(base_url=url)
+        tools = [{"name": "file_read", "description": "Read", "input_schema": {"path": {"type": "string"}}}]
+        calls = []
+        original = adapter._format_tools
+        monkeypatch.setattr(adapter, "_format_tools", lambda t: calls.append(t) or original(t))
+        for text in ("a", "b"):
+            adapter.chat([{"role": "user", "content": text}], tools=tools)
+        assert len(calls) == 1
+        assert handler.last_body["tools"][0]["function"]["parameters"]["required"] == ["path"]
+        adapter.close()
+
+    def test_connection_error(self):
+        adapter = OpenAICompatAdapter(api_key="sk", base_url="http://127.0.0.1:9", provider_label="openai")
+        resp = adapter.chat([{"role": "user", "content": "hello"}])
+        assert resp.content.startswith("[openai connection error:")
+
+    def test_ollama_chat(self, server):
+        _, handler, url = server
+        handler.reply = {"message": {"content": "merhaba"}, "prompt_eval_count": 3, "eval_count": 5}
+        adapter = OllamaAdapter(model="llama3.2", base_url=url)
+        resp = adapter.chat([{"role": "user", "content": "selam"}], temperature=0.1)
+        assert resp.content == "merhaba"
+        assert resp.usage == {"prompt_tokens": 3, "completion_tokens": 5}
+        assert handler.last_body["options"]["temperature"] == 0.1
+        adapter.close()
+
+    def test_ollama_probe_warms_connection(self, server):
+        _, handler, url = server
+        handler.reply = {"message": {"content": "ok"}}
+        adapter = OllamaAdapter(base_url=url)
+        assert adapter.is_available() is True
+        adapter.chat([{"role": "user", "content": "x"}])
+        assert len(set(handler.peers)) == 1
+        adapter.close()
+
+    def test_ollama_probe_cached_across_adapters(self, server, monkeypatch):
+        _, handler, url = server
+        monkeypatch.setattr(OllamaAdapter, "_probe_cache", {})
+        assert OllamaAdapter(base_url=url).is_available() is True
+        assert OllamaAdapter(base_url=url).is_available() is True
+        assert handler.hits == 1
+        monkeypatch.setattr("core.llm._PROBE_TTL", 0.0)
+        assert OllamaAdapter(base_url=url).is_available() is True
+        assert handler.hits == 2
+
+    def test_ollama_probe_unreachable(self):
+        assert OllamaAdapter(base_url="http://127.0.0.1:9").is_available() is False
+
+    def test_tool_call_argument_shapes(self):
+        msg = {"tool_calls": [
+            {"function": {"name": "a", "arguments": {"x": 1}}},   # Ollama
+            {"function": {"name": "b", "arguments": '{"y": 2}'}},  # OpenAI
+            {"function": {"name": "c", "arguments": "not json"}},
+        ]}
+        assert OllamaAdapter()._parse_tool_calls(msg) == [
+            {"name": "a", "args": {"x": 1}},
+            {"name": "b", "args": {"y": 2}},
+            {"name": "c", "args": {}},
+        ]
+
+    @pytest.mark.parametrize("base_url, label", [
+        ("", "deepseek"),
+        ("https://api.groq.com/openai/v1", "groq"),
+        ("https://my-proxy.example/deepseek/v1", "openai"),
+    ])
+    def test_auto_provider_label_from_host(self, monkeypatch, base_url, label):
+        monkeypatch.setattr(OllamaAdapter, "is_available", lambda self: False)
+
+        class _Settings:
+            def raw(self):
+                return {"provider": "auto", "api_key": "sk", "model": "", "base_url": base_url}
+
+        assert LLMAdapter.from_settings(_Settings()).provider_name == label
+
+    def test_info(self):
+        info = OpenAICompatAdapter(model="m", api_key="sk", base_url="https://x/v1", provider_label="groq").info()
+        assert info == {"provider": "groq", "model": "m", "base_url": "https://x/v1", "available": True}
+        assert FallbackAdapter().info()["base_url"] == ""
+
+
+class TestResponseCache:
+    def test_identical_request_served_from_cache(self, server):
+        _, handler, url = server
+        handler.reply = {"message": {"content": "plan"}}
+        adapter = OllamaAdapter(base_url=url)
+        msgs = [{"role": "user", "content": "list files"}]
+        first = adapter.chat(msgs, temperature=0.0)
+        assert adapter.chat(msgs, temperature=0.0) is first
+        assert handler.hits == 1
+        adapter.chat([{"role": "user", "content": "other"}], temperature=0.0)
+        assert handler.hits == 2
+        adapter.close()
+
+    def test_sampling_temperature_bypasses_cache(self, server):
+        _, handler, url = server
+        handler.reply = {"message": {"content": "x"}}
+        adapter = OllamaAdapter(base_url=url)
+        msgs = [{"role": "user", "content": "hi"}]
+        adapter.chat(msgs, temperature=0.7)
+        adapter.chat(msgs, temperature=0.7)
+        assert handler.hits == 2
+        adapter.close()
+
+    def test_explicit_cache_at_planner_temperature(self, server):
+        _, handler, url = server
+        handler.reply = {"message": {"content": "plan"}}
+        adapter = OllamaAdapter(base_url=url)
+        msgs = [{"role": "user", "content": "list files"}]
+        first = adapter.chat(msgs, temperature=0.2, cache=True)
+        assert adapter.chat(msgs, temperature=0.2, cache=True) is first
+        assert handler.hits == 1
+        adapter.close()
+
+    def test_completed_stream_cached(self, server):
+        _, handler, url = server
+        handler.stream = [b'{"message": {"content": "a"}}\n', b'{"message": {"content": "b"}}\n']
+        adapter = OllamaAdapter(base_url=url)
+        msgs = [{"role": "user", "content": "x"}]
+        assert list(adapter.chat_stream(msgs, temperature=0.2, cache=True)) == ["a", "b"]
+        assert list(adapter.chat_stream(msgs, temperature=0.2, cache=True)) == ["ab"]
+        assert handler.hits == 1
+        adapter.close()
+
+    def test_failed_stream_not_cached(self, server):
+        _, handler, url = server
+        handler.status = 500
+        handler.stream = [b"boom"]
+        adapter = OllamaAdapter(base_url=url)
+        msgs = [{"role": "user", "content": "x"}]
+        list(adapter.chat_stream(msgs, cache=True))
+        list(adapter.chat_stream(msgs, cache=True))
+        assert handler.hits == 2
+        adapter.close()
+
+    def test_errors_not_cached(self, server):
+        _, handler, url = server
+        handler.status = 503
+        adapter = OllamaAdapter(base_url=url)
+        msgs = [{"role": "user", "content": "hi"}]
+        adapter.chat(msgs, temperature=0.0)
+        adapter.chat(msgs, temperature=0.0)
+        assert handler.hits == 2
+        adapter.close()
+
+
+class TestStreaming:
+    def test_openai_compat_sse(self, server):
+        _, handler, url = server
+        handler.stream = [
+            b'data: {"choices": [{"delta": {"role": "assistant"}}]}\n\n',
+            b'data: {"choices": [{"delta": {"content": "mer"}}]}\n\n',
+            b'data: {"choices": [{"delta": {"content": "haba"}}]}\n\n',
+            b"data: [DONE]\n\n",
+        ]
+        adapter = OpenAICompatAdapter(api_key="sk-test", base_url=f"{url}/v1")
+        chunks = list(adapter.chat_stream([{"role": "user", "content": "selam"}]))
+        assert chunks == ["mer", "haba"]
+        assert handler.last_body["stream"] is True
+        adapter.close()
+
+    def test_ollama_ndjson(self, server):
+        _, handler, url = server
+        handler.stream = [
+            b'{"message": {"content": "a"}, "done": false}\n',
+            b'{"message": {"content": "b"}, "done": false}\n',
+            b'{"message": {"content": ""}, "done": true, "eval_count": 2}\n',
+        ]
+        adapter = OllamaAdapter(base_url=url)
+        assert list(adapter.chat_stream([{"role": "user", "content": "x"}])) == ["a", "b"]
+        # Fully drained stream leaves the socket reusable
+        list(adapter.chat_stream([{"role": "user", "content": "x"}]))
+        assert len(set(handler.peers)) == 1
+        adapter.close()
+
+    def test_lines_split_across_chunks(self, server):
+        _, handler, url = server
+        handler.stream = [b'{"message": {"con', b'tent": "a"}}\n{"message": ', b'{"content": "b"}}']
+        adapter = OllamaAdapter(base_url=url)
+        assert list(adapter.chat_stream([{"role": "user", "content": "x"}])) == ["a", "b"]
+        adapter.close()
+
+    def test_stream_http_error(self, server):
+        _, handler, url = server
+        handler.status = 500
+        handler.reply = {"error": "boom"}
+        adapter = OllamaAdapter(base_url=url)
+        (chunk,) = adapter.chat_stream([{"role": "user", "content": "x"}])
+        assert chunk.startswith("[Ollama error: HTTP 500:")
+        adapter.close()
+
+
+class TestAsync:
+    def test_achat_many_keeps_order(self, server):
+        _, handler, url = server
+        handler.reply = {"message": {"content": "ok"}}
+        adapter = OllamaAdapter(base_url=url)
+        batches = [[{"role": "user", "content": str(i)}] for i in range(3)]
+        responses = asyncio.run(adapter.achat_many(batches))
+        assert [r.content for r in responses] == ["ok"] * 3
+        adapter.close()
+
+    def test_fallback_achat(self):
+        resp = asyncio.run(FallbackAdapter().achat([{"role": "user", "content": "x"}]))
+        assert resp.provider == "none"
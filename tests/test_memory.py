@@ -0,0 +1,167 @@
+"""
+Memory store tests — conversation history and key-value persistence.
+Run with:  python -m pytest tests/test_memory.py -v
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from core.memory import Memory
+
+
+@pytest.fixture
+def memory(tmp_path):
+    mem = Memory(db_path=tmp_path / "memory.db")
+    yield mem
+    mem.close()
+
+
+class TestConversation:
+    def test_history_in_insertion_order(self, memory):
+        memory.add_message("user", "hi")
+        memory.add_message("assistant", "hello")
+        assert [(m["role"], m["content"]) for m in memory.get_history()] == [
+            ("user", "hi"), ("assistant", "hello"),
+        ]
+
+    def test_bulk_insert(self, memory):
+        ids = memory.add_messages([("user", "a"), ("assistant", "b"), ("user", "c")])
+        assert len(set(ids)) == 3
+        assert [m["content"] for m in memory.get_history()] == ["a", "b", "c"]
+
+    def test_history_keeps_newest_in_order(self, memory):
+        memory.add_messages([("user", str(i)) for i in range(10)])
+        assert [m["content"] for m in memory.history_iter(limit=3)] == ["7", "8", "9"]
+
+    def test_long_content_stored_compressed(self, memory):
+        text = "ünïcode line\n" * 200
+        memory.add_message("assistant", text)
+        memory.add_message("user", "short")
+        stored = [c for (c,) in memory._conn.execute("SELECT content FROM conversations ORDER BY rowid")]
+        assert len(stored[0]) < len(text.encode("utf-8")) // 4
+        assert stored[1] == b"\x00short"
+        assert [m["content"] for m in memory.get_history()] == [text, "short"]
+
+    def test_ts_stored_as_epoch_integer(self, memory):
+        memory.add_message("user", "x")
+        (ts,) = memory._conn.execute("SELECT ts FROM conversations").fetchone()
+        assert isinstance(ts, int)
+        assert memory.get_history()[0]["ts"].endswith("+00:00")
+
+    def test_text_timestamps_migrated(self, tmp_path):
+        db = tmp_path / "old.db"
+        conn = sqlite3.connect(db)
+        conn.execute("CREATE TABLE conversations (id TEXT PRIMARY KEY, role TEXT NOT NULL,"
+                     " content TEXT NOT NULL, ts TEXT NOT NULL)")
+        conn.executemany("INSERT INTO conversations VALUES (?,?,?,?)", [
+            ("b", "assistant", "second", "2025-01-02T00:00:00.000002+00:00"),
+            ("a", "user", "first", "2025-01-01T00:00:00.000001+00:00"),
+        ])
+        conn.commit()
+        conn.close()
+
+        mem = Memory(db_path=db)
+        history = mem.get_history()
+        assert [m["content"] for m in history] == ["first", "second"]
+        assert history[0]["ts"] == "2025-01-01T00:00:00.000001+00:00"
+        mem.close()
+
+
+class TestTransaction:
+    def test_writes_commit_together(self, memory, tmp_path):
+        with memory.transaction():
+            memory.add_message("user", "x")
+            memory.set("k", "v")
+        other = Memory(db_path=tmp_path / "memory.db")
+        assert other.get("k") == "v"
+        assert len(other.get_history()) == 1
+        other.close()
+
+    def test_rollback_on_error(self, memory):
+        with pytest.raises(RuntimeError):
+            with memory.transaction():
+                memory.add_message("user", "lost")
+                raise RuntimeError
+        assert memory.get_history() == []
+
+    def test_reads_inside_transaction_see_own_writes(self, memory):
+        with memory.transaction():
+            memory.set("k", "v")
+            assert memory.get("k") == "v"
+
+    def test_other_threads_see_only_committed(self, memory):
+        seen = []
+        with memory.transaction():
+            memory.set("k", "v")
+            t = threading.Thread(target=lambda: seen.append(memory.get("k", "none")))
+            t.start()
+            t.join()
+        assert seen == ["none"]
+        assert memory.get("k") == "v"
+
+
+class TestKeyValue:
+    def test_set_get_overwrite(self, memory):
+        assert memory.get("missing", "d") == "d"
+        memory.set("k", "1")
+        memory.set("k", "2")
+        assert memory.get("k") == "2"
+
+    def test_upsert_keeps_row(self, memory):
+        memory.set("k", "1")
+        memory.set("other", "x")
+        (rowid,) = memory._conn.execute("SELECT rowid FROM kv WHERE key='k'").fetchone()
+        memory.set("k", "2")
+        assert memory._conn.execute("SELECT rowid FROM kv WHERE key='k'").fetchone() == (rowid,)
+
+
+class TestThreads:
+    def test_shared_connection_across_threads(self, memory):
+        def worker(n):
+            for i in range(20):
+                memory.add_message("user", f"{n}-{i}")
+                memory.set(f"k{n}", str(i))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(memory.get_history(limit=1000)) == 80
+        assert all(memory.get(f"k{n}") == "19" for n in range(4))
+
+    def test_reader_pool_is_bounded(self, tmp_path):
+        mem = Memory(db_path=tmp_path / "m.db", readers=2)
+        barrier = threading.Barrier(6)
+
+        def reader():
+            barrier.wait()
+            for _ in range(20):
+                mem.get_history()
+
+        threads = [threading.Thread(target=reader) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(mem._readers._all) <= 2
+        mem.close()
+
+
+class TestPragmas:
+    def test_tuning_applied(self, memory):
+        conn = memory._conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+    def test_full_durability_opt_in(self, tmp_path):
+        mem = Memory(db_path=tmp_path / "m.db", synchronous="full")
+        assert mem._conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+        mem.close()
+
+    def test_bad_level_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            Memory(db_path=tmp_path / "m.db", synchronous="fast; DROP TABLE kv")
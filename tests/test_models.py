@@ -0,0 +1,95 @@
+"""
+Model serialization tests — to_dict shapes consumed by the audit log and UI.
+Run with:  python -m pytest tests/test_models.py -v
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from datetime import datetime, timezone
+
+from core.models import (
+    Action, ActionStatus, AuditEntry, Plan, PolicyDecision, ToolCall, _new_id, fast_dict,
+)
+
+
+_TS = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+_TS_NS = 1_735_787_045_000_000_000
+
+
+def _action(**kw):
+    return Action(id="a1", tool_call=ToolCall("file_read", {"path": "x"}), **kw)
+
+
+class TestToDict:
+    def test_action_flattens_tool_call(self):
+        d = _action(status=ActionStatus.DENIED, policy_decision=PolicyDecision.DENY, result=3).to_dict()
+        assert d == {
+            "id": "a1", "tool": "file_read", "args": {"path": "x"}, "description": "",
+            "status": "denied", "result": "3", "error": None,
+            "policy_decision": "deny", "policy_reason": "",
+        }
+
+    def test_action_without_decision_or_result(self):
+        d = _action().to_dict()
+        assert d["policy_decision"] is None and d["result"] is None
+
+    def test_plan_nests_actions(self):
+        plan = Plan(id="p1", user_request="r", actions=[_action()], created_at=_TS)
+        d = plan.to_dict()
+        assert d["created_at"] == "2025-01-02T03:04:05+00:00"
+        assert d["actions"] == [_action().to_dict()]
+        assert list(d) == ["id", "user_request", "summary", "actions", "approved", "created_at"]
+
+    def test_audit_entry(self):
+        entry = AuditEntry(id="e1", timestamp_ns=_TS_NS, tool_name="t", args={"k": [1]}, duration_ms=7)
+        assert entry.to_dict() == {
+            "id": "e1", "timestamp": "2025-01-02T03:04:05+00:00", "tool_name": "t",
+            "args": {"k": [1]}, "policy_decision": "", "policy_reason": "",
+            "result": "", "error": None, "duration_ms": 7,
+        }
+
+    def test_audit_timestamp_is_lazy_datetime(self):
+        entry = AuditEntry(timestamp_ns=_TS_NS + 123_456_789)
+        assert entry.timestamp == _TS.replace(microsecond=123_456)
+
+    def test_enum_str_is_value(self):
+        assert str(ActionStatus.DENIED) == "denied"
+        assert f"{PolicyDecision.REQUIRE_APPROVAL}" == "require_approval"
+
+
+class TestIds:
+    def test_ids_are_unique_hex_across_refills(self):
+        ids = [_new_id() for _ in range(2000)]
+        assert len(set(ids)) == len(ids)
+        assert all(len(i) == 12 and int(i, 16) >= 0 for i in ids)
+
+    def test_models_get_distinct_ids(self):
+        assert Action().id != Action().id != Plan().id
+
+
+class TestJson:
+    def test_audit_entry_bytes_match_to_dict(self):
+        entry = AuditEntry(id="e1", timestamp_ns=_TS_NS, tool_name="t", args={"ü": [1]})
+        assert json.loads(entry.to_json_bytes()) == entry.to_dict()
+
+    def test_plan_bytes_match_to_dict(self):
+        plan = Plan(id="p1", actions=[_action(result=1)], created_at=_TS)
+        assert json.loads(plan.to_json_bytes()) == plan.to_dict()
+
+
+@fast_dict
+@dataclass
+class _Sample:
+    decision: PolicyDecision | None = None
+    when: datetime | None = None
+    count: int = 0
+
+
+class TestFastDict:
+    def test_optional_fields_converted_by_annotation(self):
+        assert _Sample().to_dict() == {"decision": None, "when": None, "count": 0}
+        assert _Sample(PolicyDecision.ALLOW, _TS, 2).to_dict() == {
+            "decision": "allow", "when": "2025-01-02T03:04:05+00:00", "count": 2,
+        }
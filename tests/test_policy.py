@@ -7,6 +7,7 @@ import platform
 import pytest
 from pathlib import Path
 
+from policy import policy_engine
 from policy.policy_engine import PolicyEngine
 
 
@@ -95,6 +96,14 @@ class TestNetworkDenied:
         ok, reason = policy.is_network_allowed()
         assert ok is False
 
+    def test_toggle_and_reload_bump_generation(self, policy):
+        gen = policy.generation
+        policy.set_network(True)
+        assert policy.generation > gen
+        gen = policy.generation
+        policy.reload()
+        assert policy.generation > gen
+
 
 # ── Path traversal ─────────────────────────────────────────────────
 
@@ -107,6 +116,17 @@ class TestPathTraversal:
         ok, reason = policy.is_path_allowed_write("../../../tmp/evil.txt")
         assert ok is False
 
+    @pytest.mark.parametrize("raw, expected", [
+        ("a/../b", True),
+        ("a\\..\\b", True),
+        ("..", True),
+        ("notes/v1..2.txt", False),
+        ("...", False),
+        ("plain/path.txt", False),
+    ])
+    def test_component_level(self, policy, raw, expected):
+        assert policy._is_path_traversal(raw) is expected
+
 
 # ── Command allowlist ──────────────────────────────────────────────
 
@@ -146,3 +166,173 @@ class TestEvaluate:
         from core.models import PolicyDecision
         decision, reason = policy.evaluate("research_web", {"query": "test"})
         assert decision == PolicyDecision.DENY
+
+
+class TestSizeLimit:
+    @pytest.fixture
+    def tiny(self, tmp_path):
+        src = Path(__file__).parent.parent / "policy" / "default_policy.yaml"
+        text = src.read_text(encoding="utf-8").replace("max_size_mb: 100", "max_size_mb: 0.000001")
+        path = tmp_path / "policy.yaml"
+        path.write_text(text.replace("max_size_mb: 50", "max_size_mb: 0.000001"), encoding="utf-8")
+        return PolicyEngine(path)
+
+    def test_large_file_denied(self, tiny, tmp_path):
+        big = tmp_path / "big.txt"
+        big.write_text("x" * 10, encoding="utf-8")
+        assert tiny.is_path_allowed_read(str(big)) == (False, "file exceeds 1e-06 MB limit")
+        assert tiny.is_path_allowed_write(str(big))[0] is False
+
+    def test_missing_file_and_directory_allowed(self, tiny, tmp_path):
+        assert tiny.is_path_allowed_read(str(tmp_path / "missing.txt"))[0] is True
+        assert tiny.is_path_allowed_read(str(tmp_path))[0] is True
+
+
+class TestEvaluateCache:
+    def test_repeat_decisions_are_cached(self, policy):
+        policy.evaluate("command_run", {"command": ["whoami"]})
+        policy.evaluate("command_run", {"command": ["whoami"]})
+        assert policy._evaluate_cached.cache_info().hits == 1
+
+    def test_network_toggle_invalidates(self, policy):
+        from core.models import PolicyDecision
+        policy.set_network(False)
+        assert policy.evaluate("research_web", {})[0] == PolicyDecision.DENY
+        policy.set_network(True)
+        assert policy.evaluate("research_web", {})[0] == PolicyDecision.ALLOW
+
+    def test_file_tools_not_cached(self, policy):
+        policy.evaluate("file_read", {"path": str(policy.workspace / "a.txt")})
+        assert policy._evaluate_cached.cache_info().currsize == 0
+
+
+class TestProtectedMatch:
+    @pytest.mark.skipif(platform.system() == "Windows", reason="Linux-only")
+    @pytest.mark.parametrize("path, expected", [
+        ("/usr", True),
+        ("/usr/lib/x.so", True),
+        ("/usrlocal/x", False),
+        ("/home/user/x", False),
+        ("/", False),
+    ])
+    def test_prefix_by_component(self, policy, path, expected):
+        assert policy._is_under_protected(Path(path)) is expected
+
+    @pytest.mark.skipif(platform.system() == "Windows", reason="Linux-only")
+    @pytest.mark.parametrize("path", ["/usr", "/usr/x.txt", "/usr/lib/x.txt"])
+    def test_write_check_matches_full_walk(self, policy, path):
+        ok, reason = policy.is_path_allowed_write(path)
+        assert ok is False and "protected" in reason
+
+    def test_sibling_writes_reuse_parent(self, policy, monkeypatch):
+        ws = policy.workspace
+        assert policy.is_path_allowed_write(str(ws / "a.txt"))[0] is True
+        monkeypatch.setattr(PolicyEngine, "_is_under_protected", lambda self, t: pytest.fail("re-matched"))
+        assert policy.is_path_allowed_write(str(ws / "b.txt"))[0] is True
+
+    def test_workspace_prefix_by_component(self, policy):
+        ws = policy.workspace
+        assert policy._write_prefix(ws / "sub" / "a.txt")[1] is True
+        assert policy._write_prefix(ws.with_name(ws.name + "-other") / "a.txt")[1] is False
+
+    def test_reload_forgets_parent(self, policy):
+        policy.is_path_allowed_write(str(policy.workspace / "a.txt"))
+        policy.reload()
+        assert policy._last_parent is None
+
+
+class TestBlockedChars:
+    @pytest.fixture
+    def strict(self, tmp_path):
+        src = Path(__file__).parent.parent / "policy" / "default_policy.yaml"
+        text = src.read_text(encoding="utf-8").replace(
+            "blocked_chars: []", 'blocked_chars: [">", "|", "&&"]'
+        )
+        path = tmp_path / "policy.yaml"
+        path.write_text(text, encoding="utf-8")
+        return PolicyEngine(path)
+
+    @pytest.mark.parametrize("cmd, blocked", [
+        (["echo", "hi", ">", "f"], ">"),
+        (["cat", "a|b"], "|"),
+        (["echo", "a", "&&", "rm"], "&&"),
+    ])
+    def test_blocked(self, strict, cmd, blocked):
+        ok, reason = strict.is_command_allowed(cmd)
+        assert ok is False and f"'{blocked}'" in reason
+
+    def test_single_ampersand_allowed(self, strict):
+        assert strict.is_command_allowed(["echo", "a&b"])[0] is True
+
+    def test_non_ascii_argument_allowed(self, strict):
+        assert strict.is_command_allowed(["echo", "günaydın →"])[0] is True
+
+    def test_non_ascii_blocked_char(self, tmp_path):
+        src = Path(__file__).parent.parent / "policy" / "default_policy.yaml"
+        text = src.read_text(encoding="utf-8").replace("blocked_chars: []", 'blocked_chars: ["|", "→"]')
+        path = tmp_path / "policy.yaml"
+        path.write_text(text, encoding="utf-8")
+        policy = PolicyEngine(path)
+        assert policy.is_command_allowed(["echo", "a → b"]) == (False, "blocked character '→' in command")
+        assert policy.is_command_allowed(["echo", "ab"])[0] is True
+
+    def test_allowlist_checked_first(self, strict):
+        ok, reason = strict.is_command_allowed(["evil", ">", "f"])
+        assert ok is False and "allowlist" in reason
+
+    def test_results_memoized(self, strict):
+        strict.is_command_allowed(["echo", "x"])
+        strict.is_command_allowed(["echo", "x"])
+        assert strict._command_cached.cache_info().hits == 1
+
+
+class TestReload:
+    @pytest.fixture
+    def copy(self, tmp_path):
+        src = Path(__file__).parent.parent / "policy" / "default_policy.yaml"
+        path = tmp_path / "policy.yaml"
+        path.write_text(src.read_text(encoding="utf-8"), encoding="utf-8")
+        return path
+
+    def test_unchanged_file_not_reparsed(self, copy, monkeypatch):
+        policy = PolicyEngine(copy)
+        monkeypatch.setattr("policy.policy_engine.yaml.load", lambda *a, **k: pytest.fail("reparsed"))
+        policy.reload()
+
+    def test_changed_file_reparsed(self, copy):
+        policy = PolicyEngine(copy)
+        copy.write_text(
+            copy.read_text(encoding="utf-8").replace('- "whoami"', '- "whoami"\n    - "zzz"'),
+            encoding="utf-8",
+        )
+        policy.reload()
+        assert policy.is_command_allowed(["zzz"])[0] is True
+
+    def test_reload_sees_refreshed_env(self, copy, tmp_path, monkeypatch):
+        templated = f'"{(tmp_path / "{username}" / "ws").as_posix()}"'
+        text = copy.read_text(encoding="utf-8")
+        copy.write_text(
+            text.replace('"~/lndis-workspace"', templated)
+                .replace(r'"C:\\Users\\{username}\\lndis-workspace"', templated),
+            encoding="utf-8",
+        )
+        for var in ("LOGNAME", "USER", "LNAME", "USERNAME"):
+            monkeypatch.setenv(var, "alice")
+        policy_engine.refresh_env()
+        try:
+            policy = PolicyEngine(copy)
+            assert policy.workspace == (tmp_path / "alice" / "ws").resolve()
+            for var in ("LOGNAME", "USER", "LNAME", "USERNAME"):
+                monkeypatch.setenv(var, "bob")
+            policy_engine.refresh_env()
+            policy.reload()
+            assert policy.workspace == (tmp_path / "bob" / "ws").resolve()
+        finally:
+            monkeypatch.undo()
+            policy_engine.refresh_env()
+
+    def test_lazy_engine_loads_on_first_use(self, copy):
+        policy = PolicyEngine(copy, lazy=True)
+        assert policy._cfg is None
+        assert policy.is_command_allowed(["whoami"])[0] is True
+        assert policy._cfg is not None
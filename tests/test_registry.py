@@ -0,0 +1,78 @@
+"""
+Tool registry tests — planner listing and call routing.
+Run with:  python -m pytest tests/test_registry.py -v
+"""
+
+import pytest
+
+from core.models import PolicyDecision
+from core.registry import ToolRegistry
+from tools.base import Tool
+
+
+class _Echo(Tool):
+    def __init__(self, name="echo"):
+        self._name = name
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def description(self):
+        return f"{self._name} tool"
+
+    @property
+    def input_schema(self):
+        return {"text": "string"}
+
+    def run(self, **kwargs):
+        return kwargs
+
+
+class _Policy:
+    def __init__(self, decision):
+        self.decision = decision
+
+    def evaluate(self, tool_name, args):
+        return self.decision, "because"
+
+
+@pytest.fixture
+def registry():
+    reg = ToolRegistry(policy=_Policy(PolicyDecision.ALLOW))
+    reg.register(_Echo())
+    return reg
+
+
+class TestPlannerListing:
+    def test_metadata(self, registry):
+        assert registry.list_for_planner() == (
+            {"name": "echo", "description": "echo tool", "input_schema": {"text": "string"}},
+        )
+
+    def test_cached_between_calls(self, registry):
+        assert registry.list_for_planner() is registry.list_for_planner()
+
+    def test_register_invalidates(self, registry):
+        first = registry.list_for_planner()
+        registry.register(_Echo("shout"))
+        assert [t["name"] for t in registry.list_for_planner()] == ["echo", "shout"]
+        assert registry.list_for_planner() is not first
+
+
+class TestCall:
+    def test_allowed_call_runs(self, registry):
+        assert registry.call("echo", {"text": "hi"}) == (PolicyDecision.ALLOW, "because", {"text": "hi"})
+
+    def test_approved_call_reports_allow(self, registry):
+        registry.policy = _Policy(PolicyDecision.REQUIRE_APPROVAL)
+        assert registry.call("echo", {})[0] is PolicyDecision.ALLOW
+
+    def test_denied_call_does_not_run(self, registry):
+        registry.policy = _Policy(PolicyDecision.DENY)
+        assert registry.call("echo", {"text": "hi"}) == (PolicyDecision.DENY, "because", None)
+
+    def test_unknown_tool(self, registry):
+        decision, reason, result = registry.call("nope", {})
+        assert decision is PolicyDecision.DENY and "nope" in reason and result is None
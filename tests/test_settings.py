@@ -0,0 +1,116 @@
+"""
+Settings tests — coalesced saves and persistence across instances.
+Run with:  python -m pytest tests/test_settings.py -v
+"""
+
+import gc
+import json
+import weakref
+
+import pytest
+
+from core import settings as settings_module
+from core.settings import Settings, _get_default_settings_dir
+
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    s = Settings(settings_dir=tmp_path)
+    saves = []
+    real_save = s._save
+    monkeypatch.setattr(s, "_save", lambda data: (saves.append(1), real_save(data)))
+    s.saves = saves
+    yield s
+    s.flush()
+
+
+def _on_disk(s):
+    return json.loads(s._file.read_text(encoding="utf-8"))
+
+
+class TestSaving:
+    def test_burst_is_one_write(self, settings):
+        for i in range(5):
+            settings.set("max_tokens", i)
+        settings.flush()
+        assert settings.saves == [1]
+        assert _on_disk(settings)["max_tokens"] == 4
+
+    def test_debounced_write_lands(self, settings, monkeypatch):
+        monkeypatch.setattr("core.settings._SAVE_DELAY", 0.01)
+        settings.set("model", "m")
+        settings._timer.join(1)
+        assert _on_disk(settings)["model"] == "m"
+
+    def test_provider_switch_saves_once(self, settings):
+        settings.set_provider("openai")
+        assert settings.saves == [1]
+        assert _on_disk(settings)["provider"] == "openai"
+
+    def test_set_during_write_is_not_lost(self, settings, tmp_path, monkeypatch):
+        real_save = settings._save
+
+        def save_racing_set(data):
+            if len(settings.saves) == 1:
+                settings.set("model", "late")  # lands while the first write runs
+            real_save(data)
+
+        monkeypatch.setattr(settings, "_save", lambda data: (settings.saves.append(1), save_racing_set(data)))
+        settings.set("model", "early")
+        settings.flush()
+        assert _on_disk(settings)["model"] == "early"
+        settings.flush()
+        assert Settings(settings_dir=tmp_path).get("model") == "late"
+
+    def test_flush_without_changes_is_noop(self, settings):
+        settings.flush()
+        assert settings.saves == []
+
+    def test_reload_sees_saved_values(self, settings, tmp_path):
+        settings.set("model", "ü-model")
+        settings.flush()
+        assert Settings(settings_dir=tmp_path).get("model") == "ü-model"
+
+    def test_save_replaces_atomically(self, settings, monkeypatch):
+        settings.set("model", "old")
+        settings.flush()
+
+        def crash(*_):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("core.settings.os.replace", crash)
+        settings.set("model", "new")
+        with pytest.raises(OSError):
+            settings.flush()
+        assert _on_disk(settings)["model"] == "old"
+
+        monkeypatch.undo()
+        settings.flush()  # still dirty, so the change is retried
+        assert _on_disk(settings)["model"] == "new"
+
+
+class TestLifetime:
+    def test_instance_is_freed(self, tmp_path):
+        ref = weakref.ref(Settings(settings_dir=tmp_path))
+        gc.collect()
+        assert ref() is None
+
+    def test_exit_hook_flushes_pending_changes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("core.settings._SAVE_DELAY", 60)
+        s = Settings(settings_dir=tmp_path)
+        s.set("model", "pending")
+        settings_module._flush_live_settings()
+        assert _on_disk(s)["model"] == "pending"
+
+
+class TestDataDir:
+    def test_env_override(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("LNDIS_DATA_DIR", str(tmp_path / "d"))
+        _get_default_settings_dir.cache_clear()
+        try:
+            assert _get_default_settings_dir() == tmp_path / "d"
+            assert not (tmp_path / "d").exists()  # resolving creates nothing
+            assert Settings()._dir == tmp_path / "d"
+            assert (tmp_path / "d").is_dir()
+        finally:
+            _get_default_settings_dir.cache_clear()
@@ -0,0 +1,289 @@
+"""
+Tool tests — file tools against a temporary workspace.
+Run with:  python -m pytest tests/test_tools.py -v
+"""
+
+import platform
+from pathlib import Path
+
+import pytest
+
+from policy.policy_engine import PolicyEngine
+from tools.file_read import FileReadTool
+from tools import base, file_write, research_local
+from tools.command_run import CommandRunTool
+from tools.file_write import FileWriteTool
+from tools.research_local import LocalResearchTool
+
+
+@pytest.fixture(scope="module")
+def policy():
+    return PolicyEngine()
+
+
+def test_tools_have_no_instance_dict(policy):
+    for tool in (FileReadTool(policy), FileWriteTool(policy), CommandRunTool(policy)):
+        with pytest.raises(AttributeError):
+            tool.stray = 1
+
+
+# ── file_read ──────────────────────────────────────────────────────
+
+class TestFileRead:
+    def test_directory_listing(self, policy, tmp_path):
+        (tmp_path / "b.txt").write_text("12345", encoding="utf-8")
+        (tmp_path / "a").mkdir()
+        result = FileReadTool(policy).run(path=str(tmp_path))
+        assert result["ok"] is True
+        assert result["entries"] == [
+            {"name": "a", "type": "dir", "size": None},
+            {"name": "b.txt", "type": "file", "size": 5},
+        ]
+
+    def test_truncates_at_max_lines(self, policy, tmp_path):
+        target = tmp_path / "long.txt"
+        target.write_text("".join(f"line {i}\n" for i in range(10)), encoding="utf-8")
+        result = FileReadTool(policy).run(path=str(target), max_lines=3)
+        assert result["lines"] == 4
+        assert result["content"] == "line 0\nline 1\nline 2\n... (truncated at 3 lines)"
+
+    def test_exact_fit_not_truncated(self, policy, tmp_path):
+        target = tmp_path / "short.txt"
+        target.write_text("a\nb\n", encoding="utf-8")
+        result = FileReadTool(policy).run(path=str(target), max_lines=2)
+        assert (result["lines"], result["content"]) == (2, "a\nb")
+
+
+# ── file_write ─────────────────────────────────────────────────────
+
+class TestFileWrite:
+    @pytest.mark.parametrize("path", ["Desktop", "masaüstü", "BELGELER"])
+    def test_bare_shortcut_is_a_directory(self, policy, path):
+        result = FileWriteTool(policy).run(path=path, content="x")
+        assert result["ok"] is False
+        assert result["error"].startswith("Path is a directory")
+
+    def test_shortcut_prefix_maps_into_home(self, policy, monkeypatch, tmp_path):
+        monkeypatch.setitem(file_write._shortcuts(), "desktop", tmp_path)
+        result = FileWriteTool(policy).run(path="Desktop\\notes.txt", content="x")
+        assert result["ok"] is True
+        assert (tmp_path / "notes.txt").read_text(encoding="utf-8") == "x"
+
+    def test_overwrite_keeps_backup(self, policy, tmp_path):
+        target = tmp_path / "notes.txt"
+        target.write_text("old", encoding="utf-8")
+        result = FileWriteTool(policy).run(path=str(target), content="new", mode="overwrite")
+        assert result["ok"] is True
+        assert target.read_text(encoding="utf-8") == "new"
+        (backup,) = tmp_path.glob("notes.txt.bak.*")
+        assert backup.read_text(encoding="utf-8") == "old"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["notes.txt", backup.name]
+
+    @pytest.mark.skipif(platform.system() == "Windows", reason="symlinks need privileges on Windows")
+    def test_retargeted_symlink_is_followed(self, policy, tmp_path):
+        (tmp_path / "one").mkdir()
+        (tmp_path / "two").mkdir()
+        link = tmp_path / "link"
+        link.symlink_to(tmp_path / "one")
+        tool = FileWriteTool(policy)
+        assert tool.run(path=str(link / "a.txt"), content="1")["ok"] is True
+        link.unlink()
+        link.symlink_to(tmp_path / "two")
+        assert tool.run(path=str(link / "a.txt"), content="2")["ok"] is True
+        assert (tmp_path / "two" / "a.txt").read_text(encoding="utf-8") == "2"
+
+    def test_reload_drops_cached_targets(self, policy, tmp_path):
+        tool = FileWriteTool(policy)
+        tool.run(path=str(tmp_path / "a.txt"), content="1")
+        policy.reload()
+        tool.run(path=str(tmp_path / "b.txt"), content="1")
+        assert list(tool._targets) == [str(tmp_path / "b.txt")]
+
+    def test_refresh_env_rereads_home(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.setenv("USERPROFILE", str(tmp_path))
+        file_write.refresh_env()
+        try:
+            assert file_write._shortcuts()["desktop"] == tmp_path / "Desktop"
+        finally:
+            monkeypatch.undo()
+            file_write.refresh_env()
+
+    def test_refresh_env_reaches_existing_tool(self, policy, monkeypatch, tmp_path):
+        tool = FileWriteTool(policy)
+        try:
+            for home in ("one", "two"):
+                monkeypatch.setenv("HOME", str(tmp_path / home))
+                monkeypatch.setenv("USERPROFILE", str(tmp_path / home))
+                file_write.refresh_env()
+                assert tool.run(path="Desktop/a.txt", content=home)["ok"] is True
+            assert (tmp_path / "two" / "Desktop" / "a.txt").read_text(encoding="utf-8") == "two"
+        finally:
+            monkeypatch.undo()
+            file_write.refresh_env()
+
+    def test_append_reports_bytes(self, policy, tmp_path):
+        target = tmp_path / "log.txt"
+        tool = FileWriteTool(policy)
+        tool.run(path=str(target), content="ğ\n", mode="create")
+        result = tool.run(path=str(target), content="ş", mode="append")
+        assert result["bytes_written"] == 2
+        assert target.read_text(encoding="utf-8") == "ğ\nş"
+
+
+# ── command_run ────────────────────────────────────────────────────
+
+@pytest.mark.skipif(platform.system() == "Windows", reason="POSIX commands")
+class TestCommandRun:
+    def test_runs_executable_directly(self, policy):
+        result = CommandRunTool(policy).run(command=["echo", "a  b", "*"])
+        assert result["ok"] is True
+        assert result["stdout"] == "a  b *\n"
+
+    def test_missing_executable(self, policy, monkeypatch):
+        monkeypatch.setattr(PolicyEngine, "is_command_allowed", lambda self, cmd: (True, "allowed"))
+        result = CommandRunTool(policy).run(command=["lndis-no-such-command"])
+        assert result == {"ok": False, "error": "command not found: lndis-no-such-command"}
+
+    def test_only_hits_are_cached(self, monkeypatch):
+        monkeypatch.setattr(base, "_EXE_CACHE", {})
+        assert base._resolve_exe("lndis-no-such-command") is None
+        assert base._resolve_exe("echo") is not None
+        assert list(base._EXE_CACHE) == ["echo"]
+
+
+# ── research_local ─────────────────────────────────────────────────
+
+_CORPUS = {
+    "notes.txt": "Budget review on Monday\nbudgets2024 draft\nfoo.bar baz\nNothing here\n",
+    "sub/plan.md": "# Plan\nThe BUDGET is approved\nfoo-bar and foo.bar\nçalışma planı hazır\n",
+    "sub/deep/log.log": "error: disk full\nwarning: budget exceeded (disk)\n",
+    "skip.bin": "budget\n",
+}
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    for name, text in _CORPUS.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(text, encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def cache(tmp_path_factory):
+    return tmp_path_factory.mktemp("index")
+
+
+def _reference(files: list[str], query: str, max_results: int) -> list[tuple[str, int]]:
+    """The plain line scan the index has to agree with."""
+    keywords = query.casefold().split()
+    found = []
+    for path in files:
+        for n, line in enumerate(Path(path).read_text(encoding="utf-8").splitlines(), start=1):
+            if all(kw in line.casefold() for kw in keywords):
+                found.append((path, n))
+    return found[:max_results]
+
+
+class TestResearchLocal:
+    @pytest.mark.parametrize("query", [
+        "budget", "BUDGET disk", "udge", "foo.bar", "foo bar", "-", "(disk)",
+        "çalışma", "planı hazır", "missing", "e", "budget 2024",
+        "budget budget", "bud budget udg", "foo.bar foo-bar o.b", "disk) (d",
+    ])
+    def test_matches_line_scan(self, policy, corpus, cache, query):
+        result = LocalResearchTool(policy, cache).run(query=query, scan_dir=str(corpus), max_results=50)
+        files = sorted(str(p) for p in corpus.rglob("*") if p.suffix != ".bin" and p.is_file())
+        got = sorted((r["file"], r["line"]) for r in result["results"])
+        assert got == _reference(files, query, 50)
+        assert result["total_files_indexed"] == 3
+
+    def test_results_capped_in_scan_order(self, policy, corpus, cache):
+        tool = LocalResearchTool(policy, cache)
+        full = tool.run(query="budget", scan_dir=str(corpus), max_results=50)["results"]
+        capped = tool.run(query="budget", scan_dir=str(corpus), max_results=2)
+        assert capped["matches"] == 2
+        assert capped["results"] == full[:2]
+
+    def test_punctuated_keyword_checks_only_candidate_lines(self, policy, cache):
+        lines = ["foo.bar", "foo", "bar", "nothing", "foo-bar", "bar.foo"]
+        index = research_local._Index.build([("a.txt", 0, 0, lines)])
+        checked = []
+        index.folded = type("Recording", (list,), {
+            "__getitem__": lambda self, i: checked.append(i) or list.__getitem__(self, i),
+        })(index.folded)
+        assert LocalResearchTool(policy, cache)._search(index, ["foo.bar"], 10) == [0]
+        assert checked == [0, 4, 5]  # lines holding both "foo" and "bar"
+
+    def test_lines_packed_into_one_buffer(self):
+        lines = ["Straße", "", "çalışma planı", "plain"]
+        index = research_local._Index.build([("a.txt", 0, 0, lines), ("b.txt", 0, 0, ["x"])])
+        assert list(index.lines) == [*lines, "x"]
+        assert list(index.folded) == ["strasse", "", "çalışma planı", "plain", "x"]
+        assert index.lines.blob.nbytes == len("".join(lines + ["x"]).encode("utf-8"))
+        assert index.locate(4) == ("b.txt", 1)
+
+    def test_query_is_case_folded(self, policy, corpus, cache):
+        (corpus / "de.txt").write_text("Die Straße ist gesperrt\n", encoding="utf-8")
+        tool = LocalResearchTool(policy, cache)
+        for query in ("STRASSE", "straße GESPERRT", "ße i"):
+            result = tool.run(query=query, scan_dir=str(corpus))
+            assert [r["snippet"] for r in result["results"]] == ["Die Straße ist gesperrt"]
+
+    def test_snippet_keeps_original_case(self, policy, corpus, cache):
+        result = LocalResearchTool(policy, cache).run(query="approved", scan_dir=str(corpus))
+        assert result["results"] == [
+            {"file": str(corpus / "sub" / "plan.md"), "line": 2, "snippet": "The BUDGET is approved"},
+        ]
+
+    def test_walk_filters_by_extension(self, corpus):
+        (corpus / "sub" / "README").write_text("budget", encoding="utf-8")
+        (corpus / "big.txt").write_bytes(b"x")
+        names = sorted(e.name for e in research_local._walk(corpus))
+        assert names == ["big.txt", "log.log", "notes.txt", "plan.md"]
+
+    @pytest.mark.skipif(research_local._pdf_backend() is not None, reason="a PDF backend is installed")
+    def test_pdf_without_backend_is_noted(self, policy, corpus, cache):
+        (corpus / "scan.pdf").write_bytes(b"%PDF-1.4 not really")
+        result = LocalResearchTool(policy, cache).run(query="pymupdf", scan_dir=str(corpus))
+        assert [r["file"] for r in result["results"]] == [str(corpus / "scan.pdf")]
+
+
+class TestResearchIndexCache:
+    def test_unchanged_tree_is_mapped_not_reread(self, policy, corpus, cache, monkeypatch):
+        first = LocalResearchTool(policy, cache).run(query="budget", scan_dir=str(corpus))
+        monkeypatch.setattr(LocalResearchTool, "_read_text", lambda self, p: pytest.fail(f"re-read {p}"))
+        second = LocalResearchTool(policy, cache).run(query="budget", scan_dir=str(corpus))
+        assert second == first
+
+    def test_only_changed_files_are_reread(self, policy, corpus, cache, monkeypatch):
+        LocalResearchTool(policy, cache).run(query="budget", scan_dir=str(corpus))
+        (corpus / "notes.txt").write_text("new budget line\n", encoding="utf-8")
+        read = []
+        original = LocalResearchTool._read_text
+        monkeypatch.setattr(LocalResearchTool, "_read_text", lambda self, p: read.append(p.name) or original(self, p))
+        result = LocalResearchTool(policy, cache).run(query="budget line", scan_dir=str(corpus))
+        assert read == ["notes.txt"]
+        assert [r["snippet"] for r in result["results"]] == ["new budget line"]
+        assert LocalResearchTool(policy, cache).run(query="approved", scan_dir=str(corpus))["matches"] == 1
+
+    def test_damaged_index_is_rebuilt(self, policy, corpus, cache):
+        expected = LocalResearchTool(policy, cache).run(query="disk", scan_dir=str(corpus))
+        (index_bin,) = cache.rglob("index.bin")
+        index_bin.write_bytes(index_bin.read_bytes()[:-3])
+        assert LocalResearchTool(policy, cache).run(query="disk", scan_dir=str(corpus)) == expected
+
+    def test_pdf_pool_matches_inline(self, policy, corpus, tmp_path_factory, monkeypatch):
+        for name in ("a.pdf", "b.pdf", "sub/c.pdf"):
+            (corpus / name).write_bytes(b"%PDF-1.4 not really a pdf")
+        pooled = LocalResearchTool(policy, tmp_path_factory.mktemp("pooled")).run(query="pdf", scan_dir=str(corpus))
+        monkeypatch.setattr(research_local, "_POOL_MIN_PDFS", 10**9)
+        inline = LocalResearchTool(policy, tmp_path_factory.mktemp("inline")).run(query="pdf", scan_dir=str(corpus))
+        assert pooled == inline
+        assert pooled["total_files_indexed"] == 6  # three text files, three PDFs
+
+    def test_switching_directories_reindexes(self, policy, corpus, cache):
+        tool = LocalResearchTool(policy, cache)
+        assert tool.run(query="approved", scan_dir=str(corpus))["matches"] == 1
+        assert tool.run(query="approved", scan_dir=str(corpus / "sub" / "deep"))["matches"] == 0
@@ -4,13 +4,31 @@ Every tool inherits from Tool and implements run().
 """
 
 from __future__ import annotations
+import shutil
 from abc import ABC, abstractmethod
 from typing import Any
 
 
+# Executable lookups only cache hits, so a program installed while the app
+# is running is picked up on the next call.
+_EXE_CACHE: dict[str, str] = {}
+
+
+def _resolve_exe(name: str) -> str | None:
+    """Full path of *name* on PATH (cached), or None."""
+    exe = _EXE_CACHE.get(name)
+    if exe is None:
+        exe = shutil.which(name)
+        if exe is not None:
+            _EXE_CACHE[name] = exe
+    return exe
+
+
 class Tool(ABC):
     """Abstract base for all assistant tools."""
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def name(self) -> str:
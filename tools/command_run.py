@@ -9,11 +9,15 @@ import shlex
 import subprocess
 from typing import Any
 
-from tools.base import Tool
+from tools.base import Tool, _resolve_exe
 from policy.policy_engine import PolicyEngine
 
+_WINDOWS = platform.system() == "Windows"
+
 
 class CommandRunTool(Tool):
+    __slots__ = ("_policy",)
+
     def __init__(self, policy: PolicyEngine):
         self._policy = policy
 
@@ -52,13 +56,23 @@ class CommandRunTool(Tool):
         cfg_max = 120
         timeout = min(timeout, cfg_max)
 
+        # Launch the executable directly; only cmd.exe builtins (dir, type,
+        # copy, ...) which have no executable of their own go through a shell
+        exe = _resolve_exe(command[0])
+        if exe is not None:
+            argv, shell = [exe, *command[1:]], False
+        elif _WINDOWS:
+            argv, shell = command, True
+        else:
+            return {"ok": False, "error": f"command not found: {command[0]}"}
+
         try:
             result = subprocess.run(
-                command,
+                argv,
                 capture_output=True,
                 text=True,
                 timeout=timeout,
-                shell=(platform.system() == "Windows"),
+                shell=shell,
             )
             return {
                 "ok": True,
@@ -6,14 +6,19 @@ Policy-gated via policy_engine.is_path_allowed_read().
 from __future__ import annotations
 
 import os
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
 from tools.base import Tool
 from policy.policy_engine import PolicyEngine
 
+_READ_BUFFER = 64 * 1024
+
 
 class FileReadTool(Tool):
+    __slots__ = ("_policy",)
+
     def __init__(self, policy: PolicyEngine):
         self._policy = policy
 
@@ -33,24 +38,31 @@ class FileReadTool(Tool):
         }
 
     def run(self, *, path: str = "", max_lines: int = 200, **_: Any) -> dict:
+        target = Path(path).expanduser().resolve()
+
         # Policy check
-        ok, reason = self._policy.is_path_allowed_read(path)
+        ok, reason = self._policy._check_read(target, path)
         if not ok:
             return {"ok": False, "error": reason}
 
-        target = Path(path).expanduser().resolve()
-
         if not target.exists():
             return {"ok": False, "error": f"path does not exist: {target}"}
 
         # Directory listing
         if target.is_dir():
-            entries = []
+            # scandir's entries carry the type from the directory read, so
+            # each child costs at most one stat (for the size of files)
             try:
-                for child in sorted(target.iterdir()):
-                    kind = "dir" if child.is_dir() else "file"
-                    size = child.stat().st_size if child.is_file() else None
-                    entries.append({"name": child.name, "type": kind, "size": size})
+                with os.scandir(target) as it:
+                    children = sorted(it, key=lambda e: os.path.normcase(e.name))
+                entries = [
+                    {
+                        "name": e.name,
+                        "type": "dir" if e.is_dir() else "file",
+                        "size": e.stat().st_size if e.is_file() else None,
+                    }
+                    for e in children
+                ]
             except PermissionError:
                 return {"ok": False, "error": "permission denied"}
             return {"ok": True, "type": "directory", "path": str(target), "entries": entries}
@@ -58,22 +70,24 @@ class FileReadTool(Tool):
         # File content
         if target.is_file():
             try:
-                with open(target, "r", encoding="utf-8", errors="replace") as f:
-                    lines = []
-                    for i, line in enumerate(f):
-                        if i >= max_lines:
-                            lines.append(f"... (truncated at {max_lines} lines)")
-                            break
-                        lines.append(line.rstrip("\n"))
+                with open(target, "r", encoding="utf-8", errors="replace", buffering=_READ_BUFFER) as f:
+                    head = list(islice(f, max_lines))
+                    truncated = f.readline() != ""
             except PermissionError:
                 return {"ok": False, "error": "permission denied"}
 
+            content = "".join(head)
+            if content.endswith("\n"):
+                content = content[:-1]
+            if truncated:
+                content += f"\n... (truncated at {max_lines} lines)"
+
             return {
                 "ok": True,
                 "type": "file",
                 "path": str(target),
-                "lines": len(lines),
-                "content": "\n".join(lines),
+                "lines": len(head) + truncated,
+                "content": content,
             }
 
         return {"ok": False, "error": "unsupported path type"}
@@ -5,18 +5,57 @@ Creates parent directories automatically.  Optional auto-backup.
 
 from __future__ import annotations
 
+import functools
+import os
 import shutil
-from datetime import datetime, timezone
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
 from tools.base import Tool
 from policy.policy_engine import PolicyEngine
 
+_TARGET_CACHE_SIZE = 256
+# Bumped by refresh_env() so tools drop targets mapped under the old home
+_env_generation = 0
+
+
+@functools.lru_cache(maxsize=None)
+def _shortcuts() -> dict[str, Path]:
+    """Shortcuts for common directories (first path component, lowercased)."""
+    home = Path.home()
+    return {
+        "desktop": home / "Desktop",
+        "masaüstü": home / "Desktop",
+        "documents": home / "Documents",
+        "belgeler": home / "Documents",
+        "downloads": home / "Downloads",
+        "indirilenler": home / "Downloads",
+    }
+
+
+def refresh_env() -> None:
+    """Forget the cached home directory (e.g. after HOME/USERPROFILE changed)."""
+    global _env_generation
+    _shortcuts.cache_clear()
+    _env_generation += 1
+
 
 class FileWriteTool(Tool):
+    __slots__ = ("_policy", "_targets", "_targets_gen", "_targets_lock")
+
     def __init__(self, policy: PolicyEngine):
         self._policy = policy
+        # Raw path -> absolute target before symlink resolution, valid for
+        # one policy and environment generation (it depends on the
+        # workspace and the home directory).  resolve()
+        # and the policy check still run on every call: both depend on the
+        # filesystem, and a stale resolution could follow a swapped symlink.
+        self._targets: OrderedDict[str, Path] = OrderedDict()
+        self._targets_gen = (policy.generation, _env_generation)
+        self._targets_lock = threading.Lock()
 
     @property
     def name(self) -> str:
@@ -34,37 +73,47 @@ class FileWriteTool(Tool):
             "mode": {"type": "string", "enum": ["create", "overwrite", "append"], "default": "create"},
         }
 
-    def run(self, *, path: str = "", content: str = "", mode: str = "create", **_: Any) -> dict:
-        # Smart path resolution
-        raw_path = str(path).lower()
-        
-        # Shortcuts for common directories
-        shortcuts = {
-            "desktop": Path.home() / "Desktop",
-            "masaüstü": Path.home() / "Desktop",
-            "documents": Path.home() / "Documents",
-            "belgeler": Path.home() / "Documents",
-            "downloads": Path.home() / "Downloads",
-            "indirilenler": Path.home() / "Downloads",
-        }
-
+    def _lexical_target(self, path: str) -> Path | None:
+        """Absolute (unresolved) target for *path*, or None for a bare directory shortcut."""
+        gen = (self._policy.generation, _env_generation)
+        with self._targets_lock:
+            if gen != self._targets_gen:
+                self._targets.clear()
+                self._targets_gen = gen
+            target = self._targets.get(path)
+            if target is not None:
+                self._targets.move_to_end(path)
+                return target
+
+        # Smart path resolution: "Desktop/test.txt" etc. map into the home dir
         target_path = Path(path)
-        for key, p in shortcuts.items():
-            if path.lower() == key or path.lower().startswith(f"{key}/") or path.lower().startswith(f"{key}\\"):
-                # Handle "Desktop", "Desktop/test.txt" etc.
-                if path.lower() == key:
-                    return {"ok": False, "error": f"Path is a directory: {p}"}
-                suffix = path[len(key)+1:]
-                target_path = (p / suffix).resolve()
-                break
+        head, sep, _ = path.replace("\\", "/").partition("/")
+        root = _shortcuts().get(head.lower())
+        if root is not None:
+            if not sep:
+                return None
+            target_path = root / path[len(head) + 1:]
 
         if not target_path.is_absolute():
-            target = (self._policy.workspace / target_path).resolve()
+            target = self._policy.workspace / target_path
         else:
-            target = target_path.resolve()
+            target = target_path
+
+        with self._targets_lock:
+            if gen == self._targets_gen:
+                self._targets[path] = target
+                if len(self._targets) > _TARGET_CACHE_SIZE:
+                    self._targets.popitem(last=False)
+        return target
+
+    def run(self, *, path: str = "", content: str = "", mode: str = "create", **_: Any) -> dict:
+        target = self._lexical_target(path)
+        if target is None:
+            return {"ok": False, "error": f"Path is a directory: {_shortcuts()[path.lower()]}"}
+        target = target.resolve()
 
-        # Policy check
-        ok, reason = self._policy.is_path_allowed_write(str(target))
+        # Policy check (target is resolved once, above)
+        ok, reason = self._policy._check_write(target, str(target))
         if not ok:
             return {"ok": False, "error": reason}
 
@@ -72,22 +121,40 @@ class FileWriteTool(Tool):
         if mode == "create" and target.exists():
             return {"ok": False, "error": "file already exists (use mode='overwrite' or 'append')"}
 
-        # Auto-backup before overwrite
+        # Auto-backup before overwrite.  The backup is a hard link to the
+        # current file (no data copy); the new content then goes to a fresh
+        # file that replaces the target, leaving the linked inode untouched.
+        linked = False
         if mode == "overwrite" and target.exists():
             backup = target.with_suffix(
-                target.suffix + f".bak.{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}"
+                target.suffix + f".bak.{time.strftime('%Y%m%d%H%M%S', time.gmtime())}"
             )
             try:
-                shutil.copy2(str(target), str(backup))
-            except Exception:
-                pass  # best-effort backup
+                os.link(target, backup)
+                linked = True
+            except OSError:  # no hard links on this filesystem, or backup exists
+                try:
+                    shutil.copy2(str(target), str(backup))
+                except Exception:
+                    pass  # best-effort backup
 
         # Write
         target.parent.mkdir(parents=True, exist_ok=True)
+        # Encode once and write bytes; newlines are translated by hand
+        # exactly as text mode would have done
+        if os.linesep != "\n":
+            content = content.replace("\n", os.linesep)
+        data = content.encode("utf-8")
         try:
-            open_mode = "a" if mode == "append" else "w"
-            with open(target, open_mode, encoding="utf-8") as f:
-                f.write(content)
+            if linked:
+                tmp = target.with_name(target.name + ".tmp")
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                shutil.copymode(target, tmp)
+                os.replace(tmp, target)
+            else:
+                with open(target, "ab" if mode == "append" else "wb") as f:
+                    f.write(data)
         except PermissionError:
             return {"ok": False, "error": "permission denied"}
         except Exception as exc:
@@ -97,7 +164,7 @@ class FileWriteTool(Tool):
             "ok": True,
             "path": str(target),
             "mode": mode,
-            "bytes_written": len(content.encode("utf-8")),
+            "bytes_written": len(data),
         }
 
     def dry_run(self, *, path: str = "", content: str = "", mode: str = "create", **_: Any) -> str:
@@ -106,7 +173,7 @@ class FileWriteTool(Tool):
             target = (self._policy.workspace / raw_path).resolve()
         else:
             target = raw_path.resolve()
-        ok, reason = self._policy.is_path_allowed_write(str(target))
+        ok, reason = self._policy._check_write(target, str(target))
         if not ok:
             return f"DENIED: {reason}"
         return f"Would {mode} {len(content)} chars to {target}"
@@ -5,11 +5,10 @@ Always requires user approval.
 
 from __future__ import annotations
 
-import platform
 import subprocess
 from typing import Any
 
-from tools.base import Tool
+from tools.base import Tool, _resolve_exe
 from policy.policy_engine import PolicyEngine
 
 
@@ -21,6 +20,8 @@ _INSTALL_CMDS = {
 
 
 class InstallAppTool(Tool):
+    __slots__ = ("_policy",)
+
     def __init__(self, policy: PolicyEngine):
         self._policy = policy
 
@@ -58,7 +59,10 @@ class InstallAppTool(Tool):
         if base is None:
             return {"ok": False, "error": f"unsupported manager: {manager}"}
 
-        cmd = base + [package]
+        exe = _resolve_exe(base[0])
+        if exe is None:
+            return {"ok": False, "error": f"{base[0]} not found"}
+        cmd = [exe, *base[1:], package]
 
         try:
             result = subprocess.run(
@@ -66,7 +70,6 @@ class InstallAppTool(Tool):
                 capture_output=True,
                 text=True,
                 timeout=300,
-                shell=(platform.system() == "Windows"),
             )
             return {
                 "ok": result.returncode == 0,
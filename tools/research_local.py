@@ -1,15 +1,36 @@
 """
 research_local — Scan workspace for txt/md/pdf, build a simple index, search.
 Pure offline.  No OCR; extracts text from text-layer PDFs.
+
+The index is saved per scanned directory under the data dir and memory-
+mapped on the next start; it is reused while no indexed file changed.
 """
 
 from __future__ import annotations
 
+import hashlib
+import importlib.util
 import json
+import mmap
+import multiprocessing
+import os
 import re
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import accumulate, chain
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator, Sequence
+
+try:  # matches all query keywords in one pass over the text
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
+from core.settings import _get_default_settings_dir
 from tools.base import Tool
 from policy.policy_engine import PolicyEngine
 
@@ -17,16 +38,313 @@ from policy.policy_engine import PolicyEngine
 # File extensions we scan
 _TEXT_EXTS = {".txt", ".md", ".csv", ".log", ".json", ".yaml", ".yml", ".ini", ".cfg", ".py", ".js", ".html", ".css"}
 _PDF_EXT  = ".pdf"
+_INDEX_EXTS = frozenset(_TEXT_EXTS | {_PDF_EXT})
 
 # Maximum file size to index (10 MB)
 _MAX_INDEX_BYTES = 10 * 1024 * 1024
 
+# Word tokens for the inverted index (taken from case-folded lines)
+_TOKEN_RE = re.compile(r"\w+")
+
+# Parse PDFs in worker processes once there are at least this many to do
+_POOL_MIN_PDFS = 2
+
+# On-disk index: manifest.json + index.bin (header, then the arrays and
+# blobs of _Index in the order written by _Index.save)
+_INDEX_VERSION = 2
+_INDEX_MAGIC = b"LNDISIX2"
+_HEADER = struct.Struct("<8s16sQQQQQQ")  # magic, build id, lines, tokens, postings, line bytes, vocab bytes
+
+
+def _automaton(keywords: list[str]) -> "ahocorasick.Automaton":
+    """Aho-Corasick automaton reporting the index of each matched keyword."""
+    automaton = ahocorasick.Automaton()
+    for i, kw in enumerate(keywords):
+        automaton.add_word(kw, i)
+    automaton.make_automaton()
+    return automaton
+
+
+def _pdf_backend() -> str | None:
+    """PDF text extractor _iter_pdf will use (cached lines depend on it)."""
+    for name in ("fitz", "pdfplumber"):
+        if importlib.util.find_spec(name) is not None:
+            return name
+    return None
+
+
+def _walk(root: Path) -> Iterator[os.DirEntry]:
+    """
+    Indexable files under *root*.  Uses scandir entries directly: the
+    file type comes from the directory read and the extension is checked
+    before anything is stat'ed.  Directory symlinks are not followed
+    (as with rglob); unreadable directories are skipped.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in _INDEX_EXTS and entry.is_file():
+                        yield entry
+                except OSError:
+                    continue
+
+
+def _iter_pdf(fpath: Path) -> Iterator[str]:
+    """
+    Yield a PDF's text lines page by page, using PyMuPDF (fitz) if
+    available, else pdfplumber.  Only one page's text is held at a time.
+    """
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        fitz = None
+    try:
+        if fitz is not None:
+            with fitz.open(str(fpath)) as doc:
+                for page in doc:
+                    # plain "text" mode: no image or layout extraction
+                    yield from page.get_text("text").splitlines()
+            return
+        try:
+            import pdfplumber
+        except ImportError:
+            yield "[PDF skipped — install PyMuPDF or pdfplumber to index PDFs]"
+            return
+        with pdfplumber.open(str(fpath)) as pdf:
+            for page in pdf.pages:
+                yield from (page.extract_text() or "").splitlines()
+    except Exception:
+        return  # damaged PDF: keep the pages read so far
+
+
+def _pdf_lines(path: str) -> list[str]:
+    """Process-pool worker: all lines of one PDF."""
+    return list(_iter_pdf(Path(path)))
+
+
+def _extract_pdfs(paths: list[str]) -> Iterator[Iterable[str]]:
+    """
+    Lines of each PDF, in order.  PDF parsing is CPU-bound, so several
+    files are spread over worker processes while the caller indexes the
+    results as they arrive; a single file is parsed inline.
+    """
+    done = 0
+    if len(paths) >= _POOL_MIN_PDFS:
+        try:
+            # spawn, not fork: this runs on an agent worker thread while other
+            # threads may hold the import or logging locks a forked child
+            # would inherit (frozen builds call freeze_support() for this)
+            with ProcessPoolExecutor(
+                max_workers=min(len(paths), os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+                for lines in pool.map(_pdf_lines, paths):
+                    yield lines
+                    done += 1
+            return
+        except (OSError, BrokenProcessPool):
+            pass  # no worker processes available, or one died: finish inline
+    for path in paths[done:]:
+        yield _iter_pdf(Path(path))
+
+
+# ── index ──────────────────────────────────────────────────────────
+
+class _PackedLines:
+    """
+    Line id -> str over one UTF-8 blob and its uint64 line offsets, either
+    built in memory or mapped from disk.  A line is decoded only when it
+    is looked at, instead of holding a str object per line.
+    """
+
+    __slots__ = ("blob", "offsets")
+
+    def __init__(self, blob: memoryview, offsets: memoryview):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8", "surrogatepass")
+
+
+class _MappedPostings:
+    """Token id -> mapped uint32 array of line ids."""
+
+    __slots__ = ("_ids", "_offsets")
+
+    def __init__(self, ids: memoryview, offsets: memoryview):
+        self._ids = ids
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, t: int) -> memoryview:
+        return self._ids[self._offsets[t]:self._offsets[t + 1]]
+
+
+class _Index:
+    """
+    Inverted index over one directory tree.  Lines get global ids in scan
+    order; postings hold, per vocabulary token, the ids of the lines that
+    contain it.  Either built in memory or mapped from disk.
+    """
+
+    __slots__ = ("files", "paths", "doc_starts", "lines", "folded", "vocab", "vocab_blob", "vocab_starts",
+                 "postings")
+
+    def __init__(self, files: list[list], lines: _PackedLines, folded: _PackedLines, vocab_blob: str,
+                 postings: Sequence[Sequence[int]]):
+        self.files = files  # [path, mtime_ns, size, first line id, line count]
+        docs = [f for f in files if f[4]]
+        self.paths = [f[0] for f in docs]
+        self.doc_starts = [f[3] for f in docs]
+        self.lines = lines  # as written, for snippets
+        self.folded = folded  # case-folded once here, matched by every query
+        # All tokens newline-joined into one string (token id = position in
+        # vocab) so "tokens containing a keyword" is one C-level scan
+        self.vocab_blob = vocab_blob
+        self.vocab = vocab_blob.split("\n") if vocab_blob else []
+        self.vocab_starts = [0, *accumulate(len(t) + 1 for t in self.vocab)]
+        self.postings = postings
+
+    @classmethod
+    def build(cls, scanned: Iterable[tuple[str, int, int, Iterable[str]]]) -> _Index:
+        """
+        Index (path, mtime_ns, size, lines) records in the given order.
+        Both levels are consumed lazily, so a file is only read when its
+        turn comes and each line is tokenized as it arrives.
+        """
+        files: list[list] = []
+        line_blob, line_offsets = bytearray(), array("Q", [0])
+        folded_blob, folded_offsets = bytearray(), array("Q", [0])
+        postings: dict[str, list[int]] = {}
+        for path, mtime_ns, size, doc_lines in scanned:
+            first = len(line_offsets) - 1
+            for line in doc_lines:
+                line_id = len(line_offsets) - 1
+                cf = line.casefold()
+                for token in set(_TOKEN_RE.findall(cf)):
+                    postings.setdefault(token, []).append(line_id)
+                encoded = line.encode("utf-8", "surrogatepass")
+                line_blob += encoded
+                line_offsets.append(len(line_blob))
+                folded_blob += encoded if cf == line else cf.encode("utf-8", "surrogatepass")
+                folded_offsets.append(len(folded_blob))
+            files.append([path, mtime_ns, size, first, len(line_offsets) - 1 - first])
+        return cls(
+            files,
+            _PackedLines(memoryview(line_blob), memoryview(line_offsets)),
+            _PackedLines(memoryview(folded_blob), memoryview(folded_offsets)),
+            "\n".join(postings),
+            list(postings.values()),
+        )
+
+    def locate(self, line_id: int) -> tuple[str, int]:
+        """(path, 1-based line number) of a line id."""
+        doc = bisect_right(self.doc_starts, line_id) - 1
+        return self.paths[doc], line_id - self.doc_starts[doc] + 1
+
+    def save(self, directory: Path, pdf_backend: str | None) -> None:
+        posting_offsets = array("Q", [0, *accumulate(map(len, self.postings))])
+        ids = array("I", chain.from_iterable(self.postings))
+        vocab = self.vocab_blob.encode("utf-8", "surrogatepass")
+        build = os.urandom(16)
+
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / "index.bin.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(
+                _INDEX_MAGIC, build, len(self.lines), len(self.vocab), len(ids),
+                len(self.lines.blob), len(self.folded.blob), len(vocab),
+            ))
+            f.write(self.lines.offsets)
+            f.write(self.folded.offsets)
+            f.write(posting_offsets)
+            f.write(ids)
+            f.write(bytes(-len(ids) * ids.itemsize % 8))  # keep the blobs 8-aligned
+            f.write(self.lines.blob)
+            f.write(self.folded.blob)
+            f.write(vocab)
+        os.replace(tmp, directory / "index.bin")
+
+        manifest = {
+            "version": _INDEX_VERSION,
+            "build": build.hex(),
+            "byteorder": sys.byteorder,
+            "pdf_backend": pdf_backend,
+            "files": self.files,
+        }
+        tmp = directory / "manifest.json.tmp"
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, directory / "manifest.json")
+
+    @classmethod
+    def load(cls, directory: Path, pdf_backend: str | None) -> _Index | None:
+        """Map a saved index; None if missing, stale in format or damaged."""
+        try:
+            manifest = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+            with open(directory / "index.bin", "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if (manifest.get("version") != _INDEX_VERSION or manifest.get("byteorder") != sys.byteorder
+                or manifest.get("pdf_backend") != pdf_backend or len(mm) < _HEADER.size):
+            mm.close()
+            return None
+        magic, build, n_lines, n_tokens, n_ids, line_bytes, folded_bytes, vocab_bytes = _HEADER.unpack_from(mm)
+        ids_end = _HEADER.size + 16 * (n_lines + 1) + 8 * (n_tokens + 1) + 4 * n_ids
+        ids_end += -ids_end % 8
+        if (magic != _INDEX_MAGIC or build.hex() != manifest.get("build")
+                or len(mm) != ids_end + line_bytes + folded_bytes + vocab_bytes):
+            mm.close()
+            return None
+
+        view = memoryview(mm)
+        pos = _HEADER.size
+
+        def take(size: int) -> memoryview:
+            nonlocal pos
+            pos += size
+            return view[pos - size:pos]
+
+        line_offsets = take(8 * (n_lines + 1)).cast("Q")
+        folded_offsets = take(8 * (n_lines + 1)).cast("Q")
+        posting_offsets = take(8 * (n_tokens + 1)).cast("Q")
+        ids = take(4 * n_ids).cast("I")
+        pos = ids_end
+        lines = take(line_bytes)
+        folded = take(folded_bytes)
+        vocab_blob = str(take(vocab_bytes), "utf-8", "surrogatepass")
+        return cls(
+            manifest["files"],
+            _PackedLines(lines, line_offsets),
+            _PackedLines(folded, folded_offsets),
+            vocab_blob,
+            _MappedPostings(ids, posting_offsets),
+        )
+
 
 class LocalResearchTool(Tool):
-    def __init__(self, policy: PolicyEngine):
+    __slots__ = ("_policy", "_cache_dir", "_root", "_index")
+
+    def __init__(self, policy: PolicyEngine, cache_dir: str | Path | None = None):
         self._policy = policy
-        self._index: list[dict] = []       # [{path, lines}]
-        self._indexed = False
+        self._cache_dir = Path(cache_dir) if cache_dir else _get_default_settings_dir() / "research_index"
+        # Index of the directory searched last (built once per tool, as before)
+        self._root: Path | None = None
+        self._index: _Index | None = None
 
     @property
     def name(self) -> str:
@@ -50,26 +368,66 @@ class LocalResearchTool(Tool):
 
     # ── indexing ───────────────────────────────────────────────────
 
-    def _build_index(self, root: Path) -> None:
-        self._index.clear()
-        for fpath in root.rglob("*"):
-            if not fpath.is_file():
-                continue
-            if fpath.stat().st_size > _MAX_INDEX_BYTES:
+    def _load_index(self, root: Path) -> _Index:
+        if self._index is not None and self._root == root:
+            return self._index
+        self._index = None  # release the previous mapping before touching files
+
+        entries = self._scan(root)
+        backend = _pdf_backend()
+        cache = self._cache_dir / hashlib.blake2b(str(root).encode("utf-8", "surrogatepass"), digest_size=8).hexdigest()
+        old = _Index.load(cache, backend)
+        current = {path: (mtime_ns, size) for path, mtime_ns, size in entries}
+        if old is not None and {f[0]: (f[1], f[2]) for f in old.files} == current:
+            index = old
+        else:
+            index = self._build_index(entries, old)
+            del old  # unmap before the files are replaced (required on Windows)
+            try:
+                index.save(cache, backend)
+            except OSError:
+                pass  # the saved index only speeds up the next start
+
+        self._root, self._index = root, index
+        return index
+
+    def _scan(self, root: Path) -> list[tuple[str, int, int]]:
+        """(path, mtime_ns, size) of every indexable file under *root*."""
+        entries = []
+        for entry in _walk(root):
+            try:
+                st = entry.stat()
+            except OSError:
                 continue
+            if st.st_size <= _MAX_INDEX_BYTES:
+                entries.append((entry.path, st.st_mtime_ns, st.st_size))
+        return entries
+
+    def _build_index(self, entries: list[tuple[str, int, int]], old: _Index | None) -> _Index:
+        """Index *entries*, taking the lines of unchanged files from *old*."""
+        previous = {f[0]: f for f in old.files} if old is not None else {}
 
-            ext = fpath.suffix.lower()
-            lines: list[str] = []
+        def unchanged(path: str, mtime_ns: int, size: int) -> bool:
+            prev = previous.get(path)
+            return prev is not None and prev[1] == mtime_ns and prev[2] == size
 
-            if ext in _TEXT_EXTS:
-                lines = self._read_text(fpath)
-            elif ext == _PDF_EXT:
-                lines = self._read_pdf(fpath)
+        pdfs = _extract_pdfs([
+            path for path, mtime_ns, size in entries
+            if path.lower().endswith(_PDF_EXT) and not unchanged(path, mtime_ns, size)
+        ])
 
-            if lines:
-                self._index.append({"path": str(fpath), "lines": lines})
+        def scanned() -> Iterator[tuple[str, int, int, Iterable[str]]]:
+            for path, mtime_ns, size in entries:
+                if unchanged(path, mtime_ns, size):
+                    prev = previous[path]
+                    lines = (old.lines[i] for i in range(prev[3], prev[3] + prev[4]))
+                elif path.lower().endswith(_PDF_EXT):
+                    lines = next(pdfs)
+                else:
+                    lines = self._read_text(Path(path))
+                yield path, mtime_ns, size, lines
 
-        self._indexed = True
+        return _Index.build(scanned())
 
     def _read_text(self, fpath: Path) -> list[str]:
         try:
@@ -77,32 +435,6 @@ class LocalResearchTool(Tool):
         except Exception:
             return []
 
-    def _read_pdf(self, fpath: Path) -> list[str]:
-        """Extract text from PDF using PyMuPDF (fitz) if available."""
-        try:
-            import fitz  # PyMuPDF
-            doc = fitz.open(str(fpath))
-            lines: list[str] = []
-            for page in doc:
-                text = page.get_text()
-                lines.extend(text.splitlines())
-            doc.close()
-            return lines
-        except ImportError:
-            # Fallback: try pdfplumber
-            try:
-                import pdfplumber
-                with pdfplumber.open(str(fpath)) as pdf:
-                    lines = []
-                    for page in pdf.pages:
-                        text = page.extract_text() or ""
-                        lines.extend(text.splitlines())
-                    return lines
-            except ImportError:
-                return [f"[PDF skipped — install PyMuPDF or pdfplumber to index PDFs]"]
-        except Exception:
-            return []
-
     # ── searching ──────────────────────────────────────────────────
 
     def run(self, *, query: str = "", scan_dir: str = "", max_results: int = 10, **_: Any) -> dict:
@@ -113,35 +445,87 @@ class LocalResearchTool(Tool):
         if not root.is_dir():
             return {"ok": False, "error": f"directory not found: {root}"}
 
-        # (Re)build index if needed
-        if not self._indexed:
-            self._build_index(root)
-
-        keywords = query.lower().split()
-        results: list[dict] = []
-
-        for doc in self._index:
-            for line_no, line in enumerate(doc["lines"], start=1):
-                lower = line.lower()
-                if all(kw in lower for kw in keywords):
-                    results.append({
-                        "file": doc["path"],
-                        "line": line_no,
-                        "snippet": line.strip()[:300],
-                    })
-                    if len(results) >= max_results:
-                        break
-            if len(results) >= max_results:
-                break
+        index = self._load_index(root)
+        results = []
+        for line_id in self._search(index, query.casefold().split(), max_results):
+            path, line_no = index.locate(line_id)
+            results.append({
+                "file": path,
+                "line": line_no,
+                "snippet": index.lines[line_id].strip()[:300],
+            })
 
         return {
             "ok": True,
             "query": query,
-            "total_files_indexed": len(self._index),
+            "total_files_indexed": len(index.paths),
             "matches": len(results),
             "results": results,
         }
 
+    def _search(self, index: _Index, keywords: list[str], max_results: int) -> list[int]:
+        """Ids of the first lines containing every keyword."""
+        # A keyword made only of word characters can only occur inside one
+        # token, so the lines of all tokens containing it are exactly the
+        # lines a substring scan would find.  Other keywords are checked
+        # against the surviving lines; each of their word runs must still
+        # sit inside some token, which narrows those lines down first.
+        keywords = list(dict.fromkeys(keywords))
+        words = [kw for kw in keywords if _TOKEN_RE.fullmatch(kw)]
+        rest = [kw for kw in keywords if not _TOKEN_RE.fullmatch(kw)]
+        words = list(dict.fromkeys(words + [run for kw in rest for run in _TOKEN_RE.findall(kw)]))
+
+        hit_sets: list[set[int]] = []
+        for token_ids in self._tokens_containing(index, words):
+            hits: set[int] = set()
+            for t in token_ids:
+                hits.update(index.postings[t])
+            hit_sets.append(hits)
+
+        if hit_sets:
+            hit_sets.sort(key=len)  # intersect starting from the rarest
+            candidates = sorted(hit_sets[0].intersection(*hit_sets[1:]))
+        else:
+            candidates = range(len(index.lines))
+
+        if not rest:
+            matches = None
+        elif ahocorasick is not None:
+            automaton, need = _automaton(rest), len(rest)
+            matches = lambda text: len({k for _, k in automaton.iter(text)}) == need
+        else:
+            matches = lambda text: all(kw in text for kw in rest)
+
+        found: list[int] = []
+        for line_id in candidates:
+            if matches is not None and not matches(index.folded[line_id]):
+                continue
+            found.append(line_id)
+            if len(found) >= max_results:
+                break
+        return found
+
+    def _tokens_containing(self, index: _Index, keywords: list[str]) -> list[set[int]]:
+        """Ids of the vocabulary tokens containing each keyword."""
+        blob, starts = index.vocab_blob, index.vocab_starts
+        found: list[set[int]] = [set() for _ in keywords]
+        if not keywords:
+            return found
+        if ahocorasick is not None:
+            # One pass for all keywords; end is the index of the last char
+            for end, k in _automaton(keywords).iter(blob):
+                found[k].add(bisect_right(starts, end) - 1)
+            return found
+        # Keywords hold no newline, so a hit never spans two tokens; after
+        # one, resume at the next token
+        for k, kw in enumerate(keywords):
+            pos = blob.find(kw)
+            while pos != -1:
+                t = bisect_right(starts, pos) - 1
+                found[k].add(t)
+                pos = blob.find(kw, starts[t + 1])
+        return found
+
     def dry_run(self, *, query: str = "", scan_dir: str = "", **_: Any) -> str:
         root = Path(scan_dir).expanduser().resolve() if scan_dir else self._policy.workspace
         return f"Would search '{query}' in {root} (offline keyword scan)"
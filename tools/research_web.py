@@ -13,6 +13,8 @@ from policy.policy_engine import PolicyEngine
 
 
 class WebResearchTool(Tool):
+    __slots__ = ("_policy",)
+
     def __init__(self, policy: PolicyEngine):
         self._policy = policy
 
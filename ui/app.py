@@ -82,6 +82,7 @@ class LndisApp(ctk.CTk):
         self.voice = VoiceEngine()
         self.voice.tts_enabled = self.settings.get("tts_enabled", True)
         self._listening = False
+        self._mic_probe_started = False
 
         # State
         self._current_panel = "chat"
@@ -204,6 +205,7 @@ class LndisApp(ctk.CTk):
             self._refresh_logs()
         elif panel_name == "settings":
             self._refresh_settings()
+            self._start_mic_probe()
 
     # ══════════════════════════════════════════════════════════
     # Chat Panel
@@ -327,7 +329,7 @@ class LndisApp(ctk.CTk):
             input_inner, text="🎤",
             font=ctk.CTkFont(size=16),
             fg_color="transparent", hover_color=BG_HOVER,
-            text_color=MIC_READY if self.voice.mic_available else TEXT_MUTED,
+            text_color=MIC_READY if self.voice.mic_available is not False else TEXT_MUTED,
             width=36, height=36, corner_radius=8,
             command=self._on_mic_click,
         )
@@ -382,39 +384,53 @@ class LndisApp(ctk.CTk):
 
         # Always try to plan first via the agent.
         # The agent should decide if tools are needed or if it's just a chat.
-        threading.Thread(target=self._process_input, args=(text,), daemon=True).start()
+        self._process_input(text)
 
     def _process_input(self, text: str):
+        """Plan *text* on the agent's worker pool; the Tk loop polls for it."""
         self._processing = True
-        self.after(0, lambda: self.send_btn.configure(state="disabled"))
-        self.after(0, lambda: self.mic_btn.configure(state="disabled"))
+        self.send_btn.configure(state="disabled")
+        self.mic_btn.configure(state="disabled")
 
         loading_id = self._add_loading()
 
+        # 1. Ask Agent for a plan (LLM round-trip runs off the UI thread)
+        future = self.agent.plan_future(text)
+        self.after(50, lambda: self._check_plan(future, text, loading_id))
+
+    def _check_plan(self, future, text: str, loading_id: str):
+        if not future.done():
+            self.after(50, lambda: self._check_plan(future, text, loading_id))
+            return
+
+        self._remove_widget(loading_id)
         try:
-            # 1. Ask Agent for a plan
-            plan = self.agent.plan(text)
+            plan = future.result()
+        except Exception as e:
+            self._add_chat_message("system", f"Process error: {e}")
+            self._finish_processing()
+            return
 
-            self.after(0, lambda: self._remove_widget(loading_id))
+        # If agent found actual tool actions, show the plan
+        if plan.actions and any(a.tool_call.tool_name != "none" for a in plan.actions):
+            self._show_plan(plan)
 
-            # If agent found actual tool actions, show the plan
-            if plan.actions and any(a.tool_call.tool_name != "none" for a in plan.actions):
-                self.after(0, lambda: self._show_plan(plan))
-                
-                # AUTOMATIC EXECUTION
-                if self.auto_execute:
-                    self.after(500, self._on_approve_run)
-            else:
-                # No actions? Treat as regular chat response
-                self._do_chat_logic(text)
+            # AUTOMATIC EXECUTION
+            if self.auto_execute:
+                self.after(500, self._on_approve_run)
+            self._finish_processing()
+        else:
+            # No actions? Treat as regular chat response
+            threading.Thread(target=self._chat_then_finish, args=(text,), daemon=True).start()
 
-        except Exception as e:
-            self.after(0, lambda: self._remove_widget(loading_id))
-            self.after(0, lambda: self._add_chat_message("system", f"Process error: {e}"))
+    def _chat_then_finish(self, text: str):
+        self._do_chat_logic(text)
+        self.after(0, self._finish_processing)
 
-        self.after(0, lambda: self.send_btn.configure(state="normal"))
-        self.after(0, lambda: self.mic_btn.configure(state="normal"))
-        self.after(0, self._update_status)
+    def _finish_processing(self):
+        self.send_btn.configure(state="normal")
+        self.mic_btn.configure(state="normal")
+        self._update_status()
         self._processing = False
 
     def _do_chat_logic(self, message: str):
@@ -649,9 +665,40 @@ class LndisApp(ctk.CTk):
 
     # ── Voice controls ─────────────────────────────────────────
 
+    def _start_mic_probe(self):
+        """
+        Probe the microphone once, when the settings panel first opens (a
+        mic click probes through listen()).  It imports PyAudio, so it runs
+        off the UI thread.
+        """
+        if self._mic_probe_started or self.voice.mic_available is not None:
+            return
+        self._mic_probe_started = True
+        self._show_mic_state()
+
+        def probe():
+            self.voice.probe_mic()
+            self.after(0, self._show_mic_state)
+
+        threading.Thread(target=probe, daemon=True).start()
+
+    def _show_mic_state(self):
+        """Reflect the probed microphone state on the mic button and settings label."""
+        available = self.voice.mic_available
+        if not self._listening:
+            self.mic_btn.configure(text_color=MIC_READY if available is not False else TEXT_MUTED)
+        mic_status, mic_color = {
+            True: ("✓ Microphone detected", SUCCESS),
+            False: ("✕ No microphone found", DANGER),
+            None: ("… Checking microphone" if self._mic_probe_started else "… Microphone not checked yet",
+                   TEXT_MUTED),
+        }[available]
+        self.mic_status_label.configure(text=mic_status, text_color=mic_color)
+
     def _on_mic_click(self):
         """Toggle microphone listening."""
-        if not self.voice.mic_available:
+        # None means not probed yet; listen() probes and reports a missing mic
+        if self.voice.mic_available is False:
             self._add_chat_message("system", "Microphone not available. Check audio device.")
             return
 
@@ -674,6 +721,7 @@ class LndisApp(ctk.CTk):
             self.welcome_frame.destroy()
 
         self._add_chat_message("system", "🎤 Listening... Speak now.")
+        self._mic_probe_started = True  # listen() loads STT and probes the mic itself
 
         self.voice.listen_async(
             on_result=self._on_voice_result,
@@ -693,7 +741,7 @@ class LndisApp(ctk.CTk):
 
         # Show transcription and start mascot session
         self.after(0, lambda: self._add_chat_message("user", text))
-        threading.Thread(target=self._process_input, args=(text,), daemon=True).start()
+        self.after(0, lambda: self._process_input(text))
 
     def _on_voice_error(self, msg: str):
         """Called when speech recognition fails."""
@@ -701,6 +749,7 @@ class LndisApp(ctk.CTk):
         self.after(0, lambda: self.mic_btn.configure(
             text="🎤", fg_color="transparent", text_color=MIC_READY
         ))
+        self.after(0, self._show_mic_state)  # listen() may just have found no mic
         self.after(0, lambda: self._add_chat_message("system", f"Ses hatası: {msg}"))
         self.after(0, self._update_status)
 
@@ -714,6 +763,7 @@ class LndisApp(ctk.CTk):
             self.voice.speak("Ses çıkışı aktif.")
         else:
             self.tts_btn.configure(text="🔇", text_color=TEXT_MUTED)
+            self.voice.clear_queue()
             self.voice.stop_speaking()
 
     # ── Chat message helpers ──────────────────────────────────
@@ -1107,11 +1157,10 @@ class LndisApp(ctk.CTk):
         self.rate_slider.set(self.voice.tts_rate)
         self.rate_slider.pack(side="right")
 
-        # Mic status
-        mic_status = "✓ Microphone detected" if self.voice.mic_available else "✕ No microphone found"
-        mic_color = SUCCESS if self.voice.mic_available else DANGER
-        ctk.CTkLabel(scroll, text=mic_status,
-                      font=ctk.CTkFont(size=11), text_color=mic_color).pack(anchor="w", pady=(5, 20))
+        # Mic status (filled in by _show_mic_state once the mic is probed)
+        self.mic_status_label = ctk.CTkLabel(scroll, text="", font=ctk.CTkFont(size=11))
+        self.mic_status_label.pack(anchor="w", pady=(5, 20))
+        self._show_mic_state()
 
         # ── Current Config Display ────────────────────────────
         ctk.CTkLabel(scroll, text="CURRENT CONFIGURATION", font=ctk.CTkFont(size=11, weight="bold"),
@@ -1219,8 +1268,8 @@ class LndisApp(ctk.CTk):
 
     def _update_status(self):
         mode = self.agent.planning_mode
-        provider = getattr(self.agent.llm, "provider_name", "none")
-        model = getattr(self.agent.llm, "model", "none")
+        provider = self.agent.llm.provider_name
+        model = self.agent.llm.model
 
         # Update status bar
         if mode == "llm":
@@ -1252,4 +1301,6 @@ def main():
     app.mainloop()
 
 if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()  # research_local parses PDFs in worker processes
     main()